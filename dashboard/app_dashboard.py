@@ -3,26 +3,50 @@ LifeSync Dashboard - App Dashboard (Reorganized)
 This Streamlit app displays visualizations and insights from models trained on lifestyle and mental health data.
 Organized as per user requirements:
 1. Filters Section
-2. Top Overview Section (4 Metrics)
-3. Lifestyle Factor Distributions (12 Charts)
+2. Top Overview Section (5 Metrics)
+3. Lifestyle Factor Distributions (12 Charts + Burnout Risk)
 """
 
+import os
+import time
+from functools import partial
+
 import streamlit as st
-import pandas as pd
-import numpy as np
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend for Streamlit
 import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import joblib
-import os
-import shap
-from PIL import Image
 
-# Set matplotlib and seaborn style for better appearance
-plt.style.use('default')
-sns.set_palette("husl")
+from dashboard.cohort_comparison import (
+    COMPARISON_DISTRIBUTIONS,
+    COMPARISON_MAX_COHORTS,
+    compare_cohorts,
+    comparison_table,
+    render_comparison_chart,
+    split_cohorts,
+)
+from dashboard.column_catalog import column_range, column_values
+from dashboard.dashboard_charts import (
+    CATEGORY_FILTERS,
+    DISTRIBUTION_CHARTS,
+    apply_filters,
+    default_filters,
+    read_feature_importance,
+    read_shap_images,
+    render_chart,
+)
+from dashboard.dashboard_insights import build_insights, overview_metrics
+from dashboard.dataset_export import EXPORT_FORMATS, export_bytes, export_filename, parquet_supported
+from dashboard.history_analytics import HistoryTailReader
+from dashboard.warmup import load_column_catalog as load_warm_column_catalog
+from dashboard.warmup import load_dataset, load_dataset_export, load_default_view, warm_artifact
+
+# Filter interaction: "live" reruns on every change, "apply" batches changes until Apply Filters
+FILTER_MODE_ENV = "LIFESYNC_FILTER_MODE"
+FILTER_MODES = ("live", "apply")
+
+# Optional live-mode wait after a filter change so rapid changes collapse into one render; off by default
+FILTER_DEBOUNCE_ENV = "LIFESYNC_FILTER_DEBOUNCE_MS"
+DEFAULT_FILTER_DEBOUNCE_MS = 0
 
 # Bootstrap and Font Awesome integration
 st.markdown("""
@@ -182,40 +206,71 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Path configuration
-DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Mental_Health_Lifestyle_Dataset.csv")
-MODELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs")
+# Filter-responsive charts in each row of the distributions section
+DISTRIBUTION_ROWS = [
+    ("### 🌍 Demographics & Personal Factors", ["country", "age", "gender", "exercise"]),
+    ("### 🍎 Health & Lifestyle Patterns", ["diet", "sleep", "stress", "mental_health"]),
+    ("### ⚡ Behavioral & Emotional Metrics", ["work_hours", "screen_time", "social", "happiness"]),
+    ("### 🔥 Burnout Risk", ["burnout", "burnout_bands"]),
+]
 
-# Load dataset
+# Load dataset (Burnout Risk is precomputed once); read from the warm cache when it has been built
 @st.cache_data
 def load_data():
-    df = pd.read_csv(DATA_PATH)
-    return df
+    return load_dataset()
+
+# Column dtypes, distinct values, ranges and quantiles, built once per dataset version
+@st.cache_data
+def load_column_catalog():
+    return load_warm_column_catalog()
 
 # Load feature importance data
 @st.cache_data
 def load_feature_importance():
-    fi_path = os.path.join(MODELS_PATH, "feature_importance.csv")
-    if os.path.exists(fi_path):
-        return pd.read_csv(fi_path)
-    return None
+    return warm_artifact("feature_importance", read_feature_importance)
 
-# Load SHAP images
+# Incremental reader for the simulator's prediction history, shared across sessions
+@st.cache_resource
+def get_history_reader():
+    return HistoryTailReader()
+
+# Load SHAP images as encoded PNG bytes
+@st.cache_data
 def load_shap_images():
-    images = {}
-    shap_files = {
-        "Happiness Summary": "shap_summary_happiness.png",
-        "Happiness Dot": "shap_dot_happiness.png",
-        "Stress Summary": "shap_summary_stress.png",
-        "Stress Dot": "shap_dot_stress.png"
-    }
-    
-    for name, filename in shap_files.items():
-        path = os.path.join(MODELS_PATH, filename)
-        if os.path.exists(path):
-            images[name] = Image.open(path)
-    
-    return images
+    return warm_artifact("shap_images", read_shap_images)
+
+# Pre-rendered unfiltered view (chart PNGs, KPIs, correlation highlights, insights) from the warm cache
+@st.cache_data(show_spinner=False)
+def default_view():
+    return load_default_view()
+
+# PNG of one filter-responsive chart for a filtered selection
+@st.cache_data(show_spinner=False, max_entries=256)
+def chart_png(name, filters):
+    return render_chart(name, apply_filters(load_data(), filters), load_column_catalog())
+
+# Chart PNG from the pre-rendered default view, or rendered for the filtered selection
+def chart_image(name, filters, view):
+    return view["figures"][name] if view else chart_png(name, filters)
+
+# KPIs, distribution counts and correlations of every cohort, from one grouped aggregation
+@st.cache_data(show_spinner=False, max_entries=64)
+def cohort_comparison(cohorts):
+    return compare_cohorts(load_data(), load_column_catalog(), cohorts)
+
+# PNG of one comparison chart, drawn from the cached comparison result
+@st.cache_data(show_spinner=False, max_entries=256)
+def comparison_png(name, cohorts):
+    return render_comparison_chart(name, cohort_comparison(cohorts))
+
+# PNG of a top-5 feature importance chart, or None if its column is missing
+def feature_importance_png(name):
+    return default_view()["figures"][name]
+
+def display_chart_png(title, png):
+    st.markdown(f"<p class='chart-title'>{title}</p>", unsafe_allow_html=True)
+    st.image(png, use_container_width=True)
+    st.markdown("</div>", unsafe_allow_html=True)
 
 # Utility function to create charts with automatic cleanup
 def create_and_display_chart(chart_func, title, container_class='chart-container'):
@@ -244,26 +299,57 @@ def reset_filters_callback():
         del st.session_state[key]
 
     # Use timestamp to ensure truly unique keys for each reset
-    import time
     st.session_state.reset_key = str(int(time.time() * 1000))
 
-def main():
-    # Load data
-    df = load_data()
-    
+def get_filter_settings():
+    """
+    Default filter mode and live-mode debounce from the environment.
+
+    Returns:
+    tuple: ("live" or "apply", debounce in seconds)
+    """
+    mode = os.environ.get(FILTER_MODE_ENV, "live").strip().lower()
+    if mode not in FILTER_MODES:
+        mode = "live"
+    try:
+        debounce_ms = max(int(os.environ.get(FILTER_DEBOUNCE_ENV, DEFAULT_FILTER_DEBOUNCE_MS)), 0)
+    except ValueError:
+        debounce_ms = DEFAULT_FILTER_DEBOUNCE_MS
+    return mode, debounce_ms / 1000
+
+def debounce_filter_change(filters):
+    """
+    In live mode with LIFESYNC_FILTER_DEBOUNCE_MS set, wait briefly before rendering a new
+    filter selection.
+
+    Streamlit's default runner.fastReruns stops this run at the next Streamlit call when a
+    newer filter change arrives during the wait, so the intermediate values of a slider drag
+    are not rendered.
+    """
+    mode, debounce = get_filter_settings()
+    if st.session_state.get('filter_apply_mode', mode == "apply") or debounce <= 0:
+        return
+    if filters != st.session_state.get('rendered_filters'):
+        time.sleep(debounce)
+
+def filter_section(df, catalog):
+    """Filter widgets, with options and ranges from the column catalog; returns the selection as a hashable filters dict"""
     # --- 1. FILTERS SECTION ---
     
     st.markdown("<h3 style='margin-bottom: 8px; font-size: 1.2rem;'>🔍 Filters</h3>", unsafe_allow_html=True)
     
+    # In apply mode the widgets sit in a form, so edits are sent together with Apply Filters
+    apply_mode = st.session_state.get('filter_apply_mode', get_filter_settings()[0] == "apply")
+    
     # Create filter columns
-    filter_container = st.container()
+    filter_container = st.form("filter_form", border=False, enter_to_submit=False) if apply_mode else st.container()
     filter_cols = filter_container.columns([1, 1, 1, 1, 1])
       # Check if reset was triggered - use timestamp-based unique key
     reset_key = st.session_state.get('reset_key', 'default')
     
     # Country filter
     with filter_cols[0]:
-        countries = sorted([str(x) for x in df["Country"].unique()])
+        countries = column_values(catalog, "Country")
         filter_key = f"country_filter_{reset_key}"
         selected_countries = st.multiselect("Country", countries, default=[], key=filter_key, 
                                             label_visibility="collapsed", placeholder="Country")
@@ -271,7 +357,7 @@ def main():
     
     # Gender filter  
     with filter_cols[1]:
-        genders = sorted([str(x) for x in df["Gender"].unique()])
+        genders = column_values(catalog, "Gender")
         filter_key = f"gender_filter_{reset_key}"
         selected_genders = st.multiselect("Gender", genders, default=[], key=filter_key, 
                                           label_visibility="collapsed", placeholder="Gender")
@@ -279,7 +365,7 @@ def main():
     
     # Exercise filter
     with filter_cols[2]:
-        exercise_levels = sorted([str(x) for x in df["Exercise Level"].unique()])
+        exercise_levels = column_values(catalog, "Exercise Level")
         filter_key = f"exercise_filter_{reset_key}"
         selected_exercise_levels = st.multiselect("Exercise", exercise_levels, default=[], key=filter_key, 
                                                   label_visibility="collapsed", placeholder="Exercise")
@@ -287,7 +373,7 @@ def main():
     
     # Diet filter
     with filter_cols[3]:
-        diet_types = sorted([str(x) for x in df["Diet Type"].unique()])
+        diet_types = column_values(catalog, "Diet Type")
         filter_key = f"diet_filter_{reset_key}"
         selected_diet_types = st.multiselect("Diet", diet_types, default=[], key=filter_key, 
                                              label_visibility="collapsed", placeholder="Diet")
@@ -295,51 +381,61 @@ def main():
     
     # Mental Health filter
     with filter_cols[4]:
-        mh_unique = df["Mental Health Condition"].dropna().unique()
-        mh_conditions = sorted([str(x) for x in mh_unique])
+        mh_conditions = column_values(catalog, "Mental Health Condition")
         filter_key = f"mh_filter_{reset_key}"
         selected_mh_conditions = st.multiselect("Mental Health", mh_conditions, default=[], key=filter_key, 
                                                 label_visibility="collapsed", placeholder="Mental Health")
         st.markdown("<p style='font-size:0.8rem; margin:0; padding:0'>Mental Health</p>", unsafe_allow_html=True)
     
     # Second row with range sliders
-    slider_cols = st.columns([1, 1, 1])
+    slider_cols = filter_container.columns([1, 1, 1])
       # Age slider
     with slider_cols[0]:
-        age_min, age_max = int(df["Age"].min()), int(df["Age"].max())
+        age_min, age_max = (int(value) for value in column_range(catalog, "Age"))
         st.markdown("<p style='font-size:0.8rem; margin:0; padding:0'>Age Range</p>", unsafe_allow_html=True)
         filter_key = f"age_filter_{reset_key}"
         selected_age_range = st.slider("Age", age_min, age_max, (age_min, age_max), key=filter_key, 
                                       label_visibility="collapsed")      # Sleep slider
     with slider_cols[1]:
-        sleep_min, sleep_max = float(df["Sleep Hours"].min()), float(df["Sleep Hours"].max())
+        sleep_min, sleep_max = column_range(catalog, "Sleep Hours")
         st.markdown("<p style='font-size:0.8rem; margin:0; padding:0'>Sleep Hours</p>", unsafe_allow_html=True)
         filter_key = f"sleep_filter_{reset_key}"
         selected_sleep_range = st.slider("Sleep Hours", sleep_min, sleep_max, (sleep_min, sleep_max), 
                                         step=0.1, key=filter_key, label_visibility="collapsed")# Reset button
     with slider_cols[2]:
-        st.button("Reset Filters", use_container_width=True, on_click=reset_filters_callback)
+        if apply_mode:
+            st.form_submit_button("Apply Filters", use_container_width=True)
+            st.form_submit_button("Reset Filters", use_container_width=True, on_click=reset_filters_callback)
+        else:
+            st.button("Reset Filters", use_container_width=True, on_click=reset_filters_callback)
+    
+    option_cols = st.columns([2, 1])
+    with option_cols[0]:
+        st.toggle("Apply filters with a button", value=apply_mode, key="filter_apply_mode",
+                  help="Batch filter changes and update the charts only when Apply Filters is pressed")
     
     st.markdown("</div>", unsafe_allow_html=True)  # Close filter container
-      # Apply filters to data
-    filtered_df = df.copy()
-    if selected_countries:
-        filtered_df = filtered_df[filtered_df["Country"].isin(selected_countries)]
-    if selected_genders:
-        filtered_df = filtered_df[filtered_df["Gender"].isin(selected_genders)]
-    if selected_exercise_levels:
-        filtered_df = filtered_df[filtered_df["Exercise Level"].isin(selected_exercise_levels)]
-    if selected_diet_types:
-        filtered_df = filtered_df[filtered_df["Diet Type"].isin(selected_diet_types)]
-    if selected_mh_conditions:
-        # Only filter when specific conditions are selected
-        # This excludes entries with null Mental Health values when filtering
-        filtered_df = filtered_df[filtered_df["Mental Health Condition"].isin(selected_mh_conditions)]
-    # When no Mental Health conditions are selected, include all entries (including nulls)
-    filtered_df = filtered_df[filtered_df["Age"].between(selected_age_range[0], selected_age_range[1])]
-    filtered_df = filtered_df[filtered_df["Sleep Hours"].between(selected_sleep_range[0], selected_sleep_range[1])]
+    # Empty selections keep every row (including blank Mental Health values)
+    filters = {
+        "countries": tuple(selected_countries),
+        "genders": tuple(selected_genders),
+        "exercise_levels": tuple(selected_exercise_levels),
+        "diet_types": tuple(selected_diet_types),
+        "mh_conditions": tuple(selected_mh_conditions),
+        "age_range": tuple(selected_age_range),
+        "sleep_range": tuple(selected_sleep_range),
+    }
     
-    # --- 2. TOP OVERVIEW SECTION (4 METRICS) ---
+    # Filtered rows are serialised in chunks only when the button is clicked
+    with option_cols[1]:
+        st.download_button("📥 Download Filtered CSV", data=lambda: export_bytes(apply_filters(df, filters)),
+                           file_name=export_filename("csv", "_filtered"), mime="text/csv",
+                           on_click="ignore", use_container_width=True)
+    return filters
+
+def overview_section(metrics):
+    """Five overview metric cards for the selection"""
+    # --- 2. TOP OVERVIEW SECTION (5 METRICS) ---
     st.markdown("""
     <div class="overview-container mb-4">
         <h4 class="text-center mb-3" style="color: #2c3e50;">
@@ -349,23 +445,15 @@ def main():
     """, unsafe_allow_html=True)
     
     # Calculate metrics
-    total_entries = len(df)
-    selected_entries = len(filtered_df)
-    avg_happiness = filtered_df["Happiness Score"].mean() if not filtered_df.empty else 0
-    
-    # Handle stress calculation
-    try:
-        pd.to_numeric(filtered_df["Stress Level"])
-        avg_stress = filtered_df["Stress Level"].mean() if not filtered_df.empty else 0
-        stress_scale = "/10"
-    except:
-        stress_mapping = {'Low': 1, 'Moderate': 2, 'High': 3}
-        stress_numeric = filtered_df["Stress Level"].map(stress_mapping) if not filtered_df.empty else pd.Series([0])
-        avg_stress = stress_numeric.mean()
-        stress_scale = "/3"
+    total_entries = metrics["total_entries"]
+    selected_entries = metrics["selected_entries"]
+    avg_happiness = metrics["avg_happiness"]
+    avg_stress = metrics["avg_stress"]
+    stress_scale = metrics["stress_scale"]
+    avg_burnout = metrics["avg_burnout"]
     
-    # Display 4 metric cards in a row
-    metric_cols = st.columns(4)
+    # Display 5 metric cards in a row
+    metric_cols = st.columns(5)
     
     with metric_cols[0]:
         st.markdown(f"""
@@ -407,298 +495,43 @@ def main():
         </div>
         """, unsafe_allow_html=True)
     
+    with metric_cols[4]:
+        st.markdown(f"""
+        <div class="metric-card warning">
+            <div class="metric-number">{avg_burnout:.1f}%</div>
+            <div class="metric-label">
+                <i class="fas fa-fire"></i> Avg Burnout Risk
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+def distributions_section(filters, view, has_rows):
+    """Filter-responsive distribution charts"""
     # --- 3. LIFESTYLE FACTOR DISTRIBUTIONS (12 CHARTS) ---
    
     st.markdown("<h2 style='text-align:center; color:#2c3e50; margin-bottom:20px;'>📊 Lifestyle Factor Distributions</h2>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; font-size:1rem; color:#555; margin-bottom:25px;'>12 filter-responsive charts showing distribution of key lifestyle factors</p>", unsafe_allow_html=True)
     
-    if not filtered_df.empty:
-        # Row 1: Charts 2.1-2.4 (Demographics & Personal Factors)
-        st.markdown("### 🌍 Demographics & Personal Factors")
-        row1_cols = st.columns(4)
-        
-        # 2.1 Country Distribution (Bar Chart)
-        with row1_cols[0]:
-            
-            st.markdown("<p class='chart-title'>🌍 Country Distribution</p>", unsafe_allow_html=True)
-            country_counts = filtered_df['Country'].value_counts().head(10)
-            fig, ax = plt.subplots(figsize=(4, 3))
-            bars = ax.bar(range(len(country_counts)), country_counts.values, color='#667eea')
-            ax.set_xticks(range(len(country_counts)))
-            ax.set_xticklabels(country_counts.index, rotation=45, ha='right', fontsize=8)
-            ax.set_ylabel('Count', fontsize=8)
-            ax.tick_params(axis='y', labelsize=8)
-            
-            for i, bar in enumerate(bars):
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{int(height)}', ha='center', va='bottom', fontsize=7)
-            
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        # 2.2 Age Group Distribution (Histogram)
-        with row1_cols[1]:
-            
-            st.markdown("<p class='chart-title'>📊 Age Distribution</p>", unsafe_allow_html=True)
-            fig, ax = plt.subplots(figsize=(4, 3))
-            bins = min(20, len(filtered_df['Age'].unique()))
-            ax.hist(filtered_df['Age'], bins=bins, color='#11998e', alpha=0.7, edgecolor='black')
-            ax.set_xlabel('Age', fontsize=8)
-            ax.set_ylabel('Frequency', fontsize=8)
-            ax.tick_params(labelsize=8)
-            ax.grid(True, alpha=0.3)
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        # 2.3 Gender (Pie Chart)
-        with row1_cols[2]:
-            
-            st.markdown("<p class='chart-title'>⚧ Gender Distribution</p>", unsafe_allow_html=True)
-            gender_counts = filtered_df['Gender'].value_counts()
-            fig, ax = plt.subplots(figsize=(4, 3))
-            colors = ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99']
-            wedges, texts, autotexts = ax.pie(gender_counts.values, labels=gender_counts.index, 
-                                              autopct='%1.1f%%', colors=colors[:len(gender_counts)])
-            
-            for text in texts:
-                text.set_fontsize(8)
-            for autotext in autotexts:
-                autotext.set_fontsize(7)
-                autotext.set_color('white')
-                autotext.set_weight('bold')
-            
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        # 2.4 Exercise Level (Bar Chart)
-        with row1_cols[3]:
-           
-            st.markdown("<p class='chart-title'>💪 Exercise Level</p>", unsafe_allow_html=True)
-            exercise_counts = filtered_df['Exercise Level'].value_counts()
-            fig, ax = plt.subplots(figsize=(4, 3))
-            bars = ax.bar(exercise_counts.index, exercise_counts.values, color='#e74c3c')
-            ax.set_ylabel('Count', fontsize=8)
-            ax.tick_params(axis='x', rotation=45, labelsize=8)
-            ax.tick_params(axis='y', labelsize=8)
-            
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{int(height)}', ha='center', va='bottom', fontsize=7)
-            
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        # Row 2: Charts 2.5-2.8 (Health & Lifestyle Patterns)
-        st.markdown("### 🍎 Health & Lifestyle Patterns")
-        row2_cols = st.columns(4)
-        
-        # 2.5 Diet Type (Pie Chart)
-        with row2_cols[0]:
-            
-            st.markdown("<p class='chart-title'>🥗 Diet Type</p>", unsafe_allow_html=True)
-            diet_counts = filtered_df['Diet Type'].value_counts()
-            fig, ax = plt.subplots(figsize=(4, 3))
-            colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4', '#feca57']
-            wedges, texts, autotexts = ax.pie(diet_counts.values, labels=diet_counts.index, 
-                                              autopct='%1.1f%%', colors=colors[:len(diet_counts)])
-            
-            for text in texts:
-                text.set_fontsize(8)
-            for autotext in autotexts:
-                autotext.set_fontsize(7)
-                autotext.set_color('white')
-                autotext.set_weight('bold')
-            
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        # 2.6 Sleep Hours (Histogram)
-        with row2_cols[1]:
-            
-            st.markdown("<p class='chart-title'>💤 Sleep Hours</p>", unsafe_allow_html=True)
-            fig, ax = plt.subplots(figsize=(4, 3))
-            bins = min(15, len(filtered_df['Sleep Hours'].unique()))
-            ax.hist(filtered_df['Sleep Hours'], bins=bins, color='#9b59b6', alpha=0.7, edgecolor='black')
-            ax.set_xlabel('Sleep Hours', fontsize=8)
-            ax.set_ylabel('Frequency', fontsize=8)
-            ax.tick_params(labelsize=8)
-            ax.grid(True, alpha=0.3)
-            
-            mean_sleep = filtered_df['Sleep Hours'].mean()
-            ax.axvline(mean_sleep, color='red', linestyle='--', alpha=0.8, 
-                      label=f'Mean: {mean_sleep:.1f}h')
-            ax.legend(fontsize=7)
-            
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        # 2.7 Stress Score (Histogram)
-        with row2_cols[2]:
-            
-            st.markdown("<p class='chart-title'>😰 Stress Level</p>", unsafe_allow_html=True)
-            
-            fig, ax = plt.subplots(figsize=(4, 3))
-            try:
-                pd.to_numeric(filtered_df['Stress Level'])
-                bins = min(10, len(filtered_df['Stress Level'].unique()))
-                ax.hist(filtered_df['Stress Level'], bins=bins, color='#e67e22', alpha=0.7, edgecolor='black')
-                ax.set_xlabel('Stress Level', fontsize=8)
-                ax.set_ylabel('Frequency', fontsize=8)
-                
-                mean_stress = filtered_df['Stress Level'].mean()
-                ax.axvline(mean_stress, color='red', linestyle='--', alpha=0.8, 
-                          label=f'Mean: {mean_stress:.1f}')
-                ax.legend(fontsize=7)
-            except:
-                stress_counts = filtered_df['Stress Level'].value_counts()
-                bars = ax.bar(stress_counts.index, stress_counts.values, color='#e67e22')
-                ax.set_ylabel('Count', fontsize=8)
-                
-                for bar in bars:
-                    height = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width()/2., height,
-                           f'{int(height)}', ha='center', va='bottom', fontsize=7)
-            
-            ax.tick_params(labelsize=8)
-            ax.grid(True, alpha=0.3)
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        # 2.8 Mental Health Condition (Count Plot)
-        with row2_cols[3]:
-            
-            st.markdown("<p class='chart-title'>🧠 Mental Health</p>", unsafe_allow_html=True)
-            mh_counts = filtered_df['Mental Health Condition'].value_counts()
-            fig, ax = plt.subplots(figsize=(4, 3))
-            bars = ax.bar(range(len(mh_counts)), mh_counts.values, color='#2ecc71')
-            ax.set_xticks(range(len(mh_counts)))
-            ax.set_xticklabels(mh_counts.index, rotation=45, ha='right', fontsize=8)
-            ax.set_ylabel('Count', fontsize=8)
-            ax.tick_params(axis='y', labelsize=8)
-            
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{int(height)}', ha='center', va='bottom', fontsize=7)
-            
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        # Row 3: Charts 2.9-2.12 (Behavioral & Emotional Metrics)
-        st.markdown("### ⚡ Behavioral & Emotional Metrics")
-        row3_cols = st.columns(4)
-        
-        # 2.9 Work Hours per Week (Histogram)
-        with row3_cols[0]:
-            
-            st.markdown("<p class='chart-title'>💼 Work Hours/Week</p>", unsafe_allow_html=True)
-            fig, ax = plt.subplots(figsize=(4, 3))
-            bins = min(15, len(filtered_df['Work Hours per Week'].unique()))
-            ax.hist(filtered_df['Work Hours per Week'], bins=bins, color='#34495e', alpha=0.7, edgecolor='black')
-            ax.set_xlabel('Work Hours/Week', fontsize=8)
-            ax.set_ylabel('Frequency', fontsize=8)
-            ax.tick_params(labelsize=8)
-            ax.grid(True, alpha=0.3)
-            
-            mean_work = filtered_df['Work Hours per Week'].mean()
-            ax.axvline(mean_work, color='red', linestyle='--', alpha=0.8, 
-                      label=f'Mean: {mean_work:.1f}h')
-            ax.legend(fontsize=7)
-            
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-        
-        # 2.10 Screen Time (Histogram)
-        with row3_cols[1]:
-            
-            st.markdown("<p class='chart-title'>📱 Screen Time/Day</p>", unsafe_allow_html=True)
-            fig, ax = plt.subplots(figsize=(4, 3))
-            bins = min(15, len(filtered_df['Screen Time per Day (Hours)'].unique()))
-            ax.hist(filtered_df['Screen Time per Day (Hours)'], bins=bins, color='#3498db', alpha=0.7, edgecolor='black')
-            ax.set_xlabel('Screen Time (Hours)', fontsize=8)
-            ax.set_ylabel('Frequency', fontsize=8)
-            ax.tick_params(labelsize=8)
-            ax.grid(True, alpha=0.3)
-            
-            mean_screen = filtered_df['Screen Time per Day (Hours)'].mean()
-            ax.axvline(mean_screen, color='red', linestyle='--', alpha=0.8, 
-                      label=f'Mean: {mean_screen:.1f}h')
-            ax.legend(fontsize=7)
-            
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-          # 2.11 Social Interaction Score (Histogram)
-        with row3_cols[2]:
-            st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
-            st.markdown("<p class='chart-title'>👥 Social Interaction</p>", unsafe_allow_html=True)
-            fig, ax = plt.subplots(figsize=(4, 3))
-            bins = min(10, len(filtered_df['Social Interaction Score'].unique()))
-            ax.hist(filtered_df['Social Interaction Score'], bins=bins, color='#e91e63', alpha=0.7, edgecolor='black')
-            ax.set_xlabel('Social Interaction Score', fontsize=8)
-            ax.set_ylabel('Frequency', fontsize=8)
-            ax.tick_params(labelsize=8)
-            ax.grid(True, alpha=0.3)
-            
-            mean_social = filtered_df['Social Interaction Score'].mean()
-            ax.axvline(mean_social, color='red', linestyle='--', alpha=0.8, 
-                      label=f'Mean: {mean_social:.1f}')
-            ax.legend(fontsize=7)
-            
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
-          # 2.12 Happiness Score (Histogram)
-        with row3_cols[3]:
-            st.markdown("<div class='chart-container'>", unsafe_allow_html=True)
-            st.markdown("<p class='chart-title'>😊 Happiness Score</p>", unsafe_allow_html=True)
-            fig, ax = plt.subplots(figsize=(4, 3))
-            bins = min(10, len(filtered_df['Happiness Score'].unique()))
-            ax.hist(filtered_df['Happiness Score'], bins=bins, color='#f39c12', alpha=0.7, edgecolor='black')
-            ax.set_xlabel('Happiness Score', fontsize=8)
-            ax.set_ylabel('Frequency', fontsize=8)
-            ax.tick_params(labelsize=8)
-            ax.grid(True, alpha=0.3)
-            
-            mean_happiness = filtered_df['Happiness Score'].mean()
-            ax.axvline(mean_happiness, color='red', linestyle='--', alpha=0.8, 
-                      label=f'Mean: {mean_happiness:.1f}')
-            ax.legend(fontsize=7)
-            
-            plt.tight_layout()
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
-            st.markdown("</div>", unsafe_allow_html=True)
+    if has_rows:
+        # Rows of 4 charts (2.1-2.12), then Burnout Risk (2.13-2.14, precomputed at load)
+        for heading, chart_names in DISTRIBUTION_ROWS:
+            st.markdown(heading)
+            row_cols = st.columns(len(chart_names))
+            for col, chart_name in zip(row_cols, chart_names):
+                with col:
+                    display_chart_png(DISTRIBUTION_CHARTS[chart_name][0], chart_image(chart_name, filters, view))
     else:
         st.warning("No data available for the selected filters. Please adjust your filter criteria.")
     
     st.markdown("</div>", unsafe_allow_html=True)
-      # --- 4. CORRELATION ANALYSIS SECTION ---
+
+def correlation_section(view):
+    """Correlation heatmap and the strongest positive and negative pairs of the whole dataset, from the default view"""
+    # --- 4. CORRELATION ANALYSIS SECTION ---
     st.markdown("---")
     st.markdown("<h2 style='text-align:center; color:#2c3e50; margin-bottom:20px;'>🔗 Correlation Analysis</h2>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; color:#7f8c8d; margin-bottom:30px;'>How Lifestyle Factors Relate to Each Other</p>", unsafe_allow_html=True)
+    correlation = view["correlation"]
       # Create two-column layout for correlation analysis (equal size)
     corr_col1, corr_col2 = st.columns([1, 1])
     
@@ -707,38 +540,8 @@ def main():
         
         st.markdown("<p class='chart-title'>🔗 Correlation Heatmap</p>", unsafe_allow_html=True)
         
-        # Select only numeric columns for correlation
-        numeric_columns = df.select_dtypes(include=[np.number]).columns.tolist()
-        
-        if len(numeric_columns) > 1:
-            # Calculate correlation matrix
-            corr_matrix = df[numeric_columns].corr()
-            
-            # Create correlation heatmap with smaller size
-            fig, ax = plt.subplots(figsize=(8, 6))
-            
-            # Create mask for upper triangle to show only lower half
-            mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
-            
-            # Generate heatmap
-            sns.heatmap(corr_matrix, 
-                       mask=mask,
-                       annot=True, 
-                       cmap='RdYlBu_r', 
-                       center=0,
-                       square=True,
-                       fmt='.2f',
-                       cbar_kws={"shrink": .8},
-                       ax=ax,
-                       annot_kws={'size': 8})
-            
-            ax.set_title('Correlation Matrix', fontsize=12, fontweight='bold', pad=15)
-            plt.xticks(rotation=45, ha='right', fontsize=9)
-            plt.yticks(rotation=0, fontsize=9)
-            plt.tight_layout()
-            
-            st.pyplot(fig, use_container_width=True)
-            plt.close(fig)
+        if correlation["columns"] > 1:
+            st.image(view["figures"]["correlation"], use_container_width=True)
         else:
             st.info("Not enough numeric columns for correlation analysis.")
         
@@ -749,19 +552,13 @@ def main():
 
         st.markdown("### 📊 Key Insights")
         
-        if len(numeric_columns) > 1:
-            # Find strongest positive and negative correlations
-            corr_flat = corr_matrix.where(np.tril(np.ones(corr_matrix.shape), k=-1).astype(bool))
-            corr_pairs = corr_flat.stack().reset_index()
-            corr_pairs.columns = ['Factor1', 'Factor2', 'Correlation']
-            corr_pairs = corr_pairs.sort_values('Correlation', key=abs, ascending=False)
-            
+        if correlation["columns"] > 1:
             # Display top correlation (positive)
             st.markdown("#### 🔴 Strongest Positive")
-            if len(corr_pairs[corr_pairs['Correlation'] > 0]) > 0:
-                top_pos = corr_pairs[corr_pairs['Correlation'] > 0].iloc[0]
-                st.markdown(f"**{top_pos['Factor1']}** ↔ **{top_pos['Factor2']}**")
-                st.markdown(f"<span style='color: #e74c3c; font-weight: bold;'>r = {top_pos['Correlation']:.3f}</span>", unsafe_allow_html=True)
+            if correlation["positive"]:
+                factor1, factor2, r = correlation["positive"]
+                st.markdown(f"**{factor1}** ↔ **{factor2}**")
+                st.markdown(f"<span style='color: #e74c3c; font-weight: bold;'>r = {r:.3f}</span>", unsafe_allow_html=True)
             else:
                 st.markdown("No strong positive correlations found")
             
@@ -769,10 +566,10 @@ def main():
             
             # Display top correlation (negative)
             st.markdown("#### 🔵 Strongest Negative")
-            if len(corr_pairs[corr_pairs['Correlation'] < 0]) > 0:
-                top_neg = corr_pairs[corr_pairs['Correlation'] < 0].iloc[0]
-                st.markdown(f"**{top_neg['Factor1']}** ↔ **{top_neg['Factor2']}**")
-                st.markdown(f"<span style='color: #3498db; font-weight: bold;'>r = {top_neg['Correlation']:.3f}</span>", unsafe_allow_html=True)
+            if correlation["negative"]:
+                factor1, factor2, r = correlation["negative"]
+                st.markdown(f"**{factor1}** ↔ **{factor2}**")
+                st.markdown(f"<span style='color: #3498db; font-weight: bold;'>r = {r:.3f}</span>", unsafe_allow_html=True)
             else:
                 st.markdown("No strong negative correlations found")
             
@@ -784,8 +581,104 @@ def main():
             st.info("Not enough numeric data for analysis.")
         
         st.markdown("</div>", unsafe_allow_html=True)
+
+def insights_section(insights):
+    """Insight cards comparing the selection with the whole dataset"""
+    # --- 5. PERSONALIZED INSIGHTS SECTION ---
+    st.markdown("---")
+    st.markdown("<h2 style='text-align:center; color:#2c3e50; margin-bottom:20px;'>💡 Personalized Insights</h2>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align:center; color:#7f8c8d; margin-bottom:30px;'>Dynamic insights based on your current filter selection</p>", unsafe_allow_html=True)
     
-    # --- 5. SHAP-BASED FEATURE IMPORTANCE SECTION ---
+    # Display insights in a grid (always show at least 2, up to 4)
+    num_insights_to_show = min(4, len(insights))
+    if num_insights_to_show >= 2:
+        insight_cols = st.columns(2)
+        for i in range(num_insights_to_show):
+            with insight_cols[i % 2]:
+                insight = insights[i]
+                st.markdown(f"""
+                <div class="metric-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); text-align: center; margin-bottom: 1rem;">
+                    <div style="font-size: 2rem; margin-bottom: 0.5rem;">{insight['icon']}</div>
+                    <div style="font-size: 1rem; font-weight: bold; margin-bottom: 0.25rem;">{insight['title']}</div>
+                    <div style="font-size: 0.9rem; opacity: 0.9;">{insight['text']}</div>
+                </div>
+                """, unsafe_allow_html=True)
+    else:
+        # Single insight display
+        insight = insights[0]
+        st.markdown(f"""
+        <div class="metric-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); text-align: center; margin-bottom: 1rem;">
+            <div style="font-size: 2rem; margin-bottom: 0.5rem;">{insight['icon']}</div>
+            <div style="font-size: 1rem; font-weight: bold; margin-bottom: 0.25rem;">{insight['title']}</div>
+            <div style="font-size: 0.9rem; opacity: 0.9;">{insight['text']}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+# Everything that depends on the filters reruns as one fragment when a filter changes; the
+# sections after it (SHAP images, feature importance, history, simulator link) do not
+@st.fragment
+def filtered_sections(df):
+    catalog = load_column_catalog()
+    filters = filter_section(df, catalog)
+
+    # Until a filter changes, every data-derived element comes from the pre-rendered default view
+    view = default_view() if filters == default_filters(catalog) else None
+    if not view:
+        debounce_filter_change(filters)
+    filtered_df = df if view else apply_filters(df, filters)
+
+    overview_section(view["metrics"] if view else overview_metrics(catalog, filtered_df))
+    distributions_section(filters, view, not filtered_df.empty)
+    # Correlations are computed on the whole dataset, so they always come from the default view
+    correlation_section(default_view())
+    insights_section(view["insights"] if view else build_insights(catalog, filtered_df))
+    st.session_state.rendered_filters = filters
+
+# The comparison has its own widgets, so picking cohorts reruns only this section
+@st.fragment
+def comparison_section():
+    """Side-by-side KPIs, distributions and correlations of 2-4 cohorts"""
+    # --- 6. COHORT COMPARISON SECTION ---
+    st.markdown("---")
+    st.markdown("<h2 style='text-align:center; color:#2c3e50; margin-bottom:20px;'>⚖️ Cohort Comparison</h2>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align:center; color:#7f8c8d; margin-bottom:30px;'>Compare groups side by side without switching the filters back and forth</p>", unsafe_allow_html=True)
+
+    catalog = load_column_catalog()
+    compare_cols = st.columns([1, 2])
+    with compare_cols[0]:
+        split_key = st.selectbox("Compare by", list(CATEGORY_FILTERS), format_func=CATEGORY_FILTERS.get,
+                                 key="comparison_split")
+    split_column = CATEGORY_FILTERS[split_key]
+    with compare_cols[1]:
+        values = st.multiselect("Cohorts", column_values(catalog, split_column), default=[],
+                                max_selections=COMPARISON_MAX_COHORTS, key=f"comparison_values_{split_key}",
+                                placeholder=f"Pick 2-{COMPARISON_MAX_COHORTS} values of {split_column}")
+
+    if len(values) < 2:
+        st.info(f"Select at least two values of {split_column} to compare them.")
+        return
+
+    # Every figure below comes from one grouped aggregation over the dataset
+    cohorts = split_cohorts(catalog, split_key, values)
+    comparison = cohort_comparison(cohorts)
+    table = comparison_table(comparison)
+    st.dataframe(table.style.format("{:,.2f}").format("{:,.0f}", subset=(["Entries"], table.columns)),
+                 use_container_width=True)
+
+    # The column the cohorts are split on would show one full bar per cohort
+    chart_names = [name for name, (column, _) in COMPARISON_DISTRIBUTIONS.items() if column != split_column]
+    for start in range(0, len(chart_names), 2):
+        row_cols = st.columns(2)
+        for col, chart_name in zip(row_cols, chart_names[start:start + 2]):
+            with col:
+                display_chart_png(DISTRIBUTION_CHARTS[chart_name][0], comparison_png(chart_name, cohorts))
+
+    if len(comparison["correlation"]["columns"]) > 1:
+        display_chart_png("🔗 Correlation by Cohort", comparison_png("correlation", cohorts))
+
+def feature_importance_section():
+    """Top feature importance charts and SHAP images; independent of the filters"""
+    # --- 7. SHAP-BASED FEATURE IMPORTANCE SECTION ---
     st.markdown("---")
     st.markdown("<h2 style='text-align:center; color:#2c3e50; margin-bottom:20px;'> Feature Importance</h2>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; color:#7f8c8d; margin-bottom:30px;'>Understanding What Drives Happiness and Stress Predictions</p>", unsafe_allow_html=True)
@@ -796,7 +689,7 @@ def main():
         shap_images = load_shap_images()
         
         if feature_importance_df is not None:
-            # 5.1 & 5.2: Top 5 Features Bar Charts (SHAP-based)
+            # 6.1 & 6.2: Top 5 Features Bar Charts (SHAP-based)
             st.markdown("### 📊 Top Contributing Factors")
             
             fi_cols = st.columns(2)
@@ -805,23 +698,9 @@ def main():
                 
                 st.markdown("<p class='chart-title'>😊 Top 5 Happiness Drivers</p>", unsafe_allow_html=True)
                 
-                if 'Happiness_Importance' in feature_importance_df.columns:
-                    happiness_fi = feature_importance_df.nlargest(5, 'Happiness_Importance')
-                    
-                    fig, ax = plt.subplots(figsize=(8, 6))
-                    bars = ax.barh(happiness_fi['Feature'], happiness_fi['Happiness_Importance'], color='#2ecc71')
-                    ax.set_title('Features Contributing to Happiness', fontsize=12, fontweight='bold')
-                    ax.grid(True, alpha=0.3, axis='x')
-                    
-                    # Add value labels on bars
-                    for bar in bars:
-                        width = bar.get_width()
-                        ax.text(width + 0.001, bar.get_y() + bar.get_height()/2, 
-                               f'{width:.3f}', ha='left', va='center', fontsize=9)
-                    
-                    plt.tight_layout()
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
+                happiness_png = feature_importance_png("happiness_drivers")
+                if happiness_png is not None:
+                    st.image(happiness_png, use_container_width=True)
                 else:
                     st.info("Happiness feature importance data not available.")
                 
@@ -832,30 +711,15 @@ def main():
                 
                 st.markdown("<p class='chart-title'>😰 Top 5 Stress Factors</p>", unsafe_allow_html=True)
                 
-                if 'Stress_Importance' in feature_importance_df.columns:
-                    stress_fi = feature_importance_df.nlargest(5, 'Stress_Importance')
-                    
-                    fig, ax = plt.subplots(figsize=(8, 6))
-                    bars = ax.barh(stress_fi['Feature'], stress_fi['Stress_Importance'], color='#e74c3c')
-                    ax.set_xlabel('Feature Importance', fontsize=10)
-                    ax.set_title('Features Contributing to Stress', fontsize=12, fontweight='bold')
-                    ax.grid(True, alpha=0.3, axis='x')
-                    
-                    # Add value labels on bars
-                    for bar in bars:
-                        width = bar.get_width()
-                        ax.text(width + 0.001, bar.get_y() + bar.get_height()/2, 
-                               f'{width:.3f}', ha='left', va='center', fontsize=9)
-                    
-                    plt.tight_layout()
-                    st.pyplot(fig, use_container_width=True)
-                    plt.close(fig)
+                stress_png = feature_importance_png("stress_factors")
+                if stress_png is not None:
+                    st.image(stress_png, use_container_width=True)
                 else:
                     st.info("Stress feature importance data not available.")
                 
                 st.markdown("</div>", unsafe_allow_html=True)
         
-        # 5.3-5.6: SHAP Visualizations
+        # 6.3-6.6: SHAP Visualizations
         if shap_images:
             st.markdown("### 🔍 SHAP Analysis Visualizations")
             
@@ -863,7 +727,7 @@ def main():
             shap_row1 = st.columns(2)
             shap_row2 = st.columns(2)
             
-            # 5.3: SHAP Summary Plot - Happiness
+            # 6.3: SHAP Summary Plot - Happiness
             with shap_row1[0]:
                 if "Happiness Summary" in shap_images:
                     
@@ -873,7 +737,7 @@ def main():
                 else:
                     st.info("SHAP Happiness Summary plot not available.")
             
-            # 5.4: SHAP Summary Plot - Stress  
+            # 6.4: SHAP Summary Plot - Stress  
             with shap_row1[1]:
                 if "Stress Summary" in shap_images:
                     
@@ -883,7 +747,7 @@ def main():
                 else:
                     st.info("SHAP Stress Summary plot not available.")
             
-            # 5.5: SHAP Dot Plot - Happiness
+            # 6.5: SHAP Dot Plot - Happiness
             with shap_row2[0]:
                 if "Happiness Dot" in shap_images:
                     
@@ -893,7 +757,7 @@ def main():
                 else:
                     st.info("SHAP Happiness Dot plot not available.")
             
-            # 5.6: SHAP Dot Plot - Stress
+            # 6.6: SHAP Dot Plot - Stress
             with shap_row2[1]:
                 if "Stress Dot" in shap_images:
                     
@@ -905,243 +769,87 @@ def main():
     
     except Exception as e:
         st.error("Error loading SHAP visualizations or feature importance data.")
-      # --- 6. PERSONALIZED INSIGHTS SECTION ---
-    st.markdown("---")
-    st.markdown("<h2 style='text-align:center; color:#2c3e50; margin-bottom:20px;'>💡 Personalized Insights</h2>", unsafe_allow_html=True)
-    st.markdown("<p style='text-align:center; color:#7f8c8d; margin-bottom:30px;'>Dynamic insights based on your current filter selection</p>", unsafe_allow_html=True)
-    
-    # Generate comprehensive insights that work with ANY amount of data
-    insights = []
-    
-    if not filtered_df.empty:
-        try:
-            # INSIGHT 1: Data Overview & Filter Impact
-            total_entries = len(df)
-            filtered_entries = len(filtered_df)
-            filter_percentage = (filtered_entries / total_entries) * 100;
-            
-            insights.append({
-                'icon': '📊',
-                'title': 'Filter Overview',
-                'text': f"Viewing {filtered_entries:,} entries ({filter_percentage:.1f}% of total dataset)"
-            })
-            
-            # INSIGHT 2: Happiness Analysis (always available)
-            avg_happiness = filtered_df['Happiness Score'].mean()
-            overall_happiness = df['Happiness Score'].mean()
-            happiness_diff = avg_happiness - overall_happiness
-            
-            if happiness_diff > 0.2:
-                insights.append({
-                    'icon': '😊📈',
-                    'title': 'Happiness Boost',
-                    'text': f"Your selection shows {happiness_diff:.1f} points higher happiness than average ({avg_happiness:.1f}/10)"
-                })
-            elif happiness_diff < -0.2:
-                insights.append({
-                    'icon': '😔📉',
-                    'title': 'Happiness Alert',
-                    'text': f"Your selection shows {abs(happiness_diff):.1f} points lower happiness than average ({avg_happiness:.1f}/10)"
-                })
-            else:
-                insights.append({
-                    'icon': '😐📊',
-                    'title': 'Happiness Balance',
-                    'text': f"Your selection shows average happiness levels ({avg_happiness:.1f}/10)"
-                })
-            
-            # INSIGHT 3: Stress Analysis (always available)
-            try:
-                # Handle both numeric and categorical stress
-                if filtered_df['Stress Level'].dtype == 'object':
-                    stress_mapping = {'Low': 1, 'Moderate': 2, 'High': 3}
-                    avg_stress = filtered_df['Stress Level'].map(stress_mapping).mean()
-                    overall_stress = df['Stress Level'].map(stress_mapping).mean()
-                    stress_scale = "/3"
-                else:
-                    avg_stress = filtered_df['Stress Level'].mean()
-                    overall_stress = df['Stress Level'].mean()
-                    stress_scale = "/10"
-                
-                stress_diff = avg_stress - overall_stress
-                
-                if stress_diff > 0.2:
-                    insights.append({
-                        'icon': '😰⚠️',
-                        'title': 'Stress Alert',
-                        'text': f"Your selection shows higher stress levels ({avg_stress:.1f}{stress_scale} vs {overall_stress:.1f}{stress_scale} average)"
-                    })
-                elif stress_diff < -0.2:
-                    insights.append({
-                        'icon': '😌✨',
-                        'title': 'Lower Stress',
-                        'text': f"Your selection shows lower stress levels ({avg_stress:.1f}{stress_scale} vs {overall_stress:.1f}{stress_scale} average)"
-                    })
-                else:
-                    insights.append({
-                        'icon': '😐📊',
-                        'title': 'Average Stress',
-                        'text': f"Your selection shows typical stress levels ({avg_stress:.1f}{stress_scale})"
-                    })
-            except:
-                pass
-            
-            # INSIGHT 4: Sleep Pattern Analysis
-            avg_sleep = filtered_df['Sleep Hours'].mean()
-            overall_sleep = df['Sleep Hours'].mean()
-            
-            if avg_sleep < 6:
-                insights.append({
-                    'icon': '😴⚠️',
-                    'title': 'Sleep Concern',
-                    'text': f"Average sleep in selection: {avg_sleep:.1f}h - Consider aiming for 7-8 hours"
-                })
-            elif avg_sleep > 8.5:
-                insights.append({
-                    'icon': '😴💤',
-                    'title': 'High Sleep',
-                    'text': f"Average sleep in selection: {avg_sleep:.1f}h - Above typical range"
-                })
-            else:
-                insights.append({
-                    'icon': '😴✅',
-                    'title': 'Good Sleep',
-                    'text': f"Average sleep in selection: {avg_sleep:.1f}h - Within healthy range"
-                })
-            
-            # INSIGHT 5: Exercise Pattern Analysis
-            if len(filtered_df) > 0:
-                exercise_counts = filtered_df['Exercise Level'].value_counts()
-                top_exercise = exercise_counts.index[0]
-                exercise_percentage = (exercise_counts.iloc[0] / len(filtered_df)) * 100
-                
-                if top_exercise == 'High':
-                    insights.append({
-                        'icon': '💪🔥',
-                        'title': 'Active Lifestyle',
-                        'text': f"{exercise_percentage:.0f}% of your selection exercises at high intensity"
-                    })
-                elif top_exercise == 'Low':
-                    insights.append({
-                        'icon': '🚶‍♂️📈',
-                        'title': 'Exercise Opportunity',
-                        'text': f"{exercise_percentage:.0f}% of your selection has low exercise - room for improvement"
-                    })
-                else:
-                    insights.append({
-                        'icon': '🏃‍♀️📊',
-                        'title': 'Moderate Activity',
-                        'text': f"{exercise_percentage:.0f}% of your selection exercises at moderate levels"
-                    })
-            
-            # INSIGHT 6: Work-Life Balance Analysis
-            avg_work = filtered_df['Work Hours per Week'].mean()
-            
-            if avg_work > 50:
-                insights.append({
-                    'icon': '💼⚠️',
-                    'title': 'Work Intensity',
-                    'text': f"Average work hours: {avg_work:.1f}h/week - High workload may impact wellbeing"
-                })
-            elif avg_work < 30:
-                insights.append({
-                    'icon': '💼😊',
-                    'title': 'Work Balance',
-                    'text': f"Average work hours: {avg_work:.1f}h/week - Good work-life balance"
-                })
-            else:
-                insights.append({
-                    'icon': '💼📊',
-                    'title': 'Standard Workload',
-                    'text': f"Average work hours: {avg_work:.1f}h/week - Typical full-time schedule"
-                })
-            
-            # INSIGHT 7: Screen Time Analysis
-            avg_screen = filtered_df['Screen Time per Day (Hours)'].mean()
-            
-            if avg_screen > 8:
-                insights.append({
-                    'icon': '📱⚠️',
-                    'title': 'High Screen Time',
-                    'text': f"Average screen time: {avg_screen:.1f}h/day - Consider digital wellness breaks"
-                })
-            elif avg_screen < 4:
-                insights.append({
-                    'icon': '📱✅',
-                    'title': 'Moderate Screen Use',
-                    'text': f"Average screen time: {avg_screen:.1f}h/day - Good digital balance"
-                })
-            else:
-                insights.append({
-                    'icon': '📱📊',
-                    'title': 'Typical Screen Time',
-                    'text': f"Average screen time: {avg_screen:.1f}h/day - Within normal range"
-                })
-            
-            # INSIGHT 8: Social Interaction Analysis
-            avg_social = filtered_df['Social Interaction Score'].mean()
-            
-            if avg_social < 4:
-                insights.append({
-                    'icon': '👥📉',
-                    'title': 'Social Opportunity',
-                    'text': f"Social interaction score: {avg_social:.1f}/10 - Consider increasing social connections"
-                })
-            elif avg_social > 7:
-                insights.append({
-                    'icon': '👥🌟',
-                    'title': 'Strong Social Life',
-                    'text': f"Social interaction score: {avg_social:.1f}/10 - Excellent social connections"
-                })
-            else:
-                insights.append({
-                    'icon': '👥📊',
-                    'title': 'Moderate Social Life',
-                    'text': f"Social interaction score: {avg_social:.1f}/10 - Balanced social interactions"
-                })
-            
-        except Exception as e:
-            # Fallback insight that always works
-            insights = [{
-                'icon': '📊',
-                'title': 'Data Analysis',
-                'text': f"Analyzing {len(filtered_df)} entries from your filter selection"
-            }]
-    
-    else:
-        # Empty dataset insight
-        insights = [{
-            'icon': '🔍',
-            'title': 'No Data Found',
-            'text': "No entries match your current filter criteria. Try adjusting your filters."
-        }]
-    
-    # Display insights in a grid (always show at least 2, up to 4)
-    num_insights_to_show = min(4, len(insights))
-    if num_insights_to_show >= 2:
-        insight_cols = st.columns(2)
-        for i in range(num_insights_to_show):
-            with insight_cols[i % 2]:
-                insight = insights[i]
-                st.markdown(f"""
-                <div class="metric-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); text-align: center; margin-bottom: 1rem;">
-                    <div style="font-size: 2rem; margin-bottom: 0.5rem;">{insight['icon']}</div>
-                    <div style="font-size: 1rem; font-weight: bold; margin-bottom: 0.25rem;">{insight['title']}</div>
-                    <div style="font-size: 0.9rem; opacity: 0.9;">{insight['text']}</div>
+
+def prediction_history_section():
+    """Simulator usage and predicted wellness from the prediction history"""
+    # --- 8. PREDICTION HISTORY SECTION ---
+    # Only rows appended since the last rerun are parsed; totals live in the cached reader
+    history_reader = get_history_reader()
+    history_reader.refresh()
+    daily_history = history_reader.aggregates('D')
+
+    if not daily_history.empty:
+        st.markdown("---")
+        st.markdown("<h2 style='text-align:center; color:#2c3e50; margin-bottom:20px;'>📈 Simulator Usage & Predicted Wellness</h2>", unsafe_allow_html=True)
+
+        recent = daily_history.tail(7)
+        history_cols = st.columns(3)
+        with history_cols[0]:
+            st.markdown(f"""
+            <div class="metric-card primary">
+                <div class="metric-number">{daily_history['Predictions'].sum():,}</div>
+                <div class="metric-label">
+                    <i class="fas fa-history"></i> Total Predictions
                 </div>
-                """, unsafe_allow_html=True)
-    else:
-        # Single insight display
-        insight = insights[0]
-        st.markdown(f"""
-        <div class="metric-card" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); text-align: center; margin-bottom: 1rem;">
-            <div style="font-size: 2rem; margin-bottom: 0.5rem;">{insight['icon']}</div>
-            <div style="font-size: 1rem; font-weight: bold; margin-bottom: 0.25rem;">{insight['title']}</div>
-            <div style="font-size: 0.9rem; opacity: 0.9;">{insight['text']}</div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # --- 7. SIMULATOR ACCESS SECTION ---
+            </div>
+            """, unsafe_allow_html=True)
+        with history_cols[1]:
+            recent_happiness = (recent['Happiness Score'] * recent['Predictions']).sum() / recent['Predictions'].sum()
+            st.markdown(f"""
+            <div class="metric-card success">
+                <div class="metric-number">{recent_happiness:.1f}/10</div>
+                <div class="metric-label">
+                    <i class="fas fa-smile"></i> Avg Predicted Happiness (last 7 active days)
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+        with history_cols[2]:
+            recent_burnout = (recent['Burnout Risk'] * recent['Predictions']).sum() / recent['Predictions'].sum()
+            st.markdown(f"""
+            <div class="metric-card warning">
+                <div class="metric-number">{recent_burnout:.1f}%</div>
+                <div class="metric-label">
+                    <i class="fas fa-fire"></i> Avg Predicted Burnout (last 7 active days)
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+
+        history_chart_cols = st.columns(2)
+        with history_chart_cols[0]:
+            def usage_chart():
+                fig, ax = plt.subplots(figsize=(6, 3))
+                ax.bar(daily_history.index, daily_history['Predictions'], color='#667eea', width=0.8)
+                ax.set_ylabel('Predictions', fontsize=8)
+                ax.tick_params(labelsize=8)
+                ax.grid(True, axis='y', alpha=0.3)
+                fig.autofmt_xdate()
+                plt.tight_layout()
+                return fig
+            create_and_display_chart(usage_chart, "🗓️ Predictions per Day")
+
+        with history_chart_cols[1]:
+            def wellness_trend_chart():
+                fig, ax = plt.subplots(figsize=(6, 3))
+                ax.plot(daily_history.index, daily_history['Happiness Score'], marker='o', color='#11998e', label='Happiness (0-10)')
+                ax.plot(daily_history.index, daily_history['Stress Level'], marker='s', color='#f39c12', label='Stress (0-10)')
+                ax.set_ylim(0, 10)
+                ax.set_ylabel('Mean Score', fontsize=8)
+                burnout_ax = ax.twinx()
+                burnout_ax.plot(daily_history.index, daily_history['Burnout Risk'], marker='^', linestyle='--', color='#e74c3c', label='Burnout (%)')
+                burnout_ax.set_ylabel('Burnout Risk (%)', fontsize=8)
+                ax.tick_params(labelsize=8)
+                burnout_ax.tick_params(labelsize=8)
+                ax.grid(True, alpha=0.3)
+                lines = ax.get_lines() + burnout_ax.get_lines()
+                ax.legend(lines, [line.get_label() for line in lines], fontsize=7, loc='upper left')
+                fig.autofmt_xdate()
+                plt.tight_layout()
+                return fig
+            create_and_display_chart(wellness_trend_chart, "📉 Predicted Wellness Trend")
+
+def simulator_section():
+    """Link to the simulator, dataset downloads and the go-to-top button"""
+    # --- 9. SIMULATOR ACCESS SECTION ---
     st.markdown("---")
     st.markdown("<h2 style='text-align:center; color:#2c3e50; margin-bottom:20px;'>🚀 Explore Predictions with Simulator</h2>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; color:#7f8c8d; margin-bottom:30px;'>Use our AI-powered simulator to predict your personal wellness outcomes</p>", unsafe_allow_html=True)
@@ -1246,17 +954,21 @@ def main():
         </style>
         """, unsafe_allow_html=True)
       # Utility Buttons
-    # CSV Download Button
-    csv_col1, csv_col2, csv_col3 = st.columns([1, 1, 1])
-    with csv_col2:
-        if st.download_button(
-            label="📊 Download Dataset CSV",
-            data=df.to_csv(index=False),
-            file_name="Mental_Health_Lifestyle_Dataset.csv",
-            mime="text/csv",
-            use_container_width=True
-        ):
-            st.success("Dataset downloaded successfully!")
+    # Dataset Download Buttons; each file is built on first click and cached per dataset version
+    download_formats = [("csv", "📊 Download Dataset CSV"), ("csv.gz", "🗜️ Download CSV (gzip)")]
+    if parquet_supported():
+        download_formats.append(("parquet", "📦 Download Parquet"))
+    download_cols = st.columns(len(download_formats))
+    for col, (fmt, label) in zip(download_cols, download_formats):
+        with col:
+            st.download_button(
+                label=label,
+                data=partial(load_dataset_export, fmt),
+                file_name=export_filename(fmt),
+                mime=EXPORT_FORMATS[fmt][1],
+                on_click="ignore",
+                use_container_width=True
+            )
     
     # Fixed Go-to-Top Button with improved JavaScript
     st.markdown("""
@@ -1335,5 +1047,15 @@ def main():
     </script>
     """, unsafe_allow_html=True)
 
+def main():
+    # Load data
+    df = load_data()
+
+    filtered_sections(df)
+    comparison_section()
+    feature_importance_section()
+    prediction_history_section()
+    simulator_section()
+
 if __name__ == "__main__":
     main()
@@ -8,21 +8,31 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib
-import seaborn as sns
-import joblib
 import os
-import shap
 from datetime import datetime
-import csv
 import warnings
 import io
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
 import tempfile
-import base64
+from functools import partial
+
+from dashboard.bulk_reports import REQUIRED_COLUMNS, generate_cohort_reports
+from dashboard.history_log import HISTORY_CSV_PATH, build_history_record, get_history_writer
+from dashboard.recommendations import PRIORITY_ORDER, get_recommendation_insights
+from dashboard.report_jobs import ReportJobManager
+from dashboard.session_artifacts import SessionArtifactStore, new_session_id
+from dashboard.warmup import load_forecast_volatility as load_warm_forecast_volatility
+from dashboard.wellness_engine import (
+    DEFAULT_FORECAST_VOLATILITY,
+    NUMERIC_INPUT_RANGES,
+    TARGET_METRICS,
+    compute_burnout_risk,
+    find_counterfactuals,
+    forecast_percentile,
+    load_models as load_engine_models,
+    preprocess_inputs_batch,
+    score_sensitivity_grid,
+    simulate_forecast_bands,
+)
 
 # Configure matplotlib to handle font warnings
 matplotlib.rcParams['font.family'] = 'DejaVu Sans'
@@ -30,30 +40,6 @@ plt.rcParams['axes.unicode_minus'] = False
 warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
 warnings.filterwarnings('ignore', message='Glyph.*missing from font.*')
 
-# Initialize session state
-if 'predictions_made' not in st.session_state:
-    st.session_state.predictions_made = False
-if 'inputs' not in st.session_state:
-    st.session_state.inputs = None
-if 'processed_inputs' not in st.session_state:
-    st.session_state.processed_inputs = None
-if 'happiness_pred' not in st.session_state:
-    st.session_state.happiness_pred = None
-if 'stress_pred' not in st.session_state:
-    st.session_state.stress_pred = None
-if 'burnout_risk' not in st.session_state:
-    st.session_state.burnout_risk = None
-if 'happiness_forecast' not in st.session_state:
-    st.session_state.happiness_forecast = None
-if 'stress_forecast' not in st.session_state:
-    st.session_state.stress_forecast = None
-if 'burnout_forecast' not in st.session_state:
-    st.session_state.burnout_forecast = None
-if 'pdf_content' not in st.session_state:
-    st.session_state.pdf_content = None
-if 'predictions_made' not in st.session_state:
-    st.session_state.predictions_made = False
-
 # Enhanced CSS styling with Bootstrap integration
 st.markdown("""
 <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
@@ -153,24 +139,12 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Path configuration
-DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Mental_Health_Lifestyle_Dataset.csv")
-MODELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs")
-
-# Load dataset for reference values
-@st.cache_data
-def load_data():
-    df = pd.read_csv(DATA_PATH)
-    return df
-
 # Load models
 @st.cache_resource
 def load_models():
-    """Load the trained models."""
+    """Load the trained models (shared with the server's background warm-up)."""
     try:
-        happiness_model = joblib.load(os.path.join(MODELS_PATH, "lifesync_happiness_model.pkl"))
-        stress_model = joblib.load(os.path.join(MODELS_PATH, "lifesync_stress_model.pkl"))
-        return happiness_model, stress_model
+        return load_engine_models()
     except FileNotFoundError as e:
         st.error(f"Model files not found: {e}")
         return None, None
@@ -179,56 +153,65 @@ def preprocess_inputs(inputs):
     """
     Process user inputs to prepare for model prediction
     """
-    # Load the data and model to get expected features
-    happiness_model = joblib.load(os.path.join(MODELS_PATH, "lifesync_happiness_model.pkl"))
+    # Feature order comes from the cached happiness model
+    happiness_model, _ = load_models()
     feature_names = happiness_model.feature_names_in_
     
-    # Create a DataFrame from inputs
-    input_df = pd.DataFrame([inputs])
-    
-    # Process Exercise Level: Map to numeric
-    exercise_mapping = {'Low': 1, 'Moderate': 2, 'High': 3}
-    input_df['Exercise Level'] = input_df['Exercise Level'].map(exercise_mapping)
-    
-    # Initialize all possible one-hot encoded columns with zeros
-    categorical_prefixes = ['Gender_', 'Diet_', 'MH_', 'Country_']
-    for feature in feature_names:
-        for prefix in categorical_prefixes:
-            if feature.startswith(prefix):
-                input_df[feature] = 0
-    
-    # Set the appropriate one-hot encoded columns to 1
-    if f'Gender_{inputs["Gender"]}' in feature_names:
-        input_df[f'Gender_{inputs["Gender"]}'] = 1
-    
-    if f'Diet_{inputs["Diet Type"]}' in feature_names:
-        input_df[f'Diet_{inputs["Diet Type"]}'] = 1
-    
-    if f'MH_{inputs["Mental Health Condition"]}' in feature_names:
-        input_df[f'MH_{inputs["Mental Health Condition"]}'] = 1
+    # Encode through the same vectorised path used for batch scoring
+    return preprocess_inputs_batch(pd.DataFrame([inputs]), feature_names)
+
+# Render the 2-D sensitivity heatmap for a profile
+@st.cache_data(show_spinner=False, max_entries=64)
+def render_sensitivity_heatmap(inputs, x_factor, y_factor, resolution=50):
+    """
+    Score a resolution x resolution grid over two numeric inputs and render
+    happiness and stress heatmaps side by side.
     
-    # Use most common country from training data - default to USA
-    if f'Country_{inputs["Country"]}' in feature_names:
-        input_df[f'Country_{inputs["Country"]}'] = 1
-    else:
-        # Default to USA if country not in training data
-        input_df['Country_USA'] = 1
+    Returns the rendered figure as PNG bytes so reruns reuse the cached image.
+    """
+    happiness_model, stress_model = load_models()
+    grid = score_sensitivity_grid(happiness_model, stress_model, inputs, x_factor, y_factor, resolution)
     
-    # Remove original categorical columns not needed for prediction
-    input_df.drop(['Gender', 'Diet Type', 'Mental Health Condition', 'Country'], axis=1, inplace=True)
+    extent = [grid['x_values'][0], grid['x_values'][-1], grid['y_values'][0], grid['y_values'][-1]]
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5.5))
     
-    # Ensure all features are in the correct order
-    input_df = input_df.reindex(columns=feature_names, fill_value=0)
+    panels = [
+        (ax1, grid['happiness'], 'RdYlGn', 'Predicted Happiness (0-10)'),
+        (ax2, grid['stress'], 'RdYlGn_r', 'Predicted Stress (0-10)'),
+    ]
+    for ax, values, cmap, title in panels:
+        image = ax.imshow(values, origin='lower', aspect='auto', extent=extent, cmap=cmap, vmin=0, vmax=10)
+        ax.scatter([inputs[x_factor]], [inputs[y_factor]], marker='*', s=250, color='white', edgecolors='black', zorder=3, label='You')
+        ax.set_title(title, fontweight='bold')
+        ax.set_xlabel(x_factor)
+        ax.set_ylabel(y_factor)
+        ax.legend(loc='upper right', fontsize=8)
+        fig.colorbar(image, ax=ax, shrink=0.85)
+    
+    plt.tight_layout()
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format='png', dpi=100)
+    plt.close(fig)
     
-    return input_df
+    return img_buffer.getvalue()
+
+# Residual spread of the models against the dataset, used to size forecast uncertainty
+@st.cache_data(show_spinner=False)
+def load_forecast_volatility():
+    happiness_model, stress_model = load_models()
+    if happiness_model is None or stress_model is None:
+        return dict(DEFAULT_FORECAST_VOLATILITY)
+    try:
+        return load_warm_forecast_volatility(happiness_model, stress_model)
+    except Exception:
+        return dict(DEFAULT_FORECAST_VOLATILITY)
 
-def generate_forecast(happiness, stress, burnout):
-    """Generate wellness forecasts with realistic progression."""
-    # Base rates for realistic progression
-    happiness_decline_rate = 0.12
-    stress_increase_rate = 0.20
-    burnout_increase_rate = 2.0
-      # Ensure inputs are valid numbers
+def generate_forecast_bands(happiness, stress, burnout):
+    """
+    Simulate thousands of wellness trajectories and return percentile bands
+    (p10/p25/p50/p75/p90) for each forecast period.
+    """
+    # Ensure inputs are valid numbers
     try:
         happiness = float(happiness) if happiness is not None else 5.0
         stress = float(stress) if stress is not None else 5.0
@@ -238,257 +221,79 @@ def generate_forecast(happiness, stress, burnout):
         stress = 5.0
         burnout = 50.0
     
-    # Happiness forecast
-    happiness_forecast = {
-        "Current": round(happiness, 1),
-        "3 Days": round(max(0, happiness - (happiness_decline_rate * 0.4)), 1),
-        "1 Week": round(max(0, happiness - happiness_decline_rate), 1),
-        "1 Month": round(max(0, happiness - (happiness_decline_rate * 2.5)), 1),
-        "3 Months": round(max(0, happiness - (happiness_decline_rate * 5)), 1),
-    }
-    
-    # Stress forecast
-    stress_forecast = {
-        "Current": round(stress, 1),
-        "3 Days": round(min(10, stress + (stress_increase_rate * 0.5)), 1),
-        "1 Week": round(min(10, stress + stress_increase_rate), 1),
-        "1 Month": round(min(10, stress + (stress_increase_rate * 2)), 1),
-        "3 Months": round(min(10, stress + (stress_increase_rate * 3.5)), 1),
-    }
-    
-    # Burnout forecast
-    burnout_forecast = {
-        "Current": round(burnout, 1),
-        "3 Days": round(min(100, burnout + burnout_increase_rate), 1),
-        "1 Week": round(min(100, burnout + (burnout_increase_rate * 1.8)), 1),
-        "1 Month": round(min(100, burnout + (burnout_increase_rate * 4.5)), 1),
-        "3 Months": round(min(100, burnout + (burnout_increase_rate * 8)), 1),
-    }
-    
-    return happiness_forecast, stress_forecast, burnout_forecast
+    return simulate_forecast_bands(happiness, stress, burnout, volatility=load_forecast_volatility())
 
-def get_recommendation_insights(inputs, happiness, stress, burnout):
-    """Generate personalized recommendations based on predictions."""
-    recommendations = []
-    
-    # Sleep recommendations
-    if inputs['Sleep Hours'] < 7:
-        recommendations.append({
-            'category': 'Sleep Optimization',
-            'icon': 'fas fa-bed',
-            'color': 'primary',
-            'priority': 'high' if inputs['Sleep Hours'] < 6 else 'medium',
-            'title': 'Improve Sleep Quality',
-            'message': f"Your sleep duration ({inputs['Sleep Hours']:.1f}h) is below optimal.",
-            'actions': [
-                "Aim for 7-9 hours of sleep per night",
-                "Create a consistent bedtime routine",
-                "Avoid screens 1 hour before bed",
-                "Keep your bedroom cool and dark"
-            ],
-            'impact': 'High impact on happiness and stress reduction'
-        })
-    elif inputs['Sleep Hours'] > 9:
-        recommendations.append({
-            'category': 'Sleep Balance',
-            'icon': 'fas fa-clock',
-            'color': 'info',
-            'priority': 'low',
-            'title': 'Optimize Sleep Duration',
-            'message': f"You're getting {inputs['Sleep Hours']:.1f}h of sleep, which may be excessive.",
-            'actions': [
-                "Try gradually reducing sleep to 7-8 hours",
-                "Ensure sleep quality over quantity",
-                "Check for underlying health issues"
-            ],
-            'impact': 'Moderate impact on energy levels'
-        })
-    
-    # Work-life balance
-    if inputs['Work Hours per Week'] > 50:
-        recommendations.append({
-            'category': 'Work-Life Balance',
-            'icon': 'fas fa-briefcase',
-            'color': 'warning',
-            'priority': 'high' if inputs['Work Hours per Week'] > 60 else 'medium',
-            'title': 'Manage Work Hours',
-            'message': f"High work hours ({inputs['Work Hours per Week']:.0f}h/week) may increase burnout risk.",
-            'actions': [
-                "Set clear work boundaries",
-                "Take regular breaks every 90 minutes",
-                "Practice saying 'no' to non-essential tasks",
-                "Consider delegating responsibilities"
-            ],
-            'impact': 'Critical for preventing burnout'
-        })
-    
-    # Screen time
-    if inputs['Screen Time per Day (Hours)'] > 6:
-        recommendations.append({
-            'category': 'Digital Wellness',
-            'icon': 'fas fa-mobile-alt',
-            'color': 'info',
-            'priority': 'medium',
-            'title': 'Reduce Screen Time',
-            'message': f"Screen time ({inputs['Screen Time per Day (Hours)']:.1f}h/day) is above recommended levels.",
-            'actions': [
-                "Follow the 20-20-20 rule (every 20 min, look 20 feet away for 20 sec)",
-                "Use app timers to limit social media",
-                "Implement screen-free zones in your home",
-                "Try digital detox periods"
-            ],
-            'impact': 'Reduces eye strain and improves focus'
-        })
-    
-    # Social interaction
-    if inputs['Social Interaction Score'] < 5:
-        recommendations.append({
-            'category': 'Social Connection',
-            'icon': 'fas fa-users',
-            'color': 'success',
-            'priority': 'medium',
-            'title': 'Enhance Social Connections',
-            'message': f"Social interaction score ({inputs['Social Interaction Score']:.0f}/10) could be improved.",
-            'actions': [
-                "Schedule regular meetups with friends",
-                "Join clubs or groups with similar interests",
-                "Practice active listening in conversations",
-                "Consider volunteering in your community"
-            ],
-            'impact': 'Significant boost to mental health and happiness'
-        })
-    
-    # Exercise
-    if inputs['Exercise Level'] == 'Low':
-        recommendations.append({
-            'category': 'Physical Activity',
-            'icon': 'fas fa-dumbbell',
-            'color': 'danger',
-            'priority': 'high',
-            'title': 'Increase Physical Activity',
-            'message': "Regular exercise can significantly improve mood and reduce stress levels.",
-            'actions': [
-                "Start with 15-20 minutes of walking daily",
-                "Try bodyweight exercises at home",
-                "Find an activity you enjoy (dancing, swimming, cycling)",
-                "Gradually increase intensity and duration"
-            ],
-            'impact': 'Powerful mood booster and stress reliever'
-        })
-    elif inputs['Exercise Level'] == 'Moderate':
-        recommendations.append({
-            'category': 'Fitness Enhancement',
-            'icon': 'fas fa-running',
-            'color': 'success',
-            'priority': 'low',
-            'title': 'Optimize Your Fitness Routine',
-            'message': "You're doing well! Consider enhancing your routine.",
-            'actions': [
-                "Add strength training 2-3 times per week",
-                "Try high-intensity interval training (HIIT)",
-                "Include flexibility and balance exercises",
-                "Set new fitness goals to stay motivated"
-            ],
-            'impact': 'Further improvements in energy and mood'
-        })
-    
-    # Diet recommendations
-    if inputs['Diet Type'] == 'Junk Food':
-        recommendations.append({
-            'category': 'Nutrition',
-            'icon': 'fas fa-apple-alt',
-            'color': 'warning',
-            'priority': 'high',
-            'title': 'Improve Nutrition',
-            'message': "Diet significantly impacts mood and energy levels.",
-            'actions': [
-                "Gradually replace processed foods with whole foods",
-                "Include more fruits and vegetables",
-                "Stay hydrated with 8 glasses of water daily",
-                "Plan meals in advance to avoid impulsive choices"
-            ],
-            'impact': 'Major improvement in energy and mental clarity'
-        })
-    
-    # Mental health support
-    if inputs['Mental Health Condition'] != 'None':
-        recommendations.append({
-            'category': 'Mental Health Support',
-            'icon': 'fas fa-heart',
-            'color': 'info',
-            'priority': 'high',
-            'title': 'Professional Support',
-            'message': f"Managing {inputs['Mental Health Condition'].lower()} requires ongoing care.",
-            'actions': [
-                "Continue regular therapy or counseling sessions",
-                "Practice mindfulness and meditation",
-                "Build a strong support network",
-                "Consider stress-reduction techniques like yoga"
-            ],
-            'impact': 'Essential for long-term mental wellness'
-        })
-    
-    # Stress management (based on predictions)
-    if stress > 6:
-        recommendations.append({
-            'category': 'Stress Management',
-            'icon': 'fas fa-leaf',
-            'color': 'success',
-            'priority': 'high',
-            'title': 'Reduce Stress Levels',
-            'message': "Your stress levels are elevated and need attention.",
-            'actions': [
-                "Practice deep breathing exercises",
-                "Try progressive muscle relaxation",
-                "Engage in hobbies you enjoy",
-                "Consider meditation or yoga classes"
-            ],
-            'impact': 'Immediate stress relief and better coping'
-        })
-    
-    # Happiness boosters (based on predictions)
-    if happiness < 6:
-        recommendations.append({
-            'category': 'Happiness Boost',
-            'icon': 'fas fa-smile',
-            'color': 'warning',
-            'priority': 'medium',
-            'title': 'Enhance Well-being',
-            'message': "Let's work on boosting your happiness levels.",
-            'actions': [
-                "Practice gratitude journaling",
-                "Engage in activities that bring you joy",
-                "Spend time in nature",
-                "Connect with positive, supportive people"
-            ],
-            'impact': 'Gradual improvement in overall life satisfaction'
-        })
-    
-    # If no specific recommendations, provide general wellness tips
-    if not recommendations:
-        recommendations.append({
-            'category': 'Wellness Maintenance',
-            'icon': 'fas fa-star',
-            'color': 'success',
-            'priority': 'low',
-            'title': 'Maintain Your Great Habits',
-            'message': "Your lifestyle appears well-balanced! Keep up the excellent work.",
-            'actions': [
-                "Continue your current healthy routines",
-                "Set new wellness goals to stay motivated",
-                "Share your healthy habits with others",
-                "Regular check-ins with your wellness progress"
-            ],
-            'impact': 'Sustained long-term health and happiness'
-        })
-    
-    return recommendations
+# Search for the cheapest lifestyle changes that reach a wellness goal
+@st.cache_data(show_spinner=False, max_entries=64)
+def search_counterfactuals(inputs, metric, target):
+    happiness_model, stress_model = load_models()
+    return find_counterfactuals(happiness_model, stress_model, inputs, metric, target)
+
+# Shade the simulated percentile bands behind a forecast line
+def plot_forecast_bands(ax, x_pos, bands, color):
+    periods = list(bands.keys())
+    ax.fill_between(x_pos, [bands[p]['p10'] for p in periods], [bands[p]['p90'] for p in periods],
+                    alpha=0.15, color=color, label='80% range')
+    ax.fill_between(x_pos, [bands[p]['p25'] for p in periods], [bands[p]['p75'] for p in periods],
+                    alpha=0.3, color=color, label='50% range')
+    ax.legend(loc='upper right', fontsize=8)
+
+# Background PDF report jobs, shared by every session in this process
+@st.cache_resource
+def get_report_jobs():
+    return ReportJobManager()
+
+# Large per-session results spilled to disk, shared by every session in this process
+@st.cache_resource
+def get_session_artifacts():
+    return SessionArtifactStore()
 
-# Save prediction results to CSV
-def save_prediction_to_csv(inputs, happiness_pred, stress_pred, burnout_risk, csv_path=None):
+# Bytes of a stored artifact for a deferred download button, read only when it is clicked
+def artifact_download(handle):
+    data = get_session_artifacts().get(handle)
+    if data is None:
+        # Failing the download shows an error instead of saving an empty file
+        raise FileNotFoundError("This file has expired. Reload the page and generate it again.")
+    return data
+
+# Poll the current session's PDF job and show its progress
+def render_pdf_job_status():
+    jobs = get_report_jobs()
+    job = jobs.status(st.session_state.pdf_job_id)
+    running = job is not None and job['status'] in ('queued', 'running')
+
+    @st.fragment(run_every=0.5 if running else None)
+    def pdf_job_progress():
+        job_id = st.session_state.pdf_job_id
+        job = jobs.status(job_id)
+        if job is None:
+            st.session_state.pdf_job_id = None
+            return
+        if job['status'] in ('queued', 'running'):
+            st.progress(job['progress'], text=job['message'])
+            return
+
+        # Finished: hand the PDF to the session and rerun so the download button appears
+        st.session_state.pdf_job_id = None
+        if job['status'] == 'failed':
+            st.error(f"Error generating PDF: {job['error']}")
+            return
+        pdf_content = jobs.result(job_id)
+        if pdf_content is None:
+            st.error("The generated report is no longer available. Please generate it again.")
+            return
+        st.session_state.pdf_handle = get_session_artifacts().put(
+            st.session_state.artifact_session, 'report_pdf', pdf_content)
+        st.rerun()
+
+    pdf_job_progress()
+
+# Save prediction results to the history files
+def save_prediction_to_csv(inputs, happiness_pred, stress_pred, burnout_risk):
     """
-    Save user inputs and prediction results to a CSV file with timestamp
-    
+    Queue one prediction for the background history writer, which appends it to both
+    'outputs/prediction_history.csv' and 'predictions/prediction_results.csv'
+
     Parameters:
     -----------
     inputs : dict
@@ -499,576 +304,31 @@ def save_prediction_to_csv(inputs, happiness_pred, stress_pred, burnout_risk, cs
         Stress level prediction value
     burnout_risk : float
         Burnout risk percentage
-    csv_path : str, optional
-        Path to the CSV file. If None, defaults to 'prediction_history.csv'
-        in the outputs directory.
-    """
-    if csv_path is None:
-        # Use the outputs directory to store prediction history
-        outputs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs")
-        
-        # Ensure the outputs directory exists
-        os.makedirs(outputs_dir, exist_ok=True)
-        
-        csv_path = os.path.join(outputs_dir, "prediction_history.csv")
-    
-    # Check if file exists to determine if we need to write the header
-    file_exists = os.path.isfile(csv_path)
-    
-    try:
-        # Create a list with the column values in the correct order
-        with open(csv_path, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            
-            # Write header if file is new
-            if not file_exists:
-                writer.writerow([
-                    "Timestamp", "Name", "Age", "Gender", "Sleep Hours", "Work Hours per Week", 
-                    "Screen Time per Day (Hours)", "Social Interaction Score", 
-                    "Exercise Level", "Diet Type", "Mental Health Condition", 
-                    "Happiness Score", "Stress Level", "Burnout Risk"
-                ])
-            
-            # Write the data row
-            writer.writerow([
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                inputs.get("Name", ""), 
-                inputs["Age"], 
-                inputs["Gender"], 
-                inputs["Sleep Hours"], 
-                inputs["Work Hours per Week"],
-                inputs["Screen Time per Day (Hours)"], 
-                inputs["Social Interaction Score"],
-                inputs["Exercise Level"], 
-                inputs["Diet Type"], 
-                inputs["Mental Health Condition"],
-                happiness_pred, 
-                stress_pred, 
-                burnout_risk
-            ])
-        
-        return True, csv_path
-    except Exception as e:
-        st.warning(f"Could not save prediction history: {e}")
-        return False, str(e)
-
-# Save predictions to a local CSV file in the predictions folder
-def save_predictions_to_csv(inputs, happiness_pred, stress_pred, burnout_risk):
-    """
-    Save the prediction results to a CSV file in the predictions folder with a timestamp
     """
     try:
-        # Prepare the directory
-        os.makedirs("predictions", exist_ok=True)
-        
-        # File path
-        file_path = os.path.join("predictions", "prediction_results.csv")
-        
-        # Check if file exists to determine if we need to write the header
-        file_exists = os.path.isfile(file_path)
-        
-        # Write the data
-        with open(file_path, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            
-            # Write header if file is new
-            if not file_exists:
-                writer.writerow([
-                    "Timestamp", "Name", "Age", "Gender", "Sleep Hours", "Work Hours per Week", 
-                    "Screen Time per Day (Hours)", "Social Interaction Score", 
-                    "Exercise Level", "Diet Type", "Mental Health Condition", 
-                    "Happiness Score", "Stress Level", "Burnout Risk"
-                ])
-            
-            # Write the data row
-            writer.writerow([
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                inputs.get("Name", ""),
-                inputs["Age"], 
-                inputs["Gender"], 
-                inputs["Sleep Hours"], 
-                inputs["Work Hours per Week"],
-                inputs["Screen Time per Day (Hours)"], 
-                inputs["Social Interaction Score"],
-                inputs["Exercise Level"], 
-                inputs["Diet Type"], 
-                inputs["Mental Health Condition"],
-                happiness_pred, 
-                stress_pred, 
-                burnout_risk
-            ])
-        
-        return True, file_path
+        get_history_writer().submit(build_history_record(inputs, happiness_pred, stress_pred, burnout_risk))
+        return True, HISTORY_CSV_PATH
     except Exception as e:
         st.warning(f"Could not save prediction history: {e}")
         return False, str(e)
 
-# Generate PDF report with wellness predictions and recommendations
-def generate_pdf_report(inputs, happiness_pred, stress_pred, burnout_risk, happiness_forecast, stress_forecast, burnout_forecast):
-    """
-    Create a professional PDF report with the user's wellness predictions, forecasts, and recommendations
-    
-    Returns the PDF as bytes that can be used for download
-    """
-    # Create a temporary buffer for the PDF
-    buffer = io.BytesIO()
-    
-    # Create the PDF document
-    doc = SimpleDocTemplate(buffer, pagesize=A4,
-                           leftMargin=72, rightMargin=72, 
-                           topMargin=72, bottomMargin=72)
-    
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = styles["Title"]
-    heading_style = styles["Heading2"]
-    normal_style = styles["Normal"]
-    
-    # Create a custom style for recommendations
-    recommendation_style = ParagraphStyle('RecommendationStyle', 
-                                        parent=normal_style,
-                                        spaceBefore=12, 
-                                        leftIndent=20)
-    
-    # Create custom header style
-    header_style = ParagraphStyle('HeaderStyle',
-                                parent=styles['Heading1'],
-                                fontSize=16,
-                                textColor=colors.darkblue)
-    
-    # Create custom subheader style
-    subheader_style = ParagraphStyle('SubHeaderStyle',
-                                   parent=styles['Heading2'],
-                                   fontSize=14,
-                                   textColor=colors.darkblue)
-    
-    # List to hold PDF content
-    content = []
-    
-    # Add title and date
-    content.append(Paragraph(f"LifeSync Wellness Report", title_style))
-    content.append(Spacer(1, 0.25 * inch))
-    
-    # Add name and date
-    content.append(Paragraph(f"Prepared for: {inputs.get('Name', 'Anonymous')}", header_style))
-    content.append(Paragraph(f"Date: {datetime.now().strftime('%B %d, %Y')}", normal_style))
-    content.append(Spacer(1, 0.25 * inch))
-    
-    # Add executive summary
-    content.append(Paragraph("Executive Summary:", subheader_style))
-    
-    # Determine overall wellness status
-    overall_wellness = (happiness_pred + (10-stress_pred) + (100-burnout_risk)/10) / 3
-    wellness_status = "excellent" if overall_wellness > 7.5 else "good" if overall_wellness > 6 else "moderate" if overall_wellness > 4.5 else "concerning"
-    
-    # Primary areas of focus
-    focus_areas = []
-    if happiness_pred < 6:
-        focus_areas.append("happiness improvement")
-    if stress_pred > 5:
-        focus_areas.append("stress management")
-    if burnout_risk > 40:
-        focus_areas.append("burnout prevention")
-    
-    focus_text = ", ".join(focus_areas) if focus_areas else "maintenance of your current wellness"
-    
-    # Executive summary text
-    summary_text = f"""Based on the information provided, your overall wellness score is {overall_wellness:.1f}/10, 
-    which indicates a {wellness_status} wellness level. Your happiness score is {happiness_pred}/10, 
-    stress level is {stress_pred:.1f}/10, and burnout risk is {burnout_risk}%. 
-    """
-    
-    if focus_areas:
-        summary_text += f"This report focuses primarily on {focus_text}."
-    else:
-        summary_text += "You're maintaining good wellness habits - this report offers strategies to sustain your progress."
-    
-    content.append(Paragraph(summary_text, normal_style))
-    content.append(Spacer(1, 0.25 * inch))
-    
-    # Add introduction
-    content.append(Paragraph("Personal Information:", subheader_style))
-    
-    # Add personal information
-    personal_info = [
-        ["Age", str(inputs["Age"])],
-        ["Gender", inputs["Gender"]],
-        ["Country", inputs["Country"]],
-        ["Sleep Hours", f"{inputs['Sleep Hours']} hours/night"],
-        ["Work Hours", f"{inputs['Work Hours per Week']} hours/week"],
-        ["Screen Time", f"{inputs['Screen Time per Day (Hours)']} hours/day"],
-        ["Social Interaction", f"{inputs['Social Interaction Score']}/10"],
-        ["Exercise Level", inputs["Exercise Level"]],
-        ["Diet Type", inputs["Diet Type"]],
-        ["Mental Health Condition", inputs["Mental Health Condition"]]
-    ]
-    
-    # Create a table for personal info
-    t = Table(personal_info, colWidths=[2*inch, 3.5*inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    content.append(t)
-    
-    content.append(Spacer(1, 0.25 * inch))
-      # Add wellness scores
-    content.append(Paragraph("Wellness Assessment Results:", subheader_style))
-    
-    # Create progress gauges for each metric
-    happiness_gauge = create_progress_gauge(happiness_pred, 10, 150, 15)
-    stress_gauge = create_progress_gauge(stress_pred, 10, 150, 15)
-    burnout_gauge = create_progress_gauge(burnout_risk, 100, 150, 15)
-    
-    # Create a table for wellness scores with visual gauges
-    wellness_scores = [
-        ["Metric", "Score", "Visual", "Interpretation"],
-        ["Happiness Score", f"{happiness_pred}/10", happiness_gauge, get_interpretation(happiness_pred, "happiness")],
-        ["Stress Level", f"{stress_pred:.2f}/10", stress_gauge, get_interpretation(stress_pred, "stress")],
-        ["Burnout Risk", f"{burnout_risk}%", burnout_gauge, get_interpretation(burnout_risk, "burnout")]
-    ]
-      # Create a table for wellness scores with wider columns to prevent text overflow
-    t = Table(wellness_scores, colWidths=[1.2*inch, 0.8*inch, 1.5*inch, 2.5*inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    content.append(t)
-    
-    content.append(Spacer(1, 0.25 * inch))
-    
-    # Add forecast data
-    content.append(Paragraph("Wellness Forecast (If current patterns continue):", subheader_style))
-    
-    # Create forecast data
-    forecast_data = [["Time Period", "Happiness", "Stress", "Burnout Risk"]]
-    
-    # Get time periods (keys from the forecast dictionaries)
-    periods = list(happiness_forecast.keys())
-    
-    # Add each time period's data
-    for period in periods:
-        forecast_data.append([
-            period,
-            f"{happiness_forecast[period]}/10",
-            f"{stress_forecast[period]:.2f}/10",
-            f"{burnout_forecast[period]}%"
-        ])
-      # Create a table for forecast data
-    t = Table(forecast_data, colWidths=[1.5*inch, 1.2*inch, 1.2*inch, 1.6*inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    content.append(t)
-    
-    # Add visualization of forecasts
-    try:
-        # Create a figure for the graphs
-        plt.figure(figsize=(8, 4))
-        
-        # Plot data from forecasts
-        x = range(len(periods))
-        plt.plot(x, [happiness_forecast[p] for p in periods], 'g-o', label='Happiness')
-        plt.plot(x, [stress_forecast[p] for p in periods], 'r-s', label='Stress')
-        plt.plot(x, [burnout_forecast[p]/10 for p in periods], 'y-^', label='Burnout Risk (÷10)')
-        
-        # Add labels and formatting
-        plt.xlabel('Time Period')
-        plt.ylabel('Score')
-        plt.title('Wellness Trends Forecast')
-        plt.xticks(x, periods, rotation=45)
-        plt.grid(True, alpha=0.3)
-        plt.legend()
-        plt.tight_layout()
-        
-        # Save the figure to a bytes buffer
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=150)
-        img_buffer.seek(0)
-        
-        # Create an Image object with the plot
-        content.append(Spacer(1, 0.25 * inch))
-        content.append(Paragraph("Wellness Forecast Visualization:", subheader_style))
-        img = Image(img_buffer, width=6*inch, height=3*inch)
-        content.append(img)
-        
-        plt.close()
-    except Exception as e:
-        # If plotting fails, just add a note
-        content.append(Paragraph(f"Note: Visualization could not be generated.", normal_style))
-    
-    content.append(PageBreak())
-    
-    # Add recommendations section
-    content.append(Paragraph("Personalized Recommendations:", subheader_style))
-    content.append(Spacer(1, 0.1 * inch))
-    
-    # Generate recommendations
-    recommendations = get_recommendation_insights(inputs, happiness_pred, stress_pred, burnout_risk)
-    
-    # Sort recommendations by priority
-    priority_order = {'high': 0, 'medium': 1, 'low': 2}
-    recommendations_sorted = sorted(recommendations, key=lambda x: priority_order.get(x['priority'], 3))
-    
-    # Add each recommendation
-    for i, rec in enumerate(recommendations_sorted):
-        # Add recommendation title
-        content.append(Paragraph(f"{i+1}. {rec['title']} ({rec['priority'].upper()} Priority)", subheader_style))
-        
-        # Add message
-        content.append(Paragraph(f"<i>{rec['message']}</i>", normal_style))
-        content.append(Spacer(1, 0.1 * inch))
-        
-        # Add actions
-        content.append(Paragraph("Suggested Actions:", normal_style))
-        for action in rec['actions']:
-            content.append(Paragraph(f"• {action}", recommendation_style))
-        
-        content.append(Paragraph(f"<i>Impact: {rec['impact']}</i>", normal_style))
-        content.append(Spacer(1, 0.2 * inch))
-      # Add lifestyle impact analysis
-    content.append(PageBreak())
-    content.append(Paragraph("Lifestyle Impact Analysis:", subheader_style))
-    content.append(Spacer(1, 0.1 * inch))
-    
-    # Create a lifestyle impact analysis
-    impact_text = """Below is an analysis of how specific lifestyle factors may be affecting your wellness:"""
-    content.append(Paragraph(impact_text, normal_style))
-    content.append(Spacer(1, 0.15 * inch))
-    
-    # Prepare impact factors
-    impact_factors = []
-    
-    # Sleep analysis
-    sleep_status = "optimal" if 7 <= inputs["Sleep Hours"] <= 9 else "excessive" if inputs["Sleep Hours"] > 9 else "insufficient"
-    sleep_impact = "positive" if 7 <= inputs["Sleep Hours"] <= 9 else "neutral" if inputs["Sleep Hours"] > 9 else "negative"
-    sleep_text = f"Your sleep duration ({inputs['Sleep Hours']} hours/night) is {sleep_status}, which has a {sleep_impact} impact on your wellness."
-    impact_factors.append(("Sleep Pattern", sleep_text))
-    
-    # Work hours analysis
-    work_status = "balanced" if inputs["Work Hours per Week"] <= 45 else "heavy" if inputs["Work Hours per Week"] <= 55 else "excessive"
-    work_impact = "positive" if inputs["Work Hours per Week"] <= 45 else "moderate" if inputs["Work Hours per Week"] <= 55 else "negative"
-    work_text = f"Your work schedule ({inputs['Work Hours per Week']} hours/week) is {work_status}, with a {work_impact} impact on work-life balance."
-    impact_factors.append(("Work Schedule", work_text))
-    
-    # Screen time analysis
-    screen_status = "healthy" if inputs["Screen Time per Day (Hours)"] < 4 else "moderate" if inputs["Screen Time per Day (Hours)"] < 7 else "high"
-    screen_impact = "positive" if inputs["Screen Time per Day (Hours)"] < 4 else "neutral" if inputs["Screen Time per Day (Hours)"] < 7 else "negative"
-    screen_text = f"Your screen time ({inputs['Screen Time per Day (Hours)']} hours/day) is {screen_status}, with a {screen_impact} impact on eye health and sleep quality."
-    impact_factors.append(("Screen Time", screen_text))
-    
-    # Exercise impact
-    exercise_impact = "significant positive" if inputs["Exercise Level"] == "High" else "moderate positive" if inputs["Exercise Level"] == "Moderate" else "minimal"
-    exercise_text = f"Your {inputs['Exercise Level'].lower()} exercise level has a {exercise_impact} impact on both physical and mental health."
-    impact_factors.append(("Physical Activity", exercise_text))
-    
-    # Social interaction impact
-    social_status = "strong" if inputs["Social Interaction Score"] >= 8 else "moderate" if inputs["Social Interaction Score"] >= 5 else "limited"
-    social_impact = "very positive" if inputs["Social Interaction Score"] >= 8 else "positive" if inputs["Social Interaction Score"] >= 5 else "potentially negative"
-    social_text = f"Your {social_status} social connections (score: {inputs['Social Interaction Score']}/10) have a {social_impact} impact on happiness and stress resilience."
-    impact_factors.append(("Social Connection", social_text))
-    
-    # Create a table for the impact analysis
-    impact_data = []
-    for factor, text in impact_factors:
-        impact_data.append([factor, text])
-        
-    t = Table(impact_data, colWidths=[1.5*inch, 4.5*inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('WORDWRAP', (1, 0), (1, -1), True),
-    ]))
-    content.append(t)
-    
-    content.append(Spacer(1, 0.25 * inch))
-    content.append(Paragraph("Key Insights:", normal_style))
-    
-    # Generate overall key insights
-    insights = []
-    
-    # Add personalized insights based on the data
-    if inputs["Sleep Hours"] < 7:
-        insights.append("Improving your sleep duration could significantly boost your happiness scores and reduce stress.")
-    
-    if inputs["Work Hours per Week"] > 50 and inputs["Screen Time per Day (Hours)"] > 6:
-        insights.append("The combination of high work hours and screen time is a significant contributor to your burnout risk.")
-    
-    if inputs["Social Interaction Score"] < 5 and happiness_pred < 6:
-        insights.append("Increasing your social connections could help improve your happiness levels.")
-    
-    if inputs["Exercise Level"] == "Low":
-        insights.append("Adding regular exercise to your routine would likely improve all aspects of your wellness metrics.")
-    
-    # Add default insight if none were generated
-    if not insights:
-        insights.append("Your lifestyle factors are generally well-balanced. Focus on maintaining these healthy habits.")
-    
-    # Add each insight as a bullet point
-    for insight in insights:
-        content.append(Paragraph(f"• {insight}", normal_style))
-    
-    # Add disclaimer
-    content.append(Spacer(1, 0.5 * inch))
-    content.append(Paragraph("Disclaimer:", subheader_style))
-    disclaimer_text = """This report provides insights for personal reflection based on the information you provided. 
-    It is not a substitute for professional medical advice. The predictions are based on statistical models 
-    and population data, which may not reflect individual variations. For serious mental health concerns, 
-    please consult a healthcare professional."""
-    
-    content.append(Paragraph(disclaimer_text, normal_style))
-      # Create footer with page numbers
-    def add_page_number(canvas, doc):
-        page_num = canvas.getPageNumber()
-        text = f"LifeSync Wellness Report - Page {page_num}"
-        canvas.setFont("Helvetica", 8)
-        canvas.setFillColor(colors.grey)
-        canvas.drawRightString(7.5*inch, 0.5*inch, text)
-        canvas.drawString(0.5*inch, 0.5*inch, f"Generated on {datetime.now().strftime('%Y-%m-%d at %H:%M')}")
-    
-    # Build PDF with page numbers
-    doc.build(content, onFirstPage=add_page_number, onLaterPages=add_page_number)
-    
-    # Get PDF content
-    pdf_data = buffer.getvalue()
-    buffer.close()
-    
-    return pdf_data
-
-# Helper function for PDF report - get interpretation of scores
-def get_interpretation(score, metric_type):
-    if metric_type == "happiness":
-        if score >= 8:
-            return "Excellent - Very high happiness levels"
-        elif score >= 6:
-            return "Good - Above average happiness"
-        elif score >= 4:
-            return "Moderate - Average happiness levels"
-        elif score >= 2:
-            return "Low - May need attention"
-        else:
-            return "Very Low - Requires immediate attention"
-    elif metric_type == "stress":
-        if score <= 3:
-            return "Low - Well-managed stress levels"
-        elif score <= 6:
-            return "Moderate - Average stress levels"
-        else:
-            return "High - Elevated stress requires attention"
-    elif metric_type == "burnout":
-        if score <= 30:
-            return "Low Risk - Good work-life balance"
-        elif score <= 60:
-            return "Moderate Risk - Monitor and make adjustments"
-        else:
-            return "High Risk - Immediate attention recommended"
-
-# Helper function for PDF report - create visual progress gauge
-def create_progress_gauge(value, max_value, width, height):
-    """
-    Create a visual progress gauge for PDF report metrics
-    
-    Parameters:
-    -----------
-    value : float
-        The current value to display (e.g., happiness score)
-    max_value : float
-        The maximum possible value (e.g., 10 for happiness, 100 for burnout)
-    width : int
-        Width of the gauge in pixels
-    height : int
-        Height of the gauge in pixels
-    
-    Returns:
-    --------
-    Image object with the gauge visualization
-    """
-    # Create a BytesIO buffer for the image
-    img_buffer = io.BytesIO()
-    
-    # Create figure and axis
-    fig, ax = plt.subplots(figsize=(width/72, height/72), dpi=72)
-    
-    # Determine color based on value and metric type
-    if max_value == 10:  # Happiness or Stress
-        if value >= 7:
-            color = '#28a745'  # Green for good happiness
-        elif value >= 4:
-            color = '#ffc107'  # Yellow for moderate
-        else:
-            color = '#dc3545'  # Red for low happiness
-        
-        # Adjust color if this is likely stress (inverse scale)
-        if value > 5:
-            color = '#dc3545'  # Red for high stress
-        
-    else:  # Burnout (0-100 scale)
-        if value <= 30:
-            color = '#28a745'  # Green for low burnout risk
-        elif value <= 60:
-            color = '#ffc107'  # Yellow for moderate risk
-        else:
-            color = '#dc3545'  # Red for high risk
-    
-    # Create progress bar
-    progress_pct = min(value / max_value, 1.0)
-    bar = ax.barh(0, progress_pct, color=color, height=0.5)
-    
-    # Add background for unfilled portion
-    ax.barh(0, 1.0, color='#e9ecef', height=0.5, alpha=0.5, zorder=0)
-    
-    # Add value text
-    if max_value == 100:
-        value_text = f"{value:.0f}%"
-    else:
-        value_text = f"{value:.1f}/{max_value}"
-    
-    ax.text(progress_pct / 2, 0, value_text, 
-            ha='center', va='center', color='white', 
-            fontweight='bold', fontsize=8)
-    
-    # Remove axes and spines
-    ax.set_xlim(0, 1)
-    ax.set_ylim(-0.5, 0.5)
-    ax.axis('off')
-    plt.subplots_adjust(left=0, right=1, top=1, bottom=0)
-    
-    # Save figure to buffer
-    plt.savefig(img_buffer, format='png', dpi=72, bbox_inches='tight', pad_inches=0)
-    img_buffer.seek(0)
-    plt.close(fig)
-    
-    # Return as an Image object for PDF
-    return Image(img_buffer, width=width, height=height)
+def init_session_state():
+    """Set up this browser session's state; runs on every script run, unlike module-level code."""
+    st.session_state.setdefault('predictions_made', False)
+    st.session_state.setdefault('inputs', None)
+    st.session_state.setdefault('happiness_pred', None)
+    st.session_state.setdefault('stress_pred', None)
+    st.session_state.setdefault('burnout_risk', None)
+    # Forecasts and the PDF live in the session artifact store; state keeps only handles
+    if 'artifact_session' not in st.session_state:
+        st.session_state.artifact_session = new_session_id()
+    st.session_state.setdefault('forecast_handle', None)
+    st.session_state.setdefault('pdf_handle', None)
+    st.session_state.setdefault('pdf_job_id', None)
 
 def main():
+    init_session_state()
+
     # Header section
     st.markdown("""
     <div class="simulator-header">
@@ -1172,7 +432,6 @@ def main():
         st.session_state.predictions_made = True
           # Process inputs for model
         processed_inputs = preprocess_inputs(inputs)
-        st.session_state.processed_inputs = processed_inputs
           # Make predictions
         happiness_pred = happiness_model.predict(processed_inputs)[0]
         happiness_pred = round(max(0, min(10, happiness_pred)), 1)
@@ -1181,13 +440,7 @@ def main():
         stress_pred = round(max(0, min(10, ((stress_raw - 1) / 2) * 10)), 2)
         
         # Calculate burnout risk
-        burnout_risk = (
-            0.4 * inputs['Work Hours per Week'] +
-            0.25 * inputs['Screen Time per Day (Hours)'] +
-            0.2 * (10 - inputs['Sleep Hours']) +
-            0.15 * (10 - inputs['Social Interaction Score'])
-        )
-        burnout_risk = round(max(0, min(100, burnout_risk)), 1)
+        burnout_risk = float(compute_burnout_risk(inputs))
         
         # Store predictions in session state for PDF generation
         st.session_state.happiness_pred = happiness_pred
@@ -1275,24 +528,34 @@ def main():
                 </div>
             </div>            """, unsafe_allow_html=True)        # Enhanced forecast visualization
         try:
-            happiness_forecast, stress_forecast, burnout_forecast = generate_forecast(happiness_pred, stress_pred, burnout_risk)
+            forecast_bands = generate_forecast_bands(happiness_pred, stress_pred, burnout_risk)
+            happiness_forecast, stress_forecast, burnout_forecast = (forecast_percentile(b) for b in forecast_bands)
             
-            # Store forecasts in session state for PDF generation
-            st.session_state.happiness_forecast = happiness_forecast
-            st.session_state.stress_forecast = stress_forecast
-            st.session_state.burnout_forecast = burnout_forecast
+            # Keep the last forecast for this session as a fallback, written only when the
+            # predictions it is built from change rather than on every rerun
+            forecast_key = (happiness_pred, stress_pred, burnout_risk)
+            if st.session_state.forecast_handle is None or st.session_state.get('forecast_key') != forecast_key:
+                st.session_state.forecast_handle = get_session_artifacts().put(
+                    st.session_state.artifact_session, 'forecast',
+                    (forecast_bands, happiness_forecast, stress_forecast, burnout_forecast))
+                st.session_state.forecast_key = forecast_key
         except Exception as e:
             st.error(f"Error generating forecast: {str(e)}")
-            # Use session state values if they exist, otherwise initialize with defaults
-            happiness_forecast = st.session_state.happiness_forecast if st.session_state.happiness_forecast else {"Current": 5.0, "3 Days": 4.8, "1 Week": 4.5, "1 Month": 4.0, "3 Months": 3.5}
-            stress_forecast = st.session_state.stress_forecast if st.session_state.stress_forecast else {"Current": 5.0, "3 Days": 5.5, "1 Week": 6.0, "1 Month": 7.0, "3 Months": 7.5}
-            burnout_forecast = st.session_state.burnout_forecast if st.session_state.burnout_forecast else {"Current": 50.0, "3 Days": 52.0, "1 Week": 55.0, "1 Month": 60.0, "3 Months": 65.0}
+            # Use this session's last forecast if it is still stored, otherwise initialize with defaults
+            saved_forecast = get_session_artifacts().get(st.session_state.forecast_handle)
+            if saved_forecast:
+                forecast_bands, happiness_forecast, stress_forecast, burnout_forecast = saved_forecast
+            else:
+                forecast_bands = None
+                happiness_forecast = {"Current": 5.0, "3 Days": 4.8, "1 Week": 4.5, "1 Month": 4.0, "3 Months": 3.5}
+                stress_forecast = {"Current": 5.0, "3 Days": 5.5, "1 Week": 6.0, "1 Month": 7.0, "3 Months": 7.5}
+                burnout_forecast = {"Current": 50.0, "3 Days": 52.0, "1 Week": 55.0, "1 Month": 60.0, "3 Months": 65.0}
         
         st.markdown("---")
         st.markdown("""
         <div class="text-center mb-4">
             <h2><i class="fas fa-chart-line text-primary"></i> Wellness Trend Forecast</h2>
-            <p class="text-muted"><em>Projected changes if current lifestyle patterns continue</em></p>
+            <p class="text-muted"><em>Projected changes if current lifestyle patterns continue (median with 50% and 80% ranges)</em></p>
         </div>
         """, unsafe_allow_html=True)
         
@@ -1315,7 +578,10 @@ def main():
         # Happiness trend
         happiness_values = list(happiness_forecast.values())
         ax1.plot(x_pos, happiness_values, marker='o', linewidth=3, color='#28a745', markersize=8)
-        ax1.fill_between(x_pos, happiness_values, alpha=0.3, color='#28a745')
+        if forecast_bands:
+            plot_forecast_bands(ax1, x_pos, forecast_bands[0], '#28a745')
+        else:
+            ax1.fill_between(x_pos, happiness_values, alpha=0.3, color='#28a745')
         ax1.set_title('Happiness Score Trend', fontweight='bold')
         ax1.set_ylabel('Score (0-10)')
         ax1.set_xticks(x_pos)
@@ -1326,7 +592,10 @@ def main():
         # Stress trend
         stress_values = list(stress_forecast.values())
         ax2.plot(x_pos, stress_values, marker='s', linewidth=3, color='#dc3545', markersize=8)
-        ax2.fill_between(x_pos, stress_values, alpha=0.3, color='#dc3545')
+        if forecast_bands:
+            plot_forecast_bands(ax2, x_pos, forecast_bands[1], '#dc3545')
+        else:
+            ax2.fill_between(x_pos, stress_values, alpha=0.3, color='#dc3545')
         ax2.set_title('Stress Level Trend', fontweight='bold')
         ax2.set_ylabel('Level (0-10)')
         ax2.set_xticks(x_pos)
@@ -1338,6 +607,13 @@ def main():
         burnout_values = list(burnout_forecast.values())
         colors = ['#28a745' if v < 40 else '#ffc107' if v < 60 else '#dc3545' for v in burnout_values]
         ax3.bar(x_pos, burnout_values, color=colors, alpha=0.7)
+        if forecast_bands:
+            burnout_low = [forecast_bands[2][p]['p10'] for p in periods]
+            burnout_high = [forecast_bands[2][p]['p90'] for p in periods]
+            ax3.errorbar(x_pos, burnout_values,
+                         yerr=[[v - lo for v, lo in zip(burnout_values, burnout_low)],
+                               [hi - v for v, hi in zip(burnout_values, burnout_high)]],
+                         fmt='none', ecolor='#343a40', capsize=6, alpha=0.8)
         ax3.set_title('Burnout Risk Progression', fontweight='bold')
         ax3.set_ylabel('Risk Percentage')
         ax3.set_xticks(x_pos)
@@ -1375,6 +651,10 @@ def main():
             'Burnout Risk': [f"{v}%" for v in burnout_values],
             'Wellness Index': [f"{v:.1f}/10" for v in wellness_values]
         })
+        if forecast_bands:
+            forecast_df.insert(2, 'Happiness Range', [f"{forecast_bands[0][p]['p10']}–{forecast_bands[0][p]['p90']}" for p in periods])
+            forecast_df.insert(4, 'Stress Range', [f"{forecast_bands[1][p]['p10']}–{forecast_bands[1][p]['p90']}" for p in periods])
+            forecast_df.insert(6, 'Burnout Range', [f"{forecast_bands[2][p]['p10']}–{forecast_bands[2][p]['p90']}%" for p in periods])
         
         # Style the dataframe
         st.markdown("""
@@ -1390,7 +670,10 @@ def main():
                 "Time Period": st.column_config.TextColumn("📅 Time Period", width="medium"),
                 "Happiness": st.column_config.TextColumn("😊 Happiness", width="small"),
                 "Stress": st.column_config.TextColumn("🧠 Stress", width="small"),
+                "Happiness Range": st.column_config.TextColumn("80% Range", width="small"),
+                "Stress Range": st.column_config.TextColumn("80% Range", width="small"),
                 "Burnout Risk": st.column_config.TextColumn("🔥 Burnout Risk", width="small"),
+                "Burnout Range": st.column_config.TextColumn("80% Range", width="small"),
                 "Wellness Index": st.column_config.TextColumn("⭐ Wellness Index", width="small")
             }
         )
@@ -1399,6 +682,27 @@ def main():
             </div>
         </div>
         """, unsafe_allow_html=True)
+        # Sensitivity heatmap over two chosen lifestyle factors
+        st.markdown("---")
+        st.markdown("### 🗺️ Sensitivity Heatmap")
+        st.markdown("<p class='text-muted'><em>How your predicted happiness and stress change across two factors, all else held equal</em></p>", unsafe_allow_html=True)
+        
+        factor_options = list(NUMERIC_INPUT_RANGES.keys())
+        heat_col1, heat_col2 = st.columns(2)
+        with heat_col1:
+            x_factor = st.selectbox("Horizontal axis", factor_options,
+                                    index=factor_options.index('Sleep Hours'), key="heatmap_x_factor")
+        with heat_col2:
+            y_options = [f for f in factor_options if f != x_factor]
+            default_y = 'Work Hours per Week' if 'Work Hours per Week' in y_options else y_options[0]
+            y_factor = st.selectbox("Vertical axis", y_options,
+                                    index=y_options.index(default_y), key="heatmap_y_factor")
+        
+        heatmap_inputs = {k: v for k, v in inputs.items() if k != 'Name'}
+        with st.spinner("Scoring sensitivity grid..."):
+            heatmap_png = render_sensitivity_heatmap(heatmap_inputs, x_factor, y_factor)
+        st.image(heatmap_png, use_container_width=True)
+        
           # Personalized recommendations
         st.markdown("---")
         st.markdown("## 💡 Personalized Recommendations")
@@ -1406,8 +710,7 @@ def main():
         recommendations = get_recommendation_insights(inputs, happiness_pred, stress_pred, burnout_risk)
         if recommendations:
             # Sort recommendations by priority
-            priority_order = {'high': 0, 'medium': 1, 'low': 2}
-            recommendations_sorted = sorted(recommendations, key=lambda x: priority_order.get(x['priority'], 3))
+            recommendations_sorted = sorted(recommendations, key=lambda x: PRIORITY_ORDER.get(x['priority'], 3))
 
             # Emoji mapping for categories
             emoji_map = {
@@ -1453,6 +756,47 @@ def main():
         else:
             st.success("Your lifestyle appears well-balanced! Keep up the great work.")
         
+        # Counterfactual goal search
+        st.markdown("---")
+        st.markdown("## 🎯 Reach Your Wellness Goal")
+        st.markdown("<p class='text-muted'><em>Find the smallest lifestyle changes predicted to reach a target score</em></p>", unsafe_allow_html=True)
+        
+        goal_col1, goal_col2 = st.columns(2)
+        with goal_col1:
+            goal_metric = st.selectbox("Goal", list(TARGET_METRICS.keys()), key="goal_metric",
+                                       help="Happiness goals are a minimum to reach; stress and burnout goals are a maximum to stay under")
+        with goal_col2:
+            if goal_metric == 'Happiness Score':
+                goal_target = st.slider("Reach at least", 0.0, 10.0, float(min(10.0, round(happiness_pred + 1, 1))), 0.1,
+                                        key="goal_target_happiness")
+            elif goal_metric == 'Stress Level':
+                goal_target = st.slider("Stay at or below", 0.0, 10.0, float(max(0.0, round(stress_pred - 1, 1))), 0.1,
+                                        key="goal_target_stress")
+            else:
+                goal_target = st.slider("Stay at or below (%)", 0.0, 100.0, float(max(0.0, round(burnout_risk - 5, 1))), 0.5,
+                                        key="goal_target_burnout")
+        
+        if st.button("🔍 Find Smallest Changes", key="goal_search", use_container_width=True):
+            goal_inputs = {k: v for k, v in inputs.items() if k != 'Name'}
+            with st.spinner("Searching lifestyle changes..."):
+                goal_results = search_counterfactuals(goal_inputs, goal_metric, goal_target)
+            
+            if not goal_results:
+                st.warning("No combination of realistic lifestyle changes reaches this goal. Try a less ambitious target.")
+            elif not goal_results[0]['changes']:
+                st.success("You already meet this goal with your current lifestyle!")
+            else:
+                goal_df = pd.DataFrame({
+                    'Option': [f"#{i + 1}" for i in range(len(goal_results))],
+                    'Changes': ["; ".join(f"{k}: {old} → {new}" for k, (old, new) in r['changes'].items())
+                                for r in goal_results],
+                    'Effort': [r['cost'] for r in goal_results],
+                    'Happiness': [f"{r['Happiness Score']}/10" for r in goal_results],
+                    'Stress': [f"{r['Stress Level']:.2f}/10" for r in goal_results],
+                    'Burnout Risk': [f"{r['Burnout Risk']}%" for r in goal_results],
+                })
+                st.dataframe(goal_df, use_container_width=True, hide_index=True)
+        
         # Enhanced download section
         st.markdown("---")
           # Create downloadable CSV in the same format as our prediction history CSV
@@ -1506,39 +850,39 @@ def main():
                                           use_container_width=True,
                                           help="Click to prepare your personalized wellness report")
             
-            # Only generate PDF when the button is clicked
+            # Only generate PDF when the button is clicked; rendering runs on a background worker
             if generate_pdf_button:
                 # Make sure all required variables exist and are not None
                 if (happiness_forecast and stress_forecast and burnout_forecast and 
                     happiness_pred is not None and stress_pred is not None and burnout_risk is not None):
-                    # Show a spinner while generating the PDF
-                    with st.spinner("Creating your personalized wellness report..."):
-                        try:
-                            # Generate PDF content on demand
-                            pdf_content = generate_pdf_report(
-                                inputs,
-                                happiness_pred,
-                                stress_pred,
-                                burnout_risk,
-                                happiness_forecast,
-                                stress_forecast,
-                                burnout_forecast
-                            )
-                            # Store the generated PDF in session state
-                            st.session_state.pdf_content = pdf_content
-                            
-                            # Show success message
-                            st.success("Your PDF report is ready! Click below to download.")
-                        except Exception as e:
-                            st.error(f"Error generating PDF: {str(e)}")
+                    get_session_artifacts().delete(st.session_state.pdf_handle)
+                    st.session_state.pdf_handle = None
+                    st.session_state.pdf_job_id = get_report_jobs().submit(
+                        inputs,
+                        happiness_pred,
+                        stress_pred,
+                        burnout_risk,
+                        happiness_forecast,
+                        stress_forecast,
+                        burnout_forecast
+                    )
                 else:
                     st.error("Missing data needed for PDF generation. Please try generating predictions again.")
             
-            # If PDF has been generated successfully, show the download button
-            if 'pdf_content' in st.session_state and st.session_state.pdf_content is not None:
+            if st.session_state.pdf_job_id is not None:
+                render_pdf_job_status()
+            
+            # If PDF has been generated successfully, show the download button; the PDF is read
+            # from the artifact store on click, so it never sits in Streamlit's media memory
+            pdf_handle = st.session_state.pdf_handle
+            if pdf_handle is not None and not get_session_artifacts().touch(pdf_handle):
+                pdf_handle = st.session_state.pdf_handle = None
+                st.info("Your previous report has expired. Generate it again to download it.")
+            if pdf_handle is not None:
                 st.download_button(
                     label="📥 Download Your Wellness Report (PDF)",
-                    data=st.session_state.pdf_content,
+                    data=partial(artifact_download, pdf_handle),
+                    on_click="ignore",
                     file_name=f"LifeSync_Wellness_Report_{inputs.get('Name', '').replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
                     mime="application/pdf",
                     use_container_width=True,
@@ -1548,13 +892,53 @@ def main():
         st.markdown("""
             </div>
         </div>        """, unsafe_allow_html=True)        # Save prediction history (after download section)
-          # Save to both the outputs directory and the predictions folder
-        
-        # Save to the main outputs directory
+        # One record goes to both the outputs directory and the predictions folder
         success, path = save_prediction_to_csv(inputs, happiness_pred, stress_pred, burnout_risk)
-        
-        # Also save to the predictions folder for easy access
-        success2, path2 = save_predictions_to_csv(inputs, happiness_pred, stress_pred, burnout_risk)
+
+    # Bulk reports for a whole team from one uploaded CSV
+    st.markdown("---")
+    with st.expander("👥 Team Wellness Reports (Bulk PDF)", expanded=False):
+        st.markdown(f"Upload a CSV with one row per person and the columns: {', '.join(REQUIRED_COLUMNS)} "
+                    "(plus optional Name and Country). Every row is scored in one pass and its PDF report "
+                    "is added to a single ZIP archive.")
+        cohort_file = st.file_uploader("Team CSV", type=["csv"], key="cohort_csv")
+        if cohort_file is not None and st.button("📦 Generate Team Reports", use_container_width=True):
+            zip_fd, zip_path = tempfile.mkstemp(prefix="lifesync_team_", suffix=".zip")
+            os.close(zip_fd)
+            progress_bar = st.progress(0.0, text="Scoring team...")
+            try:
+                count = generate_cohort_reports(
+                    pd.read_csv(cohort_file), zip_path, volatility=load_forecast_volatility(),
+                    progress=lambda done, total: progress_bar.progress(done / total, text=f"Rendered {done} of {total} reports")
+                )
+                # The archive moves into the session artifact store, replacing any earlier one
+                st.session_state.cohort_zip_handle = get_session_artifacts().put_file(
+                    st.session_state.artifact_session, 'team_reports_zip', zip_path)
+                st.success(f"Generated {count} reports.")
+            except ValueError as e:
+                st.error(str(e))
+            finally:
+                if os.path.exists(zip_path):
+                    os.remove(zip_path)
+        
+        # The ZIP is read from the artifact store only when the button is clicked
+        zip_handle = st.session_state.get('cohort_zip_handle')
+        if zip_handle and not get_session_artifacts().touch(zip_handle):
+            zip_handle = st.session_state.cohort_zip_handle = None
+            st.info("Your previous team reports have expired. Generate them again to download them.")
+        if zip_handle:
+            st.download_button(
+                label="📥 Download Team Reports (ZIP)",
+                data=partial(artifact_download, zip_handle),
+                on_click="ignore",
+                file_name=f"LifeSync_Team_Reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                mime="application/zip",
+                use_container_width=True
+            )
+
+    # Track what this session holds in memory next to what it has spilled to disk
+    artifacts = get_session_artifacts()
+    artifacts.record_state_size(st.session_state.artifact_session, st.session_state)
 
     # Enhanced information section
     st.markdown("---")
@@ -1580,7 +964,7 @@ def main():
                             </li>
                             <li class="mb-2">
                                 <i class="fas fa-chart-line text-info"></i>
-                                <strong>Forecasts:</strong> Realistic projections assuming current lifestyle patterns continue
+                                <strong>Forecasts:</strong> Monte Carlo projections with uncertainty ranges, assuming current lifestyle patterns continue
                             </li>
                         </ul>
                     </div>
@@ -1618,6 +1002,10 @@ def main():
                     Small improvements in sleep, exercise, and work-life balance can lead to significant positive changes!
                 </div>
                 """, unsafe_allow_html=True)
+        usage = artifacts.session_usage(st.session_state.artifact_session)
+        st.caption(f"This session uses {usage['state_bytes'] / 1024:.1f} KB of server memory and "
+                   f"{usage['disk_bytes'] / 1024:.1f} KB of temporary disk storage "
+                   f"({usage['artifacts']} stored results, kept for {artifacts.ttl // 60} minutes after last use).")
 
 if __name__ == "__main__":
     main()
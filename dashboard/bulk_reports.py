@@ -0,0 +1,200 @@
+"""
+LifeSync Dashboard - Bulk Wellness Reports
+Builds one PDF wellness report per person in a cohort CSV. Everyone is scored in one
+vectorised pass, reports are rendered across a process pool, and each finished PDF is
+written straight into a ZIP archive so only the reports in flight are held in memory.
+
+Usage:
+    python -m dashboard.bulk_reports team.csv --output team_reports.zip
+    python -m dashboard.bulk_reports team.csv --workers 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from dashboard.wellness_engine import (
+    DEFAULT_COUNTRY,
+    DEFAULT_FORECAST_VOLATILITY,
+    categorical_labels,
+    compute_burnout_risk,
+    forecast_percentile,
+    load_models,
+    predict_wellness_batch,
+    simulate_forecast_bands,
+)
+
+# Columns every cohort row needs; Name and Country are optional
+REQUIRED_COLUMNS = [
+    "Age", "Gender", "Sleep Hours", "Work Hours per Week", "Screen Time per Day (Hours)",
+    "Social Interaction Score", "Exercise Level", "Diet Type", "Mental Health Condition",
+]
+
+# Unknown category labels listed per column in a validation error
+MAX_REPORTED_LABELS = 5
+
+# Workers are started fresh rather than forked: the dashboard server that calls this runs
+# the history writer, warm-up and report-job threads, and forking a threaded process can
+# leave a worker deadlocked on a lock held by a thread that does not exist in the child
+WORKER_START_METHOD = "spawn"
+
+# Reports submitted per worker ahead of the one being zipped
+IN_FLIGHT_PER_WORKER = 4
+
+
+def prepare_cohort(df, categories=None):
+    """
+    Validate a cohort table and fill the optional columns.
+
+    Raises ValueError naming any missing required columns, or the rows whose
+    categorical values are not labels the models encode (``categories``, column ->
+    labels; read from the loaded models when omitted). Returns a copy with ``Name``
+    (blank if absent), ``Country`` (DEFAULT_COUNTRY if absent) and ``Mental Health
+    Condition`` blanks read as "None"; other columns are dropped.
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Cohort file is missing columns: {', '.join(missing)}")
+
+    cohort = df.copy()
+    cohort["Name"] = cohort["Name"].fillna("").astype(str) if "Name" in cohort.columns else ""
+    cohort["Country"] = cohort["Country"].fillna(DEFAULT_COUNTRY) if "Country" in cohort.columns else DEFAULT_COUNTRY
+    cohort["Mental Health Condition"] = cohort["Mental Health Condition"].fillna("None")
+    cohort = cohort[["Name"] + REQUIRED_COLUMNS + ["Country"]].reset_index(drop=True)
+
+    if categories is None:
+        categories = categorical_labels(load_models()[0].feature_names_in_)
+    problems = []
+    for column, labels in categories.items():
+        unknown = cohort.index[~cohort[column].isin(labels)]
+        if len(unknown):
+            # Rows are numbered from 1, as in the report file names
+            listed = ", ".join(f"row {index + 1} {cohort.at[index, column]!r}" for index in unknown[:MAX_REPORTED_LABELS])
+            more = f" and {len(unknown) - MAX_REPORTED_LABELS} more" if len(unknown) > MAX_REPORTED_LABELS else ""
+            problems.append(f"{column} must be one of {labels}: {listed}{more}")
+    if problems:
+        raise ValueError("Cohort file has unknown values: " + "; ".join(problems))
+    return cohort
+
+
+def score_cohort(cohort):
+    """Score every row with both models and the burnout formula in one pass."""
+    happiness_model, stress_model = load_models()
+    scores = predict_wellness_batch(happiness_model, stress_model, cohort)
+    scores["Burnout Risk"] = compute_burnout_risk(cohort)
+    return scores
+
+
+def report_filename(index, name):
+    """Archive member name for one report, unique per row and safe on every filesystem."""
+    safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_") or "Anonymous"
+    return f"{index + 1:04d}_LifeSync_Wellness_Report_{safe_name}.pdf"
+
+
+def _render_report(task):
+    """Render one report inside a worker process; returns (filename, pdf bytes)."""
+    from dashboard.pdf_report import generate_pdf_report
+
+    index, inputs, happiness, stress, burnout, volatility = task
+    bands = simulate_forecast_bands(happiness, stress, burnout, volatility=volatility)
+    happiness_forecast, stress_forecast, burnout_forecast = (forecast_percentile(b) for b in bands)
+    pdf = generate_pdf_report(inputs, happiness, stress, burnout,
+                              happiness_forecast, stress_forecast, burnout_forecast)
+    return report_filename(index, inputs.get("Name", "")), pdf
+
+
+def _report_tasks(cohort, scores, volatility):
+    for index, (inputs, score) in enumerate(zip(cohort.to_dict("records"), scores.to_dict("records"))):
+        yield (index, inputs, float(score["Happiness Score"]), float(score["Stress Level"]),
+               float(score["Burnout Risk"]), volatility)
+
+
+def generate_cohort_reports(df, zip_path, workers=None, volatility=None, progress=None):
+    """
+    Write one PDF report per cohort row into ``zip_path``.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Cohort table with the simulator input columns (see REQUIRED_COLUMNS)
+    zip_path : str
+        Destination ZIP archive
+    workers : int, optional
+        Worker processes (defaults to CPU count)
+    volatility : dict, optional
+        Forecast volatility; estimated from the dataset when omitted
+    progress : callable, optional
+        Called as ``progress(done, total)`` after each report is archived
+
+    Returns:
+    --------
+    Number of reports written
+    """
+    cohort = prepare_cohort(df)
+    scores = score_cohort(cohort)
+    volatility = volatility or _default_volatility()
+    workers = workers or os.cpu_count() or 1
+    total = len(cohort)
+    tasks = _report_tasks(cohort, scores, volatility)
+
+    done = 0
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as archive, \
+            ProcessPoolExecutor(max_workers=workers,
+                                mp_context=multiprocessing.get_context(WORKER_START_METHOD)) as executor:
+        # Keep a bounded window of reports in flight and archive each as it finishes
+        pending = set()
+        for task in tasks:
+            pending.add(executor.submit(_render_report, task))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    archive.writestr(*future.result())
+                    done += 1
+                    if progress:
+                        progress(done, total)
+        for future in pending:
+            archive.writestr(*future.result())
+            done += 1
+            if progress:
+                progress(done, total)
+
+    return done
+
+
+def _default_volatility():
+    from dashboard.warmup import load_forecast_volatility
+
+    try:
+        return load_forecast_volatility(*load_models())
+    except Exception:
+        return dict(DEFAULT_FORECAST_VOLATILITY)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a wellness PDF report for every row of a cohort CSV.")
+    parser.add_argument('csv', help="Cohort CSV with the simulator input columns (Name optional)")
+    parser.add_argument('--output', default="lifesync_cohort_reports.zip", help="ZIP archive to write")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (defaults to CPU count)")
+    args = parser.parse_args(argv)
+
+    try:
+        df = pd.read_csv(args.csv)
+        start = time.perf_counter()
+        count = generate_cohort_reports(df, args.output, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {count:,} reports to {args.output} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.1f} reports/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""
+LifeSync Dashboard - Cohort Comparison
+Side-by-side comparison of several cohorts, each defined by its own filter state. The
+KPIs, distribution counts and correlation matrices of every cohort come from one grouped
+aggregation: each row contributes a vector of statistics (values, presence flags, bin
+indicators and pairwise products) and a single cohort-membership matrix product sums
+those vectors per cohort. The mirrored comparison charts are drawn from that result
+alone, without going back to the rows.
+"""
+
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend for Streamlit
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.ticker import FuncFormatter
+
+from dashboard.column_catalog import column_range, column_values, is_numeric
+from dashboard.dashboard_charts import DERIVED_COLUMNS, default_filters, figure_to_png, filter_mask
+from dashboard.dashboard_insights import STRESS_MAPPING
+
+# Most cohorts compared at once, and the color each one is drawn in
+COMPARISON_MAX_COHORTS = 4
+COHORT_COLORS = ['#667eea', '#e67e22', '#2ecc71', '#e91e63']
+
+# Rows aggregated per block, bounding the size of the row-statistics matrix
+COMPARISON_CHUNK_ROWS = 20_000
+
+# KPI rows of the comparison table: label -> column, or (column, scores) for a column
+# that may hold labels instead of numbers
+COMPARISON_MEASURES = {
+    "Avg Happiness Score": "Happiness Score",
+    "Avg Stress Score": ("Stress Level", STRESS_MAPPING),
+    "Avg Burnout Risk (%)": "Burnout Risk",
+    "Avg Sleep Hours": "Sleep Hours",
+    "Avg Work Hours/Week": "Work Hours per Week",
+    "Avg Screen Time/Day (Hours)": "Screen Time per Day (Hours)",
+    "Avg Social Interaction Score": "Social Interaction Score",
+}
+
+# Compared distributions: DISTRIBUTION_CHARTS key -> (column, histogram bins if numeric);
+# categorical columns are counted per level of the column catalog
+COMPARISON_DISTRIBUTIONS = {
+    "country": ("Country", None),
+    "age": ("Age", 20),
+    "gender": ("Gender", None),
+    "exercise": ("Exercise Level", None),
+    "diet": ("Diet Type", None),
+    "sleep": ("Sleep Hours", 15),
+    "stress": ("Stress Level", 10),
+    "mental_health": ("Mental Health Condition", None),
+    "work_hours": ("Work Hours per Week", 15),
+    "screen_time": ("Screen Time per Day (Hours)", 15),
+    "social": ("Social Interaction Score", 10),
+    "happiness": ("Happiness Score", 10),
+    "burnout": ("Burnout Risk", 20),
+}
+
+
+def split_cohorts(catalog, key, values, base=None):
+    """
+    One cohort per value of a category filter.
+
+    Parameters:
+    catalog (dict): Column catalog of the dataset
+    key (str): CATEGORY_FILTERS key to split on, e.g. "countries"
+    values (list): Values of that column, one cohort each
+    base (dict): Filter state the cohorts share; defaults to no filtering
+
+    Returns:
+    tuple: ``(name, filters)`` pairs
+    """
+    base = base or default_filters(catalog)
+    return tuple((str(value), {**base, key: (value,)}) for value in values)
+
+
+def correlation_columns(catalog):
+    """Columns the correlation matrices cover, as in dashboard_charts.correlation_matrix."""
+    return [column for column, entry in catalog["columns"].items()
+            if entry["kind"] == "numeric" and column not in DERIVED_COLUMNS]
+
+
+def _distribution_bins(catalog, column, bins):
+    """``(labels, edges)`` of a compared distribution: level names, or histogram bin edges."""
+    if is_numeric(catalog, column):
+        low, high = column_range(catalog, column)
+        return None, np.linspace(low, high, bins + 1)
+    return column_values(catalog, column), None
+
+
+def _column_floats(chunk, catalog, column, scores=None):
+    """A column as floats with NaN where missing, scoring labels with ``scores``."""
+    if is_numeric(catalog, column):
+        return chunk[column].to_numpy(dtype=float, na_value=np.nan)
+    # Score each distinct label once; code -1 (missing) picks the trailing NaN
+    codes, labels = pd.factorize(chunk[column])
+    label_scores = np.array([scores.get(label, np.nan) for label in labels] + [np.nan], dtype=float)
+    return label_scores[codes]
+
+
+def _row_statistics(chunk, catalog):
+    """
+    Per-row statistics whose per-cohort sums give every compared figure.
+
+    Returns:
+    dict: block name -> float matrix with one row per row of ``chunk``
+    """
+    rows = len(chunk)
+    blocks = {"rows": np.ones((rows, 1))}
+
+    for label, spec in COMPARISON_MEASURES.items():
+        column, scores = spec if isinstance(spec, tuple) else (spec, None)
+        values = _column_floats(chunk, catalog, column, scores)
+        present = ~np.isnan(values)
+        blocks[f"sum:{label}"] = np.where(present, values, 0.0)[:, None]
+        blocks[f"count:{label}"] = present.astype(float)[:, None]
+
+    for key, (column, bins) in COMPARISON_DISTRIBUTIONS.items():
+        labels, edges = _distribution_bins(catalog, column, bins)
+        if edges is None:
+            # Position of each distinct value among the catalog levels; missing values get -1
+            codes, uniques = pd.factorize(chunk[column])
+            positions = {label: position for position, label in enumerate(labels)}
+            codes = np.array([positions.get(str(value), -1) for value in uniques] + [-1])[codes]
+            width = len(labels)
+        else:
+            # np.histogram's bins: half-open, except the last one includes the maximum
+            values = chunk[column].to_numpy(dtype=float, na_value=np.nan)
+            codes = np.minimum(np.searchsorted(edges, values, side="right") - 1, bins - 1)
+            codes[~((values >= edges[0]) & (values <= edges[-1]))] = -1
+            width = bins
+        blocks[f"dist:{key}"] = (codes[:, None] == np.arange(width)).astype(float)
+
+    # Pairwise products for correlations with pairwise-complete rows, as DataFrame.corr()
+    columns = correlation_columns(catalog)
+    values = np.column_stack([_column_floats(chunk, catalog, column) for column in columns]) if columns \
+        else np.empty((rows, 0))
+    present = (~np.isnan(values)).astype(float)
+    values = np.where(present > 0, values, 0.0)
+    blocks["corr:xy"] = (values[:, :, None] * values[:, None, :]).reshape(rows, -1)
+    blocks["corr:xm"] = (values[:, :, None] * present[:, None, :]).reshape(rows, -1)
+    blocks["corr:xxm"] = ((values * values)[:, :, None] * present[:, None, :]).reshape(rows, -1)
+    blocks["corr:mm"] = (present[:, :, None] * present[:, None, :]).reshape(rows, -1)
+    return blocks
+
+
+def _correlations(xy, xm, xxm, mm):
+    """Pearson correlation matrices from per-cohort sums of pairwise products."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sum_i, sum_j = xm, xm.transpose(0, 2, 1)
+        var_i = xxm - sum_i * sum_i / mm
+        var_j = xxm.transpose(0, 2, 1) - sum_j * sum_j / mm
+        cov = xy - sum_i * sum_j / mm
+        # Rounding can leave a tiny positive variance for a constant column
+        constant = (var_i <= 1e-12 * xxm) | (var_j <= 1e-12 * xxm.transpose(0, 2, 1)) | (mm < 2)
+        corr = np.where(constant, np.nan, cov / np.sqrt(var_i * var_j))
+    return np.clip(corr, -1.0, 1.0)
+
+
+def compare_cohorts(df, catalog, cohorts, chunk_rows=COMPARISON_CHUNK_ROWS):
+    """
+    KPIs, distribution counts and correlations of several cohorts in one grouped pass.
+
+    Cohorts may overlap: a row is counted in every cohort whose filters it matches.
+
+    Parameters:
+    df (DataFrame): Dataset as loaded by the dashboard
+    catalog (dict): Column catalog of ``df``
+    cohorts (tuple): ``(name, filters)`` pairs
+    chunk_rows (int): Rows aggregated per block
+
+    Returns:
+    dict: ``cohorts`` (names), ``rows`` (rows per cohort), ``total_rows``,
+    ``measures`` (COMPARISON_MEASURES label -> mean per cohort), ``stress_scale``,
+    ``distributions`` (key -> dict with ``column``, ``labels`` or ``edges`` and
+    ``counts``, a cohorts x bins array) and ``correlation`` (``columns`` and
+    ``matrices``, a cohorts x columns x columns array)
+    """
+    names = [name for name, _ in cohorts]
+    membership = np.column_stack([filter_mask(df, filters).to_numpy(dtype=bool) for _, filters in cohorts]
+                                 ).astype(float) if cohorts else np.empty((len(df), 0))
+
+    # The single aggregation: cohort membership (rows x cohorts) transposed times the
+    # row statistics (rows x statistics), accumulated over row blocks
+    sums, widths = None, None
+    for start in range(0, max(len(df), 1), chunk_rows):
+        blocks = _row_statistics(df.iloc[start:start + chunk_rows], catalog)
+        product = membership[start:start + chunk_rows].T @ np.hstack(list(blocks.values()))
+        sums = product if sums is None else sums + product
+        widths = {name: block.shape[1] for name, block in blocks.items()}
+    offsets = np.cumsum([0, *widths.values()])
+    totals = {name: sums[:, offsets[i]:offsets[i + 1]] for i, name in enumerate(widths)}
+
+    rows = totals["rows"][:, 0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        measures = {label: (totals[f"sum:{label}"][:, 0] / totals[f"count:{label}"][:, 0]).tolist()
+                    for label in COMPARISON_MEASURES}
+
+    distributions = {}
+    for key, (column, bins) in COMPARISON_DISTRIBUTIONS.items():
+        labels, edges = _distribution_bins(catalog, column, bins)
+        distributions[key] = {"column": column, "labels": labels, "edges": edges,
+                              "counts": np.rint(totals[f"dist:{key}"]).astype(int)}
+
+    columns = correlation_columns(catalog)
+    shape = (len(names), len(columns), len(columns))
+    matrices = _correlations(*(totals[f"corr:{name}"].reshape(shape) for name in ("xy", "xm", "xxm", "mm")))
+
+    return {
+        "cohorts": names,
+        "rows": [int(count) for count in np.rint(rows)],
+        "total_rows": catalog["rows"],
+        "measures": measures,
+        "stress_scale": "/10" if is_numeric(catalog, "Stress Level") else "/3",
+        "distributions": distributions,
+        "correlation": {"columns": columns, "matrices": matrices},
+    }
+
+
+def comparison_table(comparison):
+    """KPI table with one column per cohort."""
+    table = {"Entries": comparison["rows"],
+             "Share of Dataset (%)": [count / comparison["total_rows"] * 100 for count in comparison["rows"]]}
+    for label, means in comparison["measures"].items():
+        if label == "Avg Stress Score":
+            label = f"{label} ({comparison['stress_scale']})"
+        table[label] = means
+    return pd.DataFrame(table, index=comparison["cohorts"]).T
+
+
+def comparison_distribution_chart(comparison, key):
+    """
+    Share of each cohort per bin or level. Two cohorts are drawn back to back, the
+    second mirrored below the axis; more cohorts as grouped bars.
+    """
+    entry = comparison["distributions"][key]
+    names = comparison["cohorts"]
+    rows = np.array(comparison["rows"], dtype=float)[:, None]
+    shares = np.divide(entry["counts"] * 100.0, rows, out=np.zeros(entry["counts"].shape), where=rows > 0)
+
+    if entry["edges"] is None:
+        positions = np.arange(len(entry["labels"]), dtype=float)
+        width = np.full(len(positions), 0.8)
+    else:
+        positions = (entry["edges"][:-1] + entry["edges"][1:]) / 2
+        width = np.diff(entry["edges"])
+
+    fig, ax = plt.subplots(figsize=(6, 3))
+    if len(names) == 2:
+        for sign, share, name, color in zip((1, -1), shares, names, COHORT_COLORS):
+            ax.bar(positions, sign * share, width=width, color=color, alpha=0.8,
+                   edgecolor='black', linewidth=0.3, label=name)
+        ax.axhline(0, color='black', linewidth=0.8)
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda value, _: f"{abs(value):g}"))
+    else:
+        for i, (share, name, color) in enumerate(zip(shares, names, COHORT_COLORS)):
+            offset = (i - (len(names) - 1) / 2) * width / len(names)
+            ax.bar(positions + offset, share, width=width / len(names), color=color, alpha=0.8,
+                   edgecolor='black', linewidth=0.3, label=name)
+
+    if entry["edges"] is None:
+        ax.set_xticks(positions)
+        ax.set_xticklabels(entry["labels"], rotation=45, ha='right', fontsize=8)
+    else:
+        ax.set_xlabel(entry["column"], fontsize=8)
+    ax.set_ylabel('% of Cohort', fontsize=8)
+    ax.tick_params(labelsize=8)
+    ax.grid(True, alpha=0.3)
+    ax.legend(fontsize=7)
+    plt.tight_layout()
+    return fig
+
+
+def comparison_correlation_chart(comparison):
+    """Lower-triangle correlation heatmap per cohort on one color scale."""
+    columns = comparison["correlation"]["columns"]
+    names = comparison["cohorts"]
+    lower = np.tril(np.ones((len(columns), len(columns)), dtype=bool), k=-1)
+
+    fig, axes = plt.subplots(1, len(names), figsize=(4 * len(names), 4), squeeze=False)
+    for i, (ax, matrix, name) in enumerate(zip(axes[0], comparison["correlation"]["matrices"], names)):
+        image = ax.imshow(np.where(lower, matrix, np.nan), cmap='RdYlBu_r', vmin=-1, vmax=1)
+        for row, col in zip(*np.nonzero(lower)):
+            if not np.isnan(matrix[row, col]):
+                ax.text(col, row, f"{matrix[row, col]:.2f}", ha='center', va='center', fontsize=6)
+        ax.set_xticks(range(len(columns)))
+        ax.set_xticklabels(columns, rotation=45, ha='right', fontsize=7)
+        ax.set_yticks(range(len(columns)))
+        ax.set_yticklabels(columns if i == 0 else [], fontsize=7)
+        ax.set_title(name, fontsize=10, fontweight='bold')
+    fig.colorbar(image, ax=axes[0].tolist(), shrink=0.8)
+    return fig
+
+
+def render_comparison_chart(name, comparison):
+    """PNG bytes of one comparison chart: a COMPARISON_DISTRIBUTIONS key or "correlation"."""
+    if name == "correlation":
+        return figure_to_png(comparison_correlation_chart(comparison))
+    return figure_to_png(comparison_distribution_chart(comparison, name))
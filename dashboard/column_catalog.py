@@ -0,0 +1,80 @@
+"""
+LifeSync Dashboard - Column Catalog
+Schema and summary metadata for every dataset column, built once when the dataset is
+loaded: dtype, missing count, the sorted distinct values and counts of categorical
+columns, and the range, mean and quantiles of numeric ones. The filter widgets and the
+insight rules read the catalog instead of scanning the data on every rerun.
+"""
+
+import pandas as pd
+
+# Quantiles recorded for each numeric column
+CATALOG_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def build_column_catalog(df):
+    """
+    Describe each column of ``df``.
+
+    Parameters:
+    df (DataFrame): Dataset as loaded by the dashboard
+
+    Returns:
+    dict: ``rows`` (row count) and ``columns``, mapping each column name to a dict with
+    ``dtype``, ``kind`` ("numeric" or "categorical") and ``missing``; numeric columns add
+    ``min``, ``max``, ``mean`` and ``quantiles`` (quantile -> value), categorical columns
+    add ``values`` (sorted strings) and ``counts`` (value -> rows)
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        values = series.dropna()
+        entry = {"dtype": str(series.dtype), "missing": int(series.isna().sum())}
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            quantiles = values.quantile(list(CATALOG_QUANTILES)) if len(values) else {}
+            entry.update(
+                kind="numeric",
+                min=float(values.min()) if len(values) else None,
+                max=float(values.max()) if len(values) else None,
+                mean=float(values.mean()) if len(values) else None,
+                quantiles={float(q): float(v) for q, v in dict(quantiles).items()},
+            )
+        else:
+            counts = values.astype(str).value_counts()
+            entry.update(
+                kind="categorical",
+                values=sorted(counts.index),
+                counts={value: int(count) for value, count in counts.items()},
+            )
+        columns[column] = entry
+    return {"rows": len(df), "columns": columns}
+
+
+def is_numeric(catalog, column):
+    """Whether a column holds numbers rather than labels."""
+    return catalog["columns"][column]["kind"] == "numeric"
+
+
+def column_values(catalog, column):
+    """Sorted distinct non-missing values of a categorical column, as strings."""
+    return catalog["columns"][column]["values"]
+
+
+def column_range(catalog, column):
+    """``(min, max)`` of a numeric column."""
+    entry = catalog["columns"][column]
+    return entry["min"], entry["max"]
+
+
+def column_mean(catalog, column, mapping=None):
+    """
+    Mean of a numeric column, or of a categorical column scored with ``mapping``.
+
+    Values missing from ``mapping`` are skipped, as ``Series.map(mapping).mean()`` does.
+    """
+    entry = catalog["columns"][column]
+    if entry["kind"] == "numeric":
+        return entry["mean"]
+    scored = [(mapping[value], count) for value, count in entry["counts"].items() if value in mapping]
+    total = sum(count for _, count in scored)
+    return sum(score * count for score, count in scored) / total if total else float("nan")
@@ -0,0 +1,356 @@
+"""
+LifeSync Dashboard - Dashboard Charts
+Figure builders for the dashboard tab. They take the (filtered) dataset and return PNG
+bytes, with no Streamlit calls, so the same charts can be rendered by the app or
+pre-built for the default, unfiltered view by the warm-up command.
+"""
+
+import io
+import os
+
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend for Streamlit
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from cycler import cycler
+
+from dashboard.column_catalog import column_range, is_numeric
+from dashboard.wellness_engine import BURNOUT_RISK_BANDS, classify_burnout_risk, compute_burnout_risk
+
+# Set matplotlib style for better appearance; the colors are seaborn's "husl" palette,
+# written out so seaborn (and scipy behind it) only load when the heatmap is drawn
+plt.style.use('default')
+HUSL_PALETTE = ['#f77189', '#bb9832', '#50b131', '#36ada4', '#3ba3ec', '#e866f4']
+plt.rcParams['axes.prop_cycle'] = cycler(color=HUSL_PALETTE)
+
+# Path configuration
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Mental_Health_Lifestyle_Dataset.csv")
+MODELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs")
+
+# Columns computed at load time rather than stored in the dataset
+DERIVED_COLUMNS = ["Burnout Risk"]
+
+SHAP_IMAGE_FILES = {
+    "Happiness Summary": "shap_summary_happiness.png",
+    "Happiness Dot": "shap_dot_happiness.png",
+    "Stress Summary": "shap_summary_stress.png",
+    "Stress Dot": "shap_dot_stress.png",
+}
+
+# Same savefig options st.pyplot uses, so pre-rendered charts look identical
+SAVEFIG_OPTIONS = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+
+# Multiselect filters and the dataset column each one applies to
+CATEGORY_FILTERS = {
+    "countries": "Country",
+    "genders": "Gender",
+    "exercise_levels": "Exercise Level",
+    "diet_types": "Diet Type",
+    "mh_conditions": "Mental Health Condition",
+}
+
+RANGE_FILTERS = {
+    "age_range": "Age",
+    "sleep_range": "Sleep Hours",
+}
+
+
+def read_dataset(data_path=DATA_PATH):
+    """Read the lifestyle dataset and add the derived Burnout Risk column."""
+    df = pd.read_csv(data_path)
+    df["Burnout Risk"] = compute_burnout_risk(df)
+    return df
+
+
+def read_feature_importance(models_path=MODELS_PATH):
+    """The feature importance table, or None if the models have not been trained."""
+    fi_path = os.path.join(models_path, "feature_importance.csv")
+    if os.path.exists(fi_path):
+        return pd.read_csv(fi_path)
+    return None
+
+
+def read_shap_images(models_path=MODELS_PATH):
+    """Encoded PNG bytes of each available SHAP plot; st.image displays them without decoding."""
+    images = {}
+    for name, filename in SHAP_IMAGE_FILES.items():
+        path = os.path.join(models_path, filename)
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                images[name] = file.read()
+    return images
+
+
+def default_filters(catalog):
+    """Filter state with nothing selected and the full Age and Sleep Hours ranges, from the column catalog."""
+    filters = {key: () for key in CATEGORY_FILTERS}
+    age_min, age_max = column_range(catalog, "Age")
+    sleep_min, sleep_max = column_range(catalog, "Sleep Hours")
+    filters["age_range"] = (int(age_min), int(age_max))
+    filters["sleep_range"] = (float(sleep_min), float(sleep_max))
+    return filters
+
+
+def filter_mask(df, filters):
+    """
+    Boolean Series marking the rows that match a filter state.
+
+    Empty category selections keep every row (including blank Mental Health
+    values); ranges are inclusive.
+    """
+    mask = pd.Series(True, index=df.index)
+    for key, column in CATEGORY_FILTERS.items():
+        if filters[key]:
+            mask &= df[column].isin(filters[key])
+    for key, column in RANGE_FILTERS.items():
+        low, high = filters[key]
+        mask &= df[column].between(low, high)
+    return mask
+
+
+def apply_filters(df, filters):
+    """Rows matching a filter state (see filter_mask)."""
+    return df[filter_mask(df, filters)]
+
+
+def figure_to_png(fig):
+    """Encode a figure as PNG bytes and close it."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, **SAVEFIG_OPTIONS)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+def _label_bars(ax, bars):
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+               f'{int(height)}', ha='center', va='bottom', fontsize=7)
+
+
+def _histogram(values, bins, color, xlabel, mean_label=None, figsize=(4, 3)):
+    """Histogram with an optional dashed mean line; ``mean_label`` formats the mean."""
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.hist(values, bins=bins, color=color, alpha=0.7, edgecolor='black')
+    ax.set_xlabel(xlabel, fontsize=8)
+    ax.set_ylabel('Frequency', fontsize=8)
+    ax.tick_params(labelsize=8)
+    ax.grid(True, alpha=0.3)
+
+    if mean_label:
+        mean = values.mean()
+        ax.axvline(mean, color='red', linestyle='--', alpha=0.8, label=mean_label.format(mean))
+        ax.legend(fontsize=7)
+
+    plt.tight_layout()
+    return fig
+
+
+def _pie(counts, colors):
+    fig, ax = plt.subplots(figsize=(4, 3))
+    wedges, texts, autotexts = ax.pie(counts.values, labels=counts.index,
+                                      autopct='%1.1f%%', colors=colors[:len(counts)])
+    for text in texts:
+        text.set_fontsize(8)
+    for autotext in autotexts:
+        autotext.set_fontsize(7)
+        autotext.set_color('white')
+        autotext.set_weight('bold')
+
+    plt.tight_layout()
+    return fig
+
+
+def _rotated_count_bars(counts, color):
+    fig, ax = plt.subplots(figsize=(4, 3))
+    bars = ax.bar(range(len(counts)), counts.values, color=color)
+    ax.set_xticks(range(len(counts)))
+    ax.set_xticklabels(counts.index, rotation=45, ha='right', fontsize=8)
+    ax.set_ylabel('Count', fontsize=8)
+    ax.tick_params(axis='y', labelsize=8)
+    _label_bars(ax, bars)
+    plt.tight_layout()
+    return fig
+
+
+def country_chart(df):
+    return _rotated_count_bars(df['Country'].value_counts().head(10), '#667eea')
+
+
+def age_chart(df):
+    return _histogram(df['Age'], min(20, df['Age'].nunique()), '#11998e', 'Age')
+
+
+def gender_chart(df):
+    return _pie(df['Gender'].value_counts(), ['#ff9999', '#66b3ff', '#99ff99', '#ffcc99'])
+
+
+def exercise_chart(df):
+    exercise_counts = df['Exercise Level'].value_counts()
+    fig, ax = plt.subplots(figsize=(4, 3))
+    bars = ax.bar(exercise_counts.index, exercise_counts.values, color='#e74c3c')
+    ax.set_ylabel('Count', fontsize=8)
+    ax.tick_params(axis='x', rotation=45, labelsize=8)
+    ax.tick_params(axis='y', labelsize=8)
+    _label_bars(ax, bars)
+    plt.tight_layout()
+    return fig
+
+
+def diet_chart(df):
+    return _pie(df['Diet Type'].value_counts(), ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4', '#feca57'])
+
+
+def sleep_chart(df):
+    return _histogram(df['Sleep Hours'], min(15, df['Sleep Hours'].nunique()), '#9b59b6', 'Sleep Hours', 'Mean: {:.1f}h')
+
+
+def stress_chart(df, catalog):
+    if not is_numeric(catalog, 'Stress Level'):
+        # Categorical stress levels are shown as counts
+        stress_counts = df['Stress Level'].value_counts()
+        fig, ax = plt.subplots(figsize=(4, 3))
+        bars = ax.bar(stress_counts.index, stress_counts.values, color='#e67e22')
+        ax.set_ylabel('Count', fontsize=8)
+        _label_bars(ax, bars)
+        ax.tick_params(labelsize=8)
+        ax.grid(True, alpha=0.3)
+        plt.tight_layout()
+        return fig
+    return _histogram(df['Stress Level'], min(10, df['Stress Level'].nunique()), '#e67e22', 'Stress Level', 'Mean: {:.1f}')
+
+
+def mental_health_chart(df):
+    return _rotated_count_bars(df['Mental Health Condition'].value_counts(), '#2ecc71')
+
+
+def work_hours_chart(df):
+    return _histogram(df['Work Hours per Week'], min(15, df['Work Hours per Week'].nunique()), '#34495e', 'Work Hours/Week', 'Mean: {:.1f}h')
+
+
+def screen_time_chart(df):
+    return _histogram(df['Screen Time per Day (Hours)'], min(15, df['Screen Time per Day (Hours)'].nunique()), '#3498db', 'Screen Time (Hours)', 'Mean: {:.1f}h')
+
+
+def social_chart(df):
+    return _histogram(df['Social Interaction Score'], min(10, df['Social Interaction Score'].nunique()), '#e91e63', 'Social Interaction Score', 'Mean: {:.1f}')
+
+
+def happiness_chart(df):
+    return _histogram(df['Happiness Score'], min(10, df['Happiness Score'].nunique()), '#f39c12', 'Happiness Score', 'Mean: {:.1f}')
+
+
+def burnout_chart(df):
+    return _histogram(df['Burnout Risk'], 20, '#fd7e14', 'Burnout Risk (%)', 'Mean: {:.1f}%', figsize=(8, 3))
+
+
+def burnout_bands_chart(df):
+    band_labels = [label for _, label in BURNOUT_RISK_BANDS]
+    band_counts = classify_burnout_risk(df['Burnout Risk']).value_counts().reindex(band_labels, fill_value=0)
+    fig, ax = plt.subplots(figsize=(8, 3))
+    bars = ax.bar(band_counts.index, band_counts.values, color=['#28a745', '#ffc107', '#dc3545'])
+    ax.set_ylabel('Count', fontsize=8)
+    ax.tick_params(labelsize=8)
+    _label_bars(ax, bars)
+    plt.tight_layout()
+    return fig
+
+
+def correlation_matrix(df):
+    """Correlations between the dataset's numeric columns (derived columns would trivially correlate)."""
+    numeric_columns = [c for c in df.select_dtypes(include=[np.number]).columns if c not in DERIVED_COLUMNS]
+    return df[numeric_columns].corr()
+
+
+def correlation_chart(df):
+    corr_matrix = correlation_matrix(df)
+    fig, ax = plt.subplots(figsize=(8, 6))
+
+    # Create mask for upper triangle to show only lower half
+    mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
+
+    # seaborn (and scipy behind it) only load when the heatmap is drawn
+    import seaborn as sns
+    sns.heatmap(corr_matrix,
+               mask=mask,
+               annot=True,
+               cmap='RdYlBu_r',
+               center=0,
+               square=True,
+               fmt='.2f',
+               cbar_kws={"shrink": .8},
+               ax=ax,
+               annot_kws={'size': 8})
+
+    ax.set_title('Correlation Matrix', fontsize=12, fontweight='bold', pad=15)
+    plt.xticks(rotation=45, ha='right', fontsize=9)
+    plt.yticks(rotation=0, fontsize=9)
+    plt.tight_layout()
+    return fig
+
+
+def feature_importance_chart(feature_importance_df, column, color, title, xlabel=None):
+    top_features = feature_importance_df.nlargest(5, column)
+    fig, ax = plt.subplots(figsize=(8, 6))
+    bars = ax.barh(top_features['Feature'], top_features[column], color=color)
+    if xlabel:
+        ax.set_xlabel(xlabel, fontsize=10)
+    ax.set_title(title, fontsize=12, fontweight='bold')
+    ax.grid(True, alpha=0.3, axis='x')
+
+    # Add value labels on bars
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width + 0.001, bar.get_y() + bar.get_height()/2,
+               f'{width:.3f}', ha='left', va='center', fontsize=9)
+
+    plt.tight_layout()
+    return fig
+
+
+# Filter-responsive charts: key -> (title, figure builder taking the filtered frame)
+DISTRIBUTION_CHARTS = {
+    "country": ("🌍 Country Distribution", country_chart),
+    "age": ("📊 Age Distribution", age_chart),
+    "gender": ("⚧ Gender Distribution", gender_chart),
+    "exercise": ("💪 Exercise Level", exercise_chart),
+    "diet": ("🥗 Diet Type", diet_chart),
+    "sleep": ("💤 Sleep Hours", sleep_chart),
+    "stress": ("😰 Stress Level", stress_chart),
+    "mental_health": ("🧠 Mental Health", mental_health_chart),
+    "work_hours": ("💼 Work Hours/Week", work_hours_chart),
+    "screen_time": ("📱 Screen Time/Day", screen_time_chart),
+    "social": ("👥 Social Interaction", social_chart),
+    "happiness": ("😊 Happiness Score", happiness_chart),
+    "burnout": ("🔥 Burnout Risk Distribution", burnout_chart),
+    "burnout_bands": ("🚦 Burnout Risk Bands", burnout_bands_chart),
+}
+
+# Charts of the whole dataset, independent of the filters: key -> (title, figure builder)
+DATASET_CHARTS = {
+    "correlation": ("🔗 Correlation Heatmap", correlation_chart),
+}
+
+# Charts whose builder also takes the column catalog, e.g. to read a column's type
+CATALOG_CHARTS = {"stress"}
+
+# Feature importance charts: key -> (importance column, bar color, axes title, x label)
+FEATURE_IMPORTANCE_CHARTS = {
+    "happiness_drivers": ("Happiness_Importance", '#2ecc71', 'Features Contributing to Happiness', None),
+    "stress_factors": ("Stress_Importance", '#e74c3c', 'Features Contributing to Stress', 'Feature Importance'),
+}
+
+
+def render_chart(name, df, catalog):
+    """PNG bytes of one DISTRIBUTION_CHARTS or DATASET_CHARTS chart for ``df``; ``catalog`` describes the full dataset."""
+    builder = (DATASET_CHARTS.get(name) or DISTRIBUTION_CHARTS[name])[1]
+    return figure_to_png(builder(df, catalog) if name in CATALOG_CHARTS else builder(df))
+
+
+def render_feature_importance_chart(name, feature_importance_df):
+    """PNG bytes of one feature importance chart, or None if its column is missing."""
+    column, color, title, xlabel = FEATURE_IMPORTANCE_CHARTS[name]
+    if feature_importance_df is None or column not in feature_importance_df.columns:
+        return None
+    return figure_to_png(feature_importance_chart(feature_importance_df, column, color, title, xlabel))
@@ -0,0 +1,248 @@
+"""
+LifeSync Dashboard - Dashboard Insights
+KPI figures, correlation highlights and the insight cards shown on the dashboard tab,
+computed from the filtered dataset and the full dataset's column catalog without any
+Streamlit calls so the default view can be built ahead of time.
+"""
+
+import operator
+
+import numpy as np
+import pandas as pd
+
+from dashboard.column_catalog import column_mean, is_numeric
+from dashboard.dashboard_charts import correlation_matrix
+
+STRESS_MAPPING = {'Low': 1, 'Moderate': 2, 'High': 3}
+
+# Per-row values averaged for the insight rules: name -> column, or (column, scores)
+# for a column that may hold labels instead of numbers
+INSIGHT_MEASURES = {
+    "happiness": "Happiness Score",
+    "stress": ("Stress Level", STRESS_MAPPING),
+    "sleep": "Sleep Hours",
+    "work": "Work Hours per Week",
+    "screen": "Screen Time per Day (Hours)",
+    "social": "Social Interaction Score",
+}
+
+# Categorical columns whose level shares the insight rules use: name -> column
+INSIGHT_SHARES = {
+    "exercise": "Exercise Level",
+}
+
+RULE_OPERATORS = {"<": operator.lt, ">": operator.gt, "==": operator.eq}
+
+# Insight rules: (statistic, cases). The first case whose (operator, threshold) holds for
+# the statistic is shown, a None operator always matches, and a rule whose statistic is
+# missing or NaN is skipped. Texts are formatted with the statistics from
+# insight_statistics(): for each measure <name>, overall_<name>, <name>_diff and
+# <name>_gap (the absolute difference); for each share top_<name> and top_<name>_pct.
+INSIGHT_RULES = [
+    ("rows", [
+        (None, None, '📊', 'Filter Overview',
+         "Viewing {rows:,} entries ({filter_percentage:.1f}% of total dataset)"),
+    ]),
+    ("happiness_diff", [
+        (">", 0.2, '😊📈', 'Happiness Boost',
+         "Your selection shows {happiness_diff:.1f} points higher happiness than average ({happiness:.1f}/10)"),
+        ("<", -0.2, '😔📉', 'Happiness Alert',
+         "Your selection shows {happiness_gap:.1f} points lower happiness than average ({happiness:.1f}/10)"),
+        (None, None, '😐📊', 'Happiness Balance',
+         "Your selection shows average happiness levels ({happiness:.1f}/10)"),
+    ]),
+    ("stress_diff", [
+        (">", 0.2, '😰⚠️', 'Stress Alert',
+         "Your selection shows higher stress levels ({stress:.1f}{stress_scale} vs {overall_stress:.1f}{stress_scale} average)"),
+        ("<", -0.2, '😌✨', 'Lower Stress',
+         "Your selection shows lower stress levels ({stress:.1f}{stress_scale} vs {overall_stress:.1f}{stress_scale} average)"),
+        (None, None, '😐📊', 'Average Stress',
+         "Your selection shows typical stress levels ({stress:.1f}{stress_scale})"),
+    ]),
+    ("sleep", [
+        ("<", 6, '😴⚠️', 'Sleep Concern',
+         "Average sleep in selection: {sleep:.1f}h - Consider aiming for 7-8 hours"),
+        (">", 8.5, '😴💤', 'High Sleep',
+         "Average sleep in selection: {sleep:.1f}h - Above typical range"),
+        (None, None, '😴✅', 'Good Sleep',
+         "Average sleep in selection: {sleep:.1f}h - Within healthy range"),
+    ]),
+    ("top_exercise", [
+        ("==", 'High', '💪🔥', 'Active Lifestyle',
+         "{top_exercise_pct:.0f}% of your selection exercises at high intensity"),
+        ("==", 'Low', '🚶‍♂️📈', 'Exercise Opportunity',
+         "{top_exercise_pct:.0f}% of your selection has low exercise - room for improvement"),
+        (None, None, '🏃‍♀️📊', 'Moderate Activity',
+         "{top_exercise_pct:.0f}% of your selection exercises at moderate levels"),
+    ]),
+    ("work", [
+        (">", 50, '💼⚠️', 'Work Intensity',
+         "Average work hours: {work:.1f}h/week - High workload may impact wellbeing"),
+        ("<", 30, '💼😊', 'Work Balance',
+         "Average work hours: {work:.1f}h/week - Good work-life balance"),
+        (None, None, '💼📊', 'Standard Workload',
+         "Average work hours: {work:.1f}h/week - Typical full-time schedule"),
+    ]),
+    ("screen", [
+        (">", 8, '📱⚠️', 'High Screen Time',
+         "Average screen time: {screen:.1f}h/day - Consider digital wellness breaks"),
+        ("<", 4, '📱✅', 'Moderate Screen Use',
+         "Average screen time: {screen:.1f}h/day - Good digital balance"),
+        (None, None, '📱📊', 'Typical Screen Time',
+         "Average screen time: {screen:.1f}h/day - Within normal range"),
+    ]),
+    ("social", [
+        ("<", 4, '👥📉', 'Social Opportunity',
+         "Social interaction score: {social:.1f}/10 - Consider increasing social connections"),
+        (">", 7, '👥🌟', 'Strong Social Life',
+         "Social interaction score: {social:.1f}/10 - Excellent social connections"),
+        (None, None, '👥📊', 'Moderate Social Life',
+         "Social interaction score: {social:.1f}/10 - Balanced social interactions"),
+    ]),
+]
+
+
+def overview_metrics(catalog, filtered_df):
+    """
+    The five overview cards: total and selected entries and the selection's mean
+    happiness, stress (with its scale suffix) and burnout risk.
+    """
+    avg_happiness = filtered_df["Happiness Score"].mean() if not filtered_df.empty else 0
+
+    # Handle stress calculation; the catalog records whether levels are scores or labels
+    if is_numeric(catalog, "Stress Level"):
+        avg_stress = filtered_df["Stress Level"].mean() if not filtered_df.empty else 0
+        stress_scale = "/10"
+    else:
+        stress_numeric = filtered_df["Stress Level"].map(STRESS_MAPPING) if not filtered_df.empty else pd.Series([0])
+        avg_stress = stress_numeric.mean()
+        stress_scale = "/3"
+    avg_burnout = filtered_df["Burnout Risk"].mean() if not filtered_df.empty else 0
+
+    return {
+        "total_entries": catalog["rows"],
+        "selected_entries": len(filtered_df),
+        "avg_happiness": float(avg_happiness),
+        "avg_stress": float(avg_stress),
+        "stress_scale": stress_scale,
+        "avg_burnout": float(avg_burnout),
+    }
+
+
+def correlation_highlights(filtered_df):
+    """
+    Strongest positive and negative correlation between numeric columns.
+
+    Returns a dict with ``columns`` (how many numeric columns were compared) and
+    ``positive`` / ``negative`` as ``(factor1, factor2, r)`` tuples, or None when
+    there is no such pair.
+    """
+    corr_matrix = correlation_matrix(filtered_df)
+    highlights = {"columns": len(corr_matrix.columns), "positive": None, "negative": None}
+    if len(corr_matrix.columns) <= 1:
+        return highlights
+
+    # Find strongest positive and negative correlations
+    corr_flat = corr_matrix.where(np.tril(np.ones(corr_matrix.shape), k=-1).astype(bool))
+    corr_pairs = corr_flat.stack().reset_index()
+    corr_pairs.columns = ['Factor1', 'Factor2', 'Correlation']
+    corr_pairs = corr_pairs.sort_values('Correlation', key=abs, ascending=False)
+
+    for key, pairs in (("positive", corr_pairs[corr_pairs['Correlation'] > 0]),
+                       ("negative", corr_pairs[corr_pairs['Correlation'] < 0])):
+        if len(pairs) > 0:
+            top = pairs.iloc[0]
+            highlights[key] = (top['Factor1'], top['Factor2'], float(top['Correlation']))
+    return highlights
+
+
+def insight_statistics(catalog, filtered_df):
+    """
+    Every statistic the insight rules use, from one aggregation over the selection.
+
+    Measures and level indicators are stacked into one float matrix and averaged in a
+    single pass; the whole-dataset values come from the column catalog.
+
+    Returns:
+    dict: statistic name -> value (see INSIGHT_RULES for the names)
+    """
+    columns = {}
+    stats = {"rows": len(filtered_df), "total_rows": catalog["rows"]}
+    for name, spec in INSIGHT_MEASURES.items():
+        column, scores = spec if isinstance(spec, tuple) else (spec, None)
+        if is_numeric(catalog, column):
+            columns[name] = filtered_df[column].to_numpy(dtype=float, na_value=np.nan)
+            stats[f"overall_{name}"] = column_mean(catalog, column)
+        else:
+            # Score each distinct label once; code -1 (missing) picks the trailing NaN
+            codes, labels = pd.factorize(filtered_df[column])
+            label_scores = np.array([scores.get(label, np.nan) for label in labels] + [np.nan], dtype=float)
+            columns[name] = label_scores[codes]
+            stats[f"overall_{name}"] = column_mean(catalog, column, scores)
+    share_labels = {}
+    for name, column in INSIGHT_SHARES.items():
+        # One indicator column per level, in order of first appearance
+        codes, share_labels[name] = pd.factorize(filtered_df[column])
+        indicators = codes[:, None] == np.arange(len(share_labels[name]))
+        for position in range(len(share_labels[name])):
+            columns[f"{name}={position}"] = indicators[:, position].astype(float)
+
+    # The single aggregation: NaN-skipping means of every column at once. One row per
+    # column keeps each sum contiguous, so it is summed pairwise exactly like Series.mean()
+    values = np.vstack(list(columns.values()))
+    present = ~np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = dict(zip(columns, np.where(present, values, 0).sum(axis=1) / present.sum(axis=1)))
+
+    for name in INSIGHT_MEASURES:
+        stats[name] = float(means[name])
+        stats[f"{name}_diff"] = stats[name] - stats[f"overall_{name}"]
+        stats[f"{name}_gap"] = abs(stats[f"{name}_diff"])
+    for name, labels in share_labels.items():
+        if len(labels):
+            # Ties go to the level seen first, as with value_counts()
+            shares = [means[f"{name}={position}"] for position in range(len(labels))]
+            top = int(np.argmax(shares))
+            stats[f"top_{name}"] = str(labels[top])
+            stats[f"top_{name}_pct"] = float(shares[top]) * 100
+    stats["filter_percentage"] = stats["rows"] / stats["total_rows"] * 100
+    stats["stress_scale"] = "/10" if is_numeric(catalog, "Stress Level") else "/3"
+    return stats
+
+
+def evaluate_insight_rules(stats, rules=INSIGHT_RULES):
+    """Insight cards for the first matching case of each rule in ``rules``."""
+    insights = []
+    for statistic, cases in rules:
+        value = stats.get(statistic)
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            continue
+        for op, threshold, icon, title, text in cases:
+            if op is None or RULE_OPERATORS[op](value, threshold):
+                insights.append({'icon': icon, 'title': title, 'text': text.format(**stats)})
+                break
+    return insights
+
+
+def build_insights(catalog, filtered_df):
+    """
+    Insight cards (dicts with ``icon``, ``title`` and ``text``) comparing the
+    filtered selection with the whole dataset; always returns at least one.
+    """
+    if filtered_df.empty:
+        # Empty dataset insight
+        return [{
+            'icon': '🔍',
+            'title': 'No Data Found',
+            'text': "No entries match your current filter criteria. Try adjusting your filters."
+        }]
+
+    try:
+        return evaluate_insight_rules(insight_statistics(catalog, filtered_df))
+    except Exception:
+        # Fallback insight that always works
+        return [{
+            'icon': '📊',
+            'title': 'Data Analysis',
+            'text': f"Analyzing {len(filtered_df)} entries from your filter selection"
+        }]
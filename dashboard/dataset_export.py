@@ -0,0 +1,71 @@
+"""
+LifeSync Dashboard - Dataset Export
+Serialises the dataset (without the derived columns) for the dashboard's download
+buttons as CSV, gzip-compressed CSV or Parquet. CSV is written in row chunks straight
+to bytes, so an export never builds the whole file as one Python string.
+"""
+
+import gzip
+import importlib.util
+import io
+
+from dashboard.dashboard_charts import DERIVED_COLUMNS
+
+# Rows serialised per CSV chunk
+EXPORT_CHUNK_ROWS = 50_000
+
+# Format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+EXPORT_BASENAME = "Mental_Health_Lifestyle_Dataset"
+
+
+def parquet_supported():
+    """Whether a Parquet engine (pyarrow or fastparquet) is installed, without importing it."""
+    return any(importlib.util.find_spec(engine) is not None for engine in ("pyarrow", "fastparquet"))
+
+
+def export_filename(fmt, suffix=""):
+    """Download file name for a format, e.g. ``Mental_Health_Lifestyle_Dataset_filtered.csv``."""
+    return f"{EXPORT_BASENAME}{suffix}{EXPORT_FORMATS[fmt][0]}"
+
+
+def write_csv_chunks(df, file, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write ``df`` as UTF-8 CSV to a binary file, ``chunk_rows`` rows at a time."""
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        file.write(chunk.to_csv(index=False, header=start == 0).encode("utf-8"))
+
+
+def export_bytes(df, fmt="csv", chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Serialise the dataset for download.
+
+    Parameters:
+    df (DataFrame): Dataset as loaded by the dashboard; derived columns are dropped
+    fmt (str): One of EXPORT_FORMATS
+    chunk_rows (int): Rows per CSV chunk
+
+    Returns:
+    bytes: File contents
+
+    Raises ImportError for "parquet" when no Parquet engine is installed.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    export_df = df.drop(columns=[column for column in DERIVED_COLUMNS if column in df.columns])
+
+    buffer = io.BytesIO()
+    if fmt == "parquet":
+        export_df.to_parquet(buffer, index=False)
+    elif fmt == "csv.gz":
+        # A fixed mtime keeps the bytes identical for the same data
+        with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as file:
+            write_csv_chunks(export_df, file, chunk_rows)
+    else:
+        write_csv_chunks(export_df, buffer, chunk_rows)
+    return buffer.getvalue()
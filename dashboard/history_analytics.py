@@ -0,0 +1,133 @@
+"""
+LifeSync Dashboard - Prediction History Analytics
+Incremental reader for outputs/prediction_history.csv. It remembers the byte offset it
+has consumed, parses only rows appended since the last refresh and folds them into
+running hourly aggregates, so charting usage trends costs the same on every rerun no
+matter how long the history grows.
+"""
+
+import io
+import os
+import threading
+
+import pandas as pd
+
+from dashboard.history_compaction import HISTORY_ARCHIVE_DIR, ROLLUP_COLUMNS, load_rollup
+from dashboard.history_log import HISTORY_COLUMNS, HISTORY_CSV_PATH, TIMESTAMP_FORMAT
+
+AGGREGATE_FREQUENCY = "h"
+
+# Running sums are kept so means stay exact as new rows are folded in
+SUM_COLUMNS = [f"{column} Sum" for column in ROLLUP_COLUMNS]
+
+
+def _empty_aggregates():
+    return pd.DataFrame(columns=["Predictions"] + SUM_COLUMNS, dtype=float,
+                        index=pd.DatetimeIndex([], name="Period"))
+
+
+class HistoryTailReader:
+    """
+    Tails a history CSV and keeps hourly prediction counts and score sums.
+
+    ``refresh`` reads from the last consumed byte to the last complete line. If the
+    file shrinks or is replaced (e.g. by history compaction) the reader starts over,
+    seeding hours older than the live CSV from the compacted hourly rollup.
+    """
+
+    def __init__(self, csv_path=HISTORY_CSV_PATH, archive_dir=HISTORY_ARCHIVE_DIR):
+        self.csv_path = csv_path
+        self.archive_dir = archive_dir
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self._file_id = None
+        self._header = None
+        self._aggregates = _empty_aggregates()
+
+    def _seed_from_rollup(self, first_timestamp):
+        """Start from the compacted hourly rollup for the days no longer in the CSV."""
+        try:
+            rollup = load_rollup("hourly", end=first_timestamp[:10] if first_timestamp else None,
+                                 archive_dir=self.archive_dir)
+        except ImportError:
+            return
+        if rollup.empty:
+            return
+        seeded = pd.DataFrame({"Predictions": rollup["Predictions"].astype(float).to_numpy()},
+                              index=pd.DatetimeIndex(rollup["Period"], name="Period"))
+        for column, sum_column in zip(ROLLUP_COLUMNS, SUM_COLUMNS):
+            seeded[sum_column] = (rollup[column] * rollup["Predictions"]).to_numpy()
+        self._aggregates = seeded
+
+    def _fold(self, rows):
+        """Add a parsed batch of rows into the running hourly aggregates."""
+        if rows.empty:
+            return
+        period = pd.to_datetime(rows["Timestamp"], format=TIMESTAMP_FORMAT).dt.floor(AGGREGATE_FREQUENCY)
+        scores = rows[ROLLUP_COLUMNS].apply(pd.to_numeric, errors="coerce")
+        scores.columns = SUM_COLUMNS
+        grouped = scores.groupby(period.rename("Period")).sum()
+        grouped.insert(0, "Predictions", period.groupby(period).size().astype(float).to_numpy())
+        if not self._aggregates.empty:
+            grouped = grouped.add(self._aggregates, fill_value=0)
+        self._aggregates = grouped.sort_index()
+
+    def refresh(self):
+        """Parse rows appended since the last call; returns how many were added."""
+        with self._lock:
+            if not os.path.exists(self.csv_path):
+                return 0
+
+            stat = os.stat(self.csv_path)
+            file_id = (stat.st_dev, stat.st_ino)
+            if self._file_id != file_id or stat.st_size < self.offset:
+                self._reset()
+                self._file_id = file_id
+            if stat.st_size == self.offset:
+                return 0
+
+            with open(self.csv_path, "rb") as file:
+                file.seek(self.offset)
+                chunk = file.read(stat.st_size - self.offset)
+
+            # Leave a partially written last row for the next refresh
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                return 0
+            chunk = chunk[:end]
+            self.offset += end
+
+            if self._header is None:
+                header_end = chunk.find(b"\n") + 1
+                self._header = chunk[:header_end].decode("utf-8").strip().split(",")
+                chunk = chunk[header_end:]
+                first_row = chunk[:chunk.find(b"\n")].decode("utf-8")
+                self._seed_from_rollup(first_row[:len("YYYY-MM-DD HH:MM:SS")] or None)
+            if not chunk:
+                return 0
+
+            columns = self._header if len(self._header) == len(HISTORY_COLUMNS) else HISTORY_COLUMNS
+            rows = pd.read_csv(io.BytesIO(chunk), header=None, names=columns,
+                               usecols=["Timestamp"] + ROLLUP_COLUMNS, keep_default_na=False)
+            self._fold(rows)
+            return len(rows)
+
+    def aggregates(self, frequency=AGGREGATE_FREQUENCY):
+        """
+        Prediction counts and mean scores per period (``'h'`` for hourly, ``'D'`` for daily).
+
+        Daily figures are rolled up from the hourly sums, so no rows are re-read.
+        """
+        with self._lock:
+            sums = self._aggregates.copy()
+        if frequency != AGGREGATE_FREQUENCY and not sums.empty:
+            sums = sums.resample(frequency).sum()
+            sums = sums[sums["Predictions"] > 0]
+
+        result = pd.DataFrame({"Predictions": sums["Predictions"].astype(int)}, index=sums.index)
+        for column, sum_column in zip(ROLLUP_COLUMNS, SUM_COLUMNS):
+            result[column] = (sums[sum_column] / sums["Predictions"]).round(3)
+        return result
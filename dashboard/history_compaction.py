@@ -0,0 +1,235 @@
+"""
+LifeSync Dashboard - History Compaction
+Rotates outputs/prediction_history.csv into daily Parquet partitions and keeps hourly
+and daily rollups, so the live CSV only holds the current day and long-range analytics
+read the small rollup tables instead of every prediction.
+
+Layout under outputs/history/:
+    partitions/YYYY-MM-DD.parquet   one file per closed day
+    rollups/hourly.parquet          per-hour counts and mean scores
+    rollups/daily.parquet           per-day counts and mean scores
+
+Requires pyarrow for Parquet support.
+
+Usage:
+    python -m dashboard.history_compaction
+    python -m dashboard.history_compaction --today 2025-06-03
+"""
+
+import argparse
+import glob
+import os
+import sys
+from datetime import date
+
+import pandas as pd
+
+from dashboard.history_log import (
+    HISTORY_COLUMNS,
+    HISTORY_CSV_PATH,
+    PROJECT_ROOT,
+    TIMESTAMP_FORMAT,
+    file_lock,
+    format_csv_rows,
+)
+
+HISTORY_ARCHIVE_DIR = os.path.join(PROJECT_ROOT, "outputs", "history")
+
+ROLLUP_PERIODS = {"hourly": "h", "daily": "D"}
+
+ROLLUP_COLUMNS = ["Happiness Score", "Stress Level", "Burnout Risk"]
+
+# A row repeating the previous one this soon after it is a simulator rerun, not a new prediction
+RERUN_WINDOW_SECONDS = 60
+
+
+def _partitions_dir(archive_dir):
+    return os.path.join(archive_dir, "partitions")
+
+
+def _rollup_path(archive_dir, period):
+    return os.path.join(archive_dir, "rollups", f"{period}.parquet")
+
+
+def _write_parquet(df, path):
+    # Write beside the target and rename so readers never see a half-written file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def read_history_csv(csv_path):
+    """Read a history CSV as strings-for-categories, keeping "None" and blank names as text."""
+    df = pd.read_csv(csv_path, keep_default_na=False, dtype={"Name": str, "Mental Health Condition": str})
+    return df.reindex(columns=HISTORY_COLUMNS)
+
+
+def drop_consecutive_duplicates(df):
+    """
+    Drop simulator reruns: rows repeating the row directly before them.
+
+    A row is an exact duplicate when every column except ``Timestamp`` (name, inputs
+    and scores) matches the previous row and it was saved at most
+    RERUN_WINDOW_SECONDS after it. The same prediction made again later is kept.
+    """
+    if df.empty:
+        return df
+    values = df.drop(columns="Timestamp")
+    timestamps = pd.to_datetime(df["Timestamp"], format=TIMESTAMP_FORMAT)
+    within_window = timestamps.diff().dt.total_seconds().between(0, RERUN_WINDOW_SECONDS)
+    repeated = values.eq(values.shift()).all(axis=1) & within_window
+    return df[~repeated].reset_index(drop=True)
+
+
+def build_rollup(df, period):
+    """
+    Counts and mean scores per hour or day.
+
+    Returns a DataFrame with a ``Period`` timestamp column, ``Predictions`` and one
+    mean column per ROLLUP_COLUMNS entry.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=["Period", "Predictions"] + ROLLUP_COLUMNS)
+    timestamps = pd.to_datetime(df["Timestamp"], format=TIMESTAMP_FORMAT)
+    grouped = df[ROLLUP_COLUMNS].astype(float).groupby(timestamps.dt.floor(ROLLUP_PERIODS[period]))
+    rollup = grouped.mean()
+    rollup.insert(0, "Predictions", grouped.size())
+    rollup.index.name = "Period"
+    return rollup.reset_index()
+
+
+def _update_rollup(archive_dir, period, df, dates):
+    """Replace the rollup rows for ``dates`` with ones rebuilt from ``df``."""
+    path = _rollup_path(archive_dir, period)
+    fresh = build_rollup(df, period)
+    if os.path.exists(path):
+        existing = pd.read_parquet(path)
+        existing = existing[~existing["Period"].dt.strftime("%Y-%m-%d").isin(dates)]
+        fresh = pd.concat([existing, fresh], ignore_index=True) if not existing.empty else fresh
+    _write_parquet(fresh.sort_values("Period", ignore_index=True), path)
+
+
+def compact_history(csv_path=HISTORY_CSV_PATH, archive_dir=HISTORY_ARCHIVE_DIR, today=None):
+    """
+    Move every closed day out of the live CSV into its Parquet partition.
+
+    Rows dated before ``today`` are appended to that day's partition, and simulator
+    reruns (see drop_consecutive_duplicates) are dropped from partitions and from
+    the rows left in the CSV. The hourly and daily rollups are rebuilt for every day touched,
+    including the open day. The CSV and rollups are rewritten under the same lock the
+    history writer appends with, so no prediction is lost while compaction runs and
+    concurrent compactions do not overwrite each other's rollup rows.
+
+    Returns a dict with the number of rows archived, duplicates dropped, rows kept
+    in the CSV and the days compacted.
+    """
+    today = (today or date.today()).isoformat()
+    if not os.path.exists(csv_path):
+        return {"archived": 0, "duplicates": 0, "kept": 0, "days": []}
+
+    with file_lock(csv_path):
+        df = read_history_csv(csv_path)
+        day = df["Timestamp"].str[:10]
+        closed_days = sorted(d for d in day.unique() if d < today)
+
+        archived = duplicates = 0
+        day_frames = {}
+        for closed_day in closed_days:
+            rows = df[day == closed_day]
+            path = os.path.join(_partitions_dir(archive_dir), f"{closed_day}.parquet")
+            existing = pd.read_parquet(path) if os.path.exists(path) else rows.iloc[:0]
+            compacted = drop_consecutive_duplicates(pd.concat([existing, rows], ignore_index=True))
+            archived += len(compacted) - len(existing)
+            duplicates += len(existing) + len(rows) - len(compacted)
+            _write_parquet(compacted, path)
+            day_frames[closed_day] = compacted
+
+        open_rows = drop_consecutive_duplicates(df[day >= today].reset_index(drop=True))
+        duplicates += int((day >= today).sum()) - len(open_rows)
+
+        # Rewrite the live CSV with only the open rows, atomically
+        tmp_path = csv_path + ".tmp"
+        with open(tmp_path, "w", newline="") as file:
+            file.write(format_csv_rows(open_rows.to_dict("records"), include_header=True))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, csv_path)
+
+        # Still under the lock: the rollups are read, merged and rewritten, so two
+        # compactions running at once would otherwise overwrite each other's rows
+        touched = pd.concat(list(day_frames.values()) + [open_rows], ignore_index=True)
+        touched_days = sorted(set(closed_days) | set(open_rows["Timestamp"].str[:10]))
+        for period in ROLLUP_PERIODS:
+            _update_rollup(archive_dir, period, touched, touched_days)
+
+    return {"archived": archived, "duplicates": duplicates, "kept": len(open_rows), "days": closed_days}
+
+
+def load_rollup(period="daily", start=None, end=None, archive_dir=HISTORY_ARCHIVE_DIR):
+    """
+    Read the hourly or daily rollup, optionally limited to ``start <= Period < end``.
+
+    This is what long-range analytics should read: one row per hour or day,
+    regardless of how many predictions were made.
+    """
+    if period not in ROLLUP_PERIODS:
+        raise ValueError(f"period must be one of {list(ROLLUP_PERIODS)}")
+    path = _rollup_path(archive_dir, period)
+    if not os.path.exists(path):
+        return build_rollup(pd.DataFrame(columns=HISTORY_COLUMNS), period)
+
+    filters = []
+    if start is not None:
+        filters.append(("Period", ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append(("Period", "<", pd.Timestamp(end)))
+    return pd.read_parquet(path, filters=filters or None)
+
+
+def load_history(start=None, end=None, csv_path=HISTORY_CSV_PATH, archive_dir=HISTORY_ARCHIVE_DIR):
+    """
+    Row-level history between two dates (``YYYY-MM-DD``, end exclusive).
+
+    Only the partitions in range are opened; the live CSV supplies the open day.
+    """
+    frames = []
+    for path in sorted(glob.glob(os.path.join(_partitions_dir(archive_dir), "*.parquet"))):
+        partition_day = os.path.basename(path)[:10]
+        if (start is None or partition_day >= start) and (end is None or partition_day < end):
+            frames.append(pd.read_parquet(path))
+    if os.path.exists(csv_path):
+        frames.append(read_history_csv(csv_path))
+
+    if not frames:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    history = pd.concat(frames, ignore_index=True)
+    day = history["Timestamp"].str[:10]
+    in_range = pd.Series(True, index=history.index)
+    if start is not None:
+        in_range &= day >= start
+    if end is not None:
+        in_range &= day < end
+    return history[in_range].reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compact the prediction history into daily Parquet partitions.")
+    parser.add_argument('--csv', default=HISTORY_CSV_PATH, help="History CSV to compact")
+    parser.add_argument('--archive', default=HISTORY_ARCHIVE_DIR, help="Directory for partitions and rollups")
+    parser.add_argument('--today', type=date.fromisoformat, default=None,
+                        help="Treat days before this date (YYYY-MM-DD) as closed; defaults to today")
+    args = parser.parse_args(argv)
+
+    try:
+        result = compact_history(args.csv, args.archive, args.today)
+    except ImportError as e:
+        parser.error(f"Parquet support is missing ({e}); install it with: pip install pyarrow")
+
+    print(f"Archived {result['archived']:,} rows into {len(result['days'])} daily partitions, "
+          f"dropped {result['duplicates']:,} consecutive duplicates, {result['kept']:,} rows remain in {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+LifeSync Dashboard - Prediction History Log
+A single background writer that batches prediction records and appends them to the
+history files, so the Streamlit script thread never waits on disk.
+"""
+
+import atexit
+import csv
+import io
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Path configuration
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_CSV_PATH = os.path.join(PROJECT_ROOT, "outputs", "prediction_history.csv")
+RESULTS_CSV_PATH = os.path.join(PROJECT_ROOT, "predictions", "prediction_results.csv")
+
+HISTORY_COLUMNS = [
+    "Timestamp", "Name", "Age", "Gender", "Sleep Hours", "Work Hours per Week",
+    "Screen Time per Day (Hours)", "Social Interaction Score",
+    "Exercise Level", "Diet Type", "Mental Health Condition",
+    "Happiness Score", "Stress Level", "Burnout Risk"
+]
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Sidecar file used for the cross-process append lock
+LOCK_SUFFIX = ".lock"
+
+# Flush when this many records are queued or this many seconds have passed
+DEFAULT_MAX_BATCH = 50
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# A batch a destination failed to write is retried this often, keeping at most this many records
+DEFAULT_RETRY_INTERVAL = 10.0
+MAX_PENDING_RECORDS = 10000
+
+logger = logging.getLogger(__name__)
+
+
+def build_history_record(inputs, happiness_pred, stress_pred, burnout_risk, timestamp=None):
+    """Build one history record (a dict keyed by HISTORY_COLUMNS) from a prediction."""
+    timestamp = timestamp or datetime.now()
+    return {
+        "Timestamp": timestamp.strftime(TIMESTAMP_FORMAT),
+        "Name": inputs.get("Name", ""),
+        "Age": inputs["Age"],
+        "Gender": inputs["Gender"],
+        "Sleep Hours": inputs["Sleep Hours"],
+        "Work Hours per Week": inputs["Work Hours per Week"],
+        "Screen Time per Day (Hours)": inputs["Screen Time per Day (Hours)"],
+        "Social Interaction Score": inputs["Social Interaction Score"],
+        "Exercise Level": inputs["Exercise Level"],
+        "Diet Type": inputs["Diet Type"],
+        "Mental Health Condition": inputs["Mental Health Condition"],
+        "Happiness Score": happiness_pred,
+        "Stress Level": stress_pred,
+        "Burnout Risk": burnout_risk,
+    }
+
+
+def format_csv_rows(records, include_header=False):
+    """Render records as one CSV string so a whole batch goes to disk in a single write."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if include_header:
+        writer.writerow(HISTORY_COLUMNS)
+    writer.writerows([record.get(column, "") for column in HISTORY_COLUMNS] for record in records)
+    return buffer.getvalue()
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Hold an exclusive advisory lock on ``path + '.lock'`` for the duration of the block.
+
+    The lock is shared by every process that appends through this module, so two
+    Streamlit servers writing to the same outputs/ directory take turns.
+    """
+    fd = os.open(path + LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            # LK_LOCK retries for ~10s before raising, so keep retrying until acquired
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+
+def _read_at(fd, offset, length):
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, length)
+
+
+def _repair_partial_line(fd, size):
+    """
+    Drop a trailing partial row left behind by a crash mid-append; returns the new size.
+
+    Every append ends with a newline, so anything after the last newline is an
+    incomplete row. Must be called with the file lock held.
+    """
+    if size == 0 or _read_at(fd, size - 1, 1) == b"\n":
+        return size
+
+    # Walk back to the last complete line
+    position = size
+    while position > 0:
+        step = min(4096, position)
+        position -= step
+        newline = _read_at(fd, position, step).rfind(b"\n")
+        if newline != -1:
+            os.ftruncate(fd, position + newline + 1)
+            return position + newline + 1
+    os.ftruncate(fd, 0)
+    return 0
+
+
+def locked_append(path, records):
+    """
+    Append records to a history CSV under the cross-process lock.
+
+    The header is written only when the file is empty as seen under the lock, and
+    the rows go out in a single O_APPEND write followed by fsync, so concurrent
+    writers can neither duplicate the header nor interleave rows.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with file_lock(path):
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            size = _repair_partial_line(fd, os.fstat(fd).st_size)
+            data = format_csv_rows(records, include_header=size == 0).encode("utf-8")
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class CsvHistorySink:
+    """Appends batches of records to one CSV file, writing the header for a new file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def write_batch(self, records):
+        locked_append(self.path, records)
+
+
+class HistoryWriter:
+    """
+    Background writer for prediction history.
+
+    ``submit`` only puts the record on a queue. A daemon thread drains the queue
+    and hands each batch to every sink when ``max_batch`` records are waiting or
+    ``flush_interval`` seconds have passed. A sink that fails is logged on the
+    server and keeps its records, which are retried every ``retry_interval``
+    seconds and with its next batch, up to MAX_PENDING_RECORDS.
+    """
+
+    def __init__(self, sinks, max_batch=DEFAULT_MAX_BATCH, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 retry_interval=DEFAULT_RETRY_INTERVAL):
+        self.sinks = list(sinks)
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        # Records each sink has yet to write after a failure, by sink index
+        self._pending = {}
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="lifesync-history-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record):
+        """Queue one record for writing; never blocks on disk."""
+        if self._closed:
+            raise RuntimeError("History writer is closed")
+        self._queue.put(record)
+
+    def flush(self, timeout=None):
+        """Block until every record submitted so far has been written, or kept for a retry."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write any queued records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _write(self, batch):
+        for index, sink in enumerate(self.sinks):
+            records = self._pending.pop(index, []) + batch
+            if not records:
+                continue
+            try:
+                sink.write_batch(records)
+            except Exception:
+                dropped = max(len(records) - MAX_PENDING_RECORDS, 0)
+                self._pending[index] = records[dropped:]
+                logger.exception("Could not write %d history records to %s; will retry%s",
+                                 len(records), getattr(sink, 'path', sink),
+                                 f" (dropped the oldest {dropped})" if dropped else "")
+
+    def _run(self):
+        batch = []
+        waiters = []
+        deadline = None
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            if item is None:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not False:
+                batch.append(item)
+                # A pending retry must not hold back a new batch
+                flush_at = time.monotonic() + self.flush_interval
+                deadline = flush_at if deadline is None else min(deadline, flush_at)
+                if len(batch) < self.max_batch:
+                    continue
+
+            if batch or self._pending:
+                self._write(batch)
+                batch = []
+            deadline = time.monotonic() + self.retry_interval if self._pending else None
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+        for index, records in self._pending.items():
+            logger.error("History writer stopped with %d records not written to %s",
+                         len(records), getattr(self.sinks[index], 'path', self.sinks[index]))
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_history_writer():
+    """
+    Process-wide history writer for the default destinations, started on first use.
+
+    The SQLite store is added as a third destination when LIFESYNC_HISTORY_DB is set.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            sinks = [CsvHistorySink(HISTORY_CSV_PATH), CsvHistorySink(RESULTS_CSV_PATH)]
+
+            from dashboard.history_store import HistoryStore, get_history_db_path
+            db_path = get_history_db_path()
+            if db_path:
+                sinks.append(HistoryStore(db_path))
+
+            _writer = HistoryWriter(sinks)
+            atexit.register(_writer.close)
+        return _writer
+
+
+def _stress_writer(path, writer_id, records, batch_size):
+    """One stress-test process: append ``records`` uniquely named rows in batches."""
+    inputs = {
+        "Age": 30, "Gender": "Female", "Sleep Hours": 7.5, "Work Hours per Week": 40,
+        "Screen Time per Day (Hours)": 4.0, "Social Interaction Score": 6,
+        "Exercise Level": "Low", "Diet Type": "Balanced", "Mental Health Condition": "None",
+    }
+    batch = []
+    for i in range(records):
+        inputs["Name"] = f"writer-{writer_id}-{i}"
+        batch.append(build_history_record(inputs, 5.5, 4.88, 18.1))
+        if len(batch) == batch_size:
+            locked_append(path, batch)
+            batch = []
+    if batch:
+        locked_append(path, batch)
+
+
+def run_append_stress_test(path, processes=8, records=500, batch_size=1):
+    """
+    Append from many processes at once and check the resulting file.
+
+    Returns a dict with the row count, elapsed seconds and rows per second; raises
+    AssertionError if the header is missing or repeated, any row is malformed, or
+    any record is lost or duplicated.
+    """
+    import multiprocessing
+
+    if os.path.exists(path):
+        os.remove(path)
+
+    start = time.perf_counter()
+    workers = [multiprocessing.Process(target=_stress_writer, args=(path, w, records, batch_size))
+               for w in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    with open(path, newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows and rows[0] == HISTORY_COLUMNS, "header missing from first line"
+    body = rows[1:]
+    assert all(len(row) == len(HISTORY_COLUMNS) for row in body), "malformed or interleaved row"
+    names = [row[1] for row in body]
+    expected = {f"writer-{w}-{i}" for w in range(processes) for i in range(records)}
+    assert len(names) == len(expected) and set(names) == expected, "rows lost or duplicated"
+
+    return {"rows": len(body), "seconds": round(elapsed, 3), "rows_per_second": round(len(body) / elapsed)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Stress-test concurrent locked appends to a history CSV.")
+    parser.add_argument('--processes', type=int, default=8, help="Concurrent writer processes")
+    parser.add_argument('--records', type=int, default=500, help="Records appended by each process")
+    parser.add_argument('--batch-size', type=int, default=1, help="Records per locked append")
+    parser.add_argument('--path', help="CSV to write (defaults to a temporary file)")
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "stress_history.csv")
+    result = run_append_stress_test(path, args.processes, args.records, args.batch_size)
+    print(f"{result['rows']:,} rows from {args.processes} processes in {result['seconds']}s "
+          f"({result['rows_per_second']:,} rows/s): header written once, no lost, duplicated or torn rows")
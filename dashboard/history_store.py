@@ -0,0 +1,300 @@
+"""
+LifeSync Dashboard - SQLite History Store
+Optional SQLite (WAL mode) backend for prediction history. Records are inserted in
+batches by the background history writer, and per-user history and time-window
+summaries are answered from indexes instead of re-reading the CSV files.
+
+Enable it by pointing LIFESYNC_HISTORY_DB at a database file before starting the app.
+
+Usage:
+    python -m dashboard.history_store migrate
+    python -m dashboard.history_store user "Jane Doe"
+    python -m dashboard.history_store summary --period day --since 2025-06-01
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from dashboard.history_log import HISTORY_COLUMNS, HISTORY_CSV_PATH, PROJECT_ROOT
+
+HISTORY_DB_ENV = "LIFESYNC_HISTORY_DB"
+DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, "outputs", "prediction_history.db")
+
+TABLE_NAME = "prediction_history"
+
+COLUMN_TYPES = {
+    "Timestamp": "TEXT NOT NULL",
+    "Name": "TEXT NOT NULL DEFAULT ''",
+    "Age": "INTEGER",
+    "Gender": "TEXT",
+    "Sleep Hours": "REAL",
+    "Work Hours per Week": "REAL",
+    "Screen Time per Day (Hours)": "REAL",
+    "Social Interaction Score": "REAL",
+    "Exercise Level": "TEXT",
+    "Diet Type": "TEXT",
+    "Mental Health Condition": "TEXT",
+    "Happiness Score": "REAL",
+    "Stress Level": "REAL",
+    "Burnout Risk": "REAL",
+}
+
+# Older CSV headers used different names for the prediction columns
+LEGACY_COLUMN_NAMES = {
+    "Happiness Prediction": "Happiness Score",
+    "Stress Prediction": "Stress Level",
+}
+
+# Length of the Timestamp prefix that identifies each aggregation period
+PERIOD_PREFIX = {"hour": 13, "day": 10, "month": 7}
+
+SUMMARY_COLUMNS = ["Happiness Score", "Stress Level", "Burnout Risk"]
+
+# A prediction is identified by when it was made, by whom and from which inputs; the
+# unique index over these makes importing or writing the same row twice a no-op
+KEY_COLUMNS = [column for column in HISTORY_COLUMNS if column not in SUMMARY_COLUMNS]
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _sql_value(value):
+    # sqlite3 stores numpy scalars (e.g. the XGBoost float32 output) as blobs
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _parse_line(line):
+    """Fields of one CSV line read in binary mode."""
+    return next(csv.reader([line.decode("utf-8")]), [])
+
+
+def _csv_record(values, header):
+    """A history record from CSV fields, matched by header or, for the current layout, by position."""
+    columns = HISTORY_COLUMNS if len(values) == len(HISTORY_COLUMNS) else header
+    record = dict(zip(columns, values))
+    record.setdefault("Name", "")
+    return record
+
+
+def get_history_db_path():
+    """Database path from LIFESYNC_HISTORY_DB, or None when the SQLite store is disabled."""
+    return os.environ.get(HISTORY_DB_ENV) or None
+
+
+class HistoryStore:
+    """
+    Prediction history in SQLite.
+
+    Each operation opens its own short-lived connection, so one store can be shared
+    by the writer thread and the Streamlit script thread. WAL mode lets readers run
+    while a batch is being inserted.
+
+    A unique index over the second-resolution Timestamp, Name and the model inputs
+    (KEY_COLUMNS) makes inserts idempotent: a row repeating another within the same
+    second is ignored. CsvHistorySink keeps such rows, so when HistoryWriter feeds
+    both backends the SQLite store can hold fewer rows than the CSV.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _create_schema(self):
+        columns = ",\n".join(f"    {_quote(c)} {t}" for c, t in COLUMN_TYPES.items())
+        with closing(self._connect()) as connection, connection:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {TABLE_NAME} (\n"
+                               f"    id INTEGER PRIMARY KEY,\n{columns}\n)")
+            connection.execute(f'CREATE INDEX IF NOT EXISTS idx_history_timestamp ON {TABLE_NAME} ("Timestamp")')
+            connection.execute(f'CREATE INDEX IF NOT EXISTS idx_history_name ON {TABLE_NAME} ("Name", "Timestamp")')
+
+            key = ", ".join(f"IFNULL({_quote(c)}, '')" for c in KEY_COLUMNS)
+            connection.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_history_unique ON {TABLE_NAME} ({key})")
+
+            # Where each CSV import stopped: the end of the last imported row, and that row's
+            # start and Timestamp, so a rewritten file is detected rather than resumed
+            connection.execute("CREATE TABLE IF NOT EXISTS csv_import_positions (path TEXT PRIMARY KEY, "
+                               "inode INTEGER NOT NULL, offset INTEGER NOT NULL, "
+                               "last_row_offset INTEGER NOT NULL, last_timestamp TEXT NOT NULL)")
+
+    def insert_records(self, records):
+        """
+        Insert a batch of history records (dicts keyed by HISTORY_COLUMNS) in one transaction.
+
+        Records already in the store are skipped; returns the number inserted.
+        """
+        if not records:
+            return 0
+        with closing(self._connect()) as connection, connection:
+            return self._insert(connection, records)
+
+    @staticmethod
+    def _insert(connection, records):
+        placeholders = ", ".join("?" for _ in HISTORY_COLUMNS)
+        statement = (f"INSERT OR IGNORE INTO {TABLE_NAME} ({', '.join(_quote(c) for c in HISTORY_COLUMNS)}) "
+                     f"VALUES ({placeholders})")
+        rows = [[_sql_value(record.get(column)) for column in HISTORY_COLUMNS] for record in records]
+        changes = connection.total_changes
+        connection.executemany(statement, rows)
+        return connection.total_changes - changes
+
+    # Sink interface used by HistoryWriter
+    write_batch = insert_records
+
+    def import_csv(self, csv_path=HISTORY_CSV_PATH):
+        """
+        Import a history CSV, resuming after the last row imported by a previous run.
+
+        The resume position is a byte offset, trusted only while the file has the same
+        inode, is at least that long and still holds the last imported row (by
+        Timestamp) just before it. Otherwise (e.g. after compaction rewrote the CSV)
+        the whole file is read again; rows already in the store are skipped either way.
+        A final row without a newline is left for the next run, as the writer may
+        still be appending it.
+
+        Rows are matched to HISTORY_COLUMNS by header, falling back to position for
+        rows written with the current column layout under an older header.
+        Returns the number of rows inserted.
+        """
+        key = os.path.abspath(csv_path)
+        with closing(self._connect()) as connection:
+            position = connection.execute("SELECT inode, offset, last_row_offset, last_timestamp "
+                                          "FROM csv_import_positions WHERE path = ?", (key,)).fetchone()
+
+        records = []
+        with open(csv_path, "rb") as file:
+            inode = os.fstat(file.fileno()).st_ino
+            header = [LEGACY_COLUMN_NAMES.get(c, c) for c in _parse_line(file.readline())]
+            last_row = None
+            if self._can_resume(file, inode, header, position):
+                last_row = position[2:]
+                file.seek(position[1])
+            offset = file.tell()
+            while True:
+                row_offset = file.tell()
+                line = file.readline()
+                if not line.endswith(b"\n"):
+                    break
+                offset = file.tell()
+                values = _parse_line(line)
+                if values:
+                    records.append(_csv_record(values, header))
+                    last_row = (row_offset, records[-1].get("Timestamp"))
+
+        # Rows and the resume position are committed together
+        with closing(self._connect()) as connection, connection:
+            inserted = self._insert(connection, records)
+            if last_row and last_row[1]:
+                connection.execute("INSERT OR REPLACE INTO csv_import_positions "
+                                   "(path, inode, offset, last_row_offset, last_timestamp) VALUES (?, ?, ?, ?, ?)",
+                                   (key, inode, offset, *last_row))
+            else:
+                connection.execute("DELETE FROM csv_import_positions WHERE path = ?", (key,))
+        return inserted
+
+    @staticmethod
+    def _can_resume(file, inode, header, position):
+        """Whether ``file`` is still the CSV a saved import position was taken from."""
+        if position is None:
+            return False
+        saved_inode, offset, last_row_offset, last_timestamp = position
+        if inode != saved_inode or os.fstat(file.fileno()).st_size < offset:
+            return False
+        header_end = file.tell()
+        file.seek(last_row_offset)
+        values = _parse_line(file.readline())
+        matches = (file.tell() == offset and bool(values)
+                   and _csv_record(values, header).get("Timestamp") == last_timestamp)
+        file.seek(header_end)
+        return matches
+
+    def user_history(self, name, limit=None):
+        """All predictions for one user, newest first (uses the Name index)."""
+        query = f"SELECT * FROM {TABLE_NAME} WHERE \"Name\" = ? ORDER BY \"Timestamp\" DESC"
+        params = [name]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with closing(self._connect()) as connection:
+            return pd.read_sql_query(query, connection, params=params).drop(columns="id")
+
+    def window_summary(self, since=None, until=None, period="day"):
+        """
+        Prediction counts and mean scores per hour, day or month.
+
+        ``since`` and ``until`` are Timestamp strings (inclusive, exclusive); the
+        range filter is served by the Timestamp index.
+        """
+        if period not in PERIOD_PREFIX:
+            raise ValueError(f"period must be one of {list(PERIOD_PREFIX)}")
+
+        bucket = f'substr("Timestamp", 1, {PERIOD_PREFIX[period]})'
+        averages = ", ".join(f"AVG({_quote(c)}) AS {_quote(c)}" for c in SUMMARY_COLUMNS)
+        conditions, params = [], []
+        if since:
+            conditions.append('"Timestamp" >= ?')
+            params.append(since)
+        if until:
+            conditions.append('"Timestamp" < ?')
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        query = (f"SELECT {bucket} AS Period, COUNT(*) AS Predictions, {averages} "
+                 f"FROM {TABLE_NAME} {where} GROUP BY Period ORDER BY Period")
+        with closing(self._connect()) as connection:
+            return pd.read_sql_query(query, connection, params=params).round(3)
+
+    def count(self):
+        with closing(self._connect()) as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}").fetchone()[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or populate the SQLite prediction history store.")
+    parser.add_argument('--db', default=get_history_db_path() or DEFAULT_DB_PATH, help="SQLite database path")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    migrate = commands.add_parser('migrate', help="Import existing history CSVs")
+    migrate.add_argument('csv', nargs='*', default=[HISTORY_CSV_PATH], help="CSV files to import")
+
+    user = commands.add_parser('user', help="Show one user's prediction history")
+    user.add_argument('name')
+    user.add_argument('--limit', type=int, default=20)
+
+    summary = commands.add_parser('summary', help="Show predictions per time period")
+    summary.add_argument('--period', choices=list(PERIOD_PREFIX), default='day')
+    summary.add_argument('--since', help="Start timestamp, e.g. 2025-06-01")
+    summary.add_argument('--until', help="End timestamp (exclusive)")
+
+    args = parser.parse_args(argv)
+    store = HistoryStore(args.db)
+
+    pd.set_option('display.width', 200)
+    if args.command == 'migrate':
+        for path in args.csv:
+            print(f"Imported {store.import_csv(path):,} rows from {path}")
+        print(f"{store.count():,} rows in {args.db}")
+    elif args.command == 'user':
+        print(store.user_history(args.name, args.limit).to_string(index=False))
+    else:
+        print(store.window_summary(args.since, args.until, args.period).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
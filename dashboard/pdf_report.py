@@ -0,0 +1,528 @@
+"""
+LifeSync Dashboard - PDF Wellness Report
+Builds the downloadable wellness report with reportlab. Gauges and the forecast chart
+are reportlab.graphics drawings, so they are embedded as vector shapes and the report
+path needs no matplotlib and no image rasterising; reports can also be rendered on
+background worker threads.
+"""
+
+import io
+from datetime import datetime
+
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.shapes import Drawing, Group, Rect, String
+from reportlab.graphics.widgets.markers import makeMarker
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+
+from dashboard.recommendations import PRIORITY_ORDER, get_recommendation_insights
+
+# Generate PDF report with wellness predictions and recommendations
+def generate_pdf_report(inputs, happiness_pred, stress_pred, burnout_risk, happiness_forecast, stress_forecast, burnout_forecast,
+                        progress=None):
+    """
+    Create a professional PDF report with the user's wellness predictions, forecasts, and recommendations
+    
+    ``progress``, if given, is called as ``progress(fraction, message)`` as each part of the
+    report is built, so a background job can report how far along it is.
+    
+    Returns the PDF as bytes that can be used for download
+    """
+    progress = progress or (lambda fraction, message: None)
+    progress(0.05, "Preparing report layout")
+    
+    # Create a temporary buffer for the PDF
+    buffer = io.BytesIO()
+    
+    # Create the PDF document
+    doc = SimpleDocTemplate(buffer, pagesize=A4,
+                           leftMargin=72, rightMargin=72, 
+                           topMargin=72, bottomMargin=72)
+    
+    # Define styles
+    styles = getSampleStyleSheet()
+    title_style = styles["Title"]
+    heading_style = styles["Heading2"]
+    normal_style = styles["Normal"]
+    
+    # Create a custom style for recommendations
+    recommendation_style = ParagraphStyle('RecommendationStyle', 
+                                        parent=normal_style,
+                                        spaceBefore=12, 
+                                        leftIndent=20)
+    
+    # Create custom header style
+    header_style = ParagraphStyle('HeaderStyle',
+                                parent=styles['Heading1'],
+                                fontSize=16,
+                                textColor=colors.darkblue)
+    
+    # Create custom subheader style
+    subheader_style = ParagraphStyle('SubHeaderStyle',
+                                   parent=styles['Heading2'],
+                                   fontSize=14,
+                                   textColor=colors.darkblue)
+    
+    # List to hold PDF content
+    content = []
+    
+    # Add title and date
+    content.append(Paragraph(f"LifeSync Wellness Report", title_style))
+    content.append(Spacer(1, 0.25 * inch))
+    
+    # Add name and date
+    content.append(Paragraph(f"Prepared for: {inputs.get('Name', 'Anonymous')}", header_style))
+    content.append(Paragraph(f"Date: {datetime.now().strftime('%B %d, %Y')}", normal_style))
+    content.append(Spacer(1, 0.25 * inch))
+    
+    # Add executive summary
+    content.append(Paragraph("Executive Summary:", subheader_style))
+    
+    # Determine overall wellness status
+    overall_wellness = (happiness_pred + (10-stress_pred) + (100-burnout_risk)/10) / 3
+    wellness_status = "excellent" if overall_wellness > 7.5 else "good" if overall_wellness > 6 else "moderate" if overall_wellness > 4.5 else "concerning"
+    
+    # Primary areas of focus
+    focus_areas = []
+    if happiness_pred < 6:
+        focus_areas.append("happiness improvement")
+    if stress_pred > 5:
+        focus_areas.append("stress management")
+    if burnout_risk > 40:
+        focus_areas.append("burnout prevention")
+    
+    focus_text = ", ".join(focus_areas) if focus_areas else "maintenance of your current wellness"
+    
+    # Executive summary text
+    summary_text = f"""Based on the information provided, your overall wellness score is {overall_wellness:.1f}/10, 
+    which indicates a {wellness_status} wellness level. Your happiness score is {happiness_pred}/10, 
+    stress level is {stress_pred:.1f}/10, and burnout risk is {burnout_risk}%. 
+    """
+    
+    if focus_areas:
+        summary_text += f"This report focuses primarily on {focus_text}."
+    else:
+        summary_text += "You're maintaining good wellness habits - this report offers strategies to sustain your progress."
+    
+    content.append(Paragraph(summary_text, normal_style))
+    content.append(Spacer(1, 0.25 * inch))
+    
+    # Add introduction
+    content.append(Paragraph("Personal Information:", subheader_style))
+    
+    # Add personal information
+    personal_info = [
+        ["Age", str(inputs["Age"])],
+        ["Gender", inputs["Gender"]],
+        ["Country", inputs["Country"]],
+        ["Sleep Hours", f"{inputs['Sleep Hours']} hours/night"],
+        ["Work Hours", f"{inputs['Work Hours per Week']} hours/week"],
+        ["Screen Time", f"{inputs['Screen Time per Day (Hours)']} hours/day"],
+        ["Social Interaction", f"{inputs['Social Interaction Score']}/10"],
+        ["Exercise Level", inputs["Exercise Level"]],
+        ["Diet Type", inputs["Diet Type"]],
+        ["Mental Health Condition", inputs["Mental Health Condition"]]
+    ]
+    
+    # Create a table for personal info
+    t = Table(personal_info, colWidths=[2*inch, 3.5*inch])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    content.append(t)
+    
+    content.append(Spacer(1, 0.25 * inch))
+    # Add wellness scores
+    progress(0.2, "Drawing wellness gauges")
+    content.append(Paragraph("Wellness Assessment Results:", subheader_style))
+    
+    # Create progress gauges for each metric
+    happiness_gauge = create_progress_gauge(happiness_pred, 10, 150, 15)
+    stress_gauge = create_progress_gauge(stress_pred, 10, 150, 15)
+    burnout_gauge = create_progress_gauge(burnout_risk, 100, 150, 15)
+    
+    # Create a table for wellness scores with visual gauges
+    wellness_scores = [
+        ["Metric", "Score", "Visual", "Interpretation"],
+        ["Happiness Score", f"{happiness_pred}/10", happiness_gauge, get_interpretation(happiness_pred, "happiness")],
+        ["Stress Level", f"{stress_pred:.2f}/10", stress_gauge, get_interpretation(stress_pred, "stress")],
+        ["Burnout Risk", f"{burnout_risk}%", burnout_gauge, get_interpretation(burnout_risk, "burnout")]
+    ]
+      # Create a table for wellness scores with wider columns to prevent text overflow
+    t = Table(wellness_scores, colWidths=[1.2*inch, 0.8*inch, 1.5*inch, 2.5*inch])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    content.append(t)
+    
+    content.append(Spacer(1, 0.25 * inch))
+    
+    # Add forecast data
+    content.append(Paragraph("Wellness Forecast (If current patterns continue):", subheader_style))
+    
+    # Create forecast data
+    forecast_data = [["Time Period", "Happiness", "Stress", "Burnout Risk"]]
+    
+    # Get time periods (keys from the forecast dictionaries)
+    periods = list(happiness_forecast.keys())
+    
+    # Add each time period's data
+    for period in periods:
+        forecast_data.append([
+            period,
+            f"{happiness_forecast[period]}/10",
+            f"{stress_forecast[period]:.2f}/10",
+            f"{burnout_forecast[period]}%"
+        ])
+      # Create a table for forecast data
+    t = Table(forecast_data, colWidths=[1.5*inch, 1.2*inch, 1.2*inch, 1.6*inch])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]))
+    content.append(t)
+    
+    # Add visualization of forecasts
+    progress(0.4, "Charting your forecast")
+    try:
+        # Vector chart drawn with reportlab.graphics, embedded without rasterising
+        chart = create_forecast_chart(periods, happiness_forecast, stress_forecast, burnout_forecast,
+                                      6*inch, 3*inch)
+        content.append(Spacer(1, 0.25 * inch))
+        content.append(Paragraph("Wellness Forecast Visualization:", subheader_style))
+        content.append(chart)
+    except Exception as e:
+        # If plotting fails, just add a note
+        content.append(Paragraph(f"Note: Visualization could not be generated.", normal_style))
+    
+    content.append(PageBreak())
+    
+    # Add recommendations section
+    progress(0.6, "Writing recommendations")
+    content.append(Paragraph("Personalized Recommendations:", subheader_style))
+    content.append(Spacer(1, 0.1 * inch))
+    
+    # Generate recommendations
+    recommendations = get_recommendation_insights(inputs, happiness_pred, stress_pred, burnout_risk)
+    
+    # Sort recommendations by priority
+    recommendations_sorted = sorted(recommendations, key=lambda x: PRIORITY_ORDER.get(x['priority'], 3))
+    
+    # Add each recommendation
+    for i, rec in enumerate(recommendations_sorted):
+        # Add recommendation title
+        content.append(Paragraph(f"{i+1}. {rec['title']} ({rec['priority'].upper()} Priority)", subheader_style))
+        
+        # Add message
+        content.append(Paragraph(f"<i>{rec['message']}</i>", normal_style))
+        content.append(Spacer(1, 0.1 * inch))
+        
+        # Add actions
+        content.append(Paragraph("Suggested Actions:", normal_style))
+        for action in rec['actions']:
+            content.append(Paragraph(f"• {action}", recommendation_style))
+        
+        content.append(Paragraph(f"<i>Impact: {rec['impact']}</i>", normal_style))
+        content.append(Spacer(1, 0.2 * inch))
+      # Add lifestyle impact analysis
+    content.append(PageBreak())
+    content.append(Paragraph("Lifestyle Impact Analysis:", subheader_style))
+    content.append(Spacer(1, 0.1 * inch))
+    
+    # Create a lifestyle impact analysis
+    impact_text = """Below is an analysis of how specific lifestyle factors may be affecting your wellness:"""
+    content.append(Paragraph(impact_text, normal_style))
+    content.append(Spacer(1, 0.15 * inch))
+    
+    # Prepare impact factors
+    impact_factors = []
+    
+    # Sleep analysis
+    sleep_status = "optimal" if 7 <= inputs["Sleep Hours"] <= 9 else "excessive" if inputs["Sleep Hours"] > 9 else "insufficient"
+    sleep_impact = "positive" if 7 <= inputs["Sleep Hours"] <= 9 else "neutral" if inputs["Sleep Hours"] > 9 else "negative"
+    sleep_text = f"Your sleep duration ({inputs['Sleep Hours']} hours/night) is {sleep_status}, which has a {sleep_impact} impact on your wellness."
+    impact_factors.append(("Sleep Pattern", sleep_text))
+    
+    # Work hours analysis
+    work_status = "balanced" if inputs["Work Hours per Week"] <= 45 else "heavy" if inputs["Work Hours per Week"] <= 55 else "excessive"
+    work_impact = "positive" if inputs["Work Hours per Week"] <= 45 else "moderate" if inputs["Work Hours per Week"] <= 55 else "negative"
+    work_text = f"Your work schedule ({inputs['Work Hours per Week']} hours/week) is {work_status}, with a {work_impact} impact on work-life balance."
+    impact_factors.append(("Work Schedule", work_text))
+    
+    # Screen time analysis
+    screen_status = "healthy" if inputs["Screen Time per Day (Hours)"] < 4 else "moderate" if inputs["Screen Time per Day (Hours)"] < 7 else "high"
+    screen_impact = "positive" if inputs["Screen Time per Day (Hours)"] < 4 else "neutral" if inputs["Screen Time per Day (Hours)"] < 7 else "negative"
+    screen_text = f"Your screen time ({inputs['Screen Time per Day (Hours)']} hours/day) is {screen_status}, with a {screen_impact} impact on eye health and sleep quality."
+    impact_factors.append(("Screen Time", screen_text))
+    
+    # Exercise impact
+    exercise_impact = "significant positive" if inputs["Exercise Level"] == "High" else "moderate positive" if inputs["Exercise Level"] == "Moderate" else "minimal"
+    exercise_text = f"Your {inputs['Exercise Level'].lower()} exercise level has a {exercise_impact} impact on both physical and mental health."
+    impact_factors.append(("Physical Activity", exercise_text))
+    
+    # Social interaction impact
+    social_status = "strong" if inputs["Social Interaction Score"] >= 8 else "moderate" if inputs["Social Interaction Score"] >= 5 else "limited"
+    social_impact = "very positive" if inputs["Social Interaction Score"] >= 8 else "positive" if inputs["Social Interaction Score"] >= 5 else "potentially negative"
+    social_text = f"Your {social_status} social connections (score: {inputs['Social Interaction Score']}/10) have a {social_impact} impact on happiness and stress resilience."
+    impact_factors.append(("Social Connection", social_text))
+    
+    # Create a table for the impact analysis
+    impact_data = []
+    for factor, text in impact_factors:
+        impact_data.append([factor, text])
+        
+    t = Table(impact_data, colWidths=[1.5*inch, 4.5*inch])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('WORDWRAP', (1, 0), (1, -1), True),
+    ]))
+    content.append(t)
+    
+    content.append(Spacer(1, 0.25 * inch))
+    content.append(Paragraph("Key Insights:", normal_style))
+    
+    # Generate overall key insights
+    insights = []
+    
+    # Add personalized insights based on the data
+    if inputs["Sleep Hours"] < 7:
+        insights.append("Improving your sleep duration could significantly boost your happiness scores and reduce stress.")
+    
+    if inputs["Work Hours per Week"] > 50 and inputs["Screen Time per Day (Hours)"] > 6:
+        insights.append("The combination of high work hours and screen time is a significant contributor to your burnout risk.")
+    
+    if inputs["Social Interaction Score"] < 5 and happiness_pred < 6:
+        insights.append("Increasing your social connections could help improve your happiness levels.")
+    
+    if inputs["Exercise Level"] == "Low":
+        insights.append("Adding regular exercise to your routine would likely improve all aspects of your wellness metrics.")
+    
+    # Add default insight if none were generated
+    if not insights:
+        insights.append("Your lifestyle factors are generally well-balanced. Focus on maintaining these healthy habits.")
+    
+    # Add each insight as a bullet point
+    for insight in insights:
+        content.append(Paragraph(f"• {insight}", normal_style))
+    
+    # Add disclaimer
+    content.append(Spacer(1, 0.5 * inch))
+    content.append(Paragraph("Disclaimer:", subheader_style))
+    disclaimer_text = """This report provides insights for personal reflection based on the information you provided. 
+    It is not a substitute for professional medical advice. The predictions are based on statistical models 
+    and population data, which may not reflect individual variations. For serious mental health concerns, 
+    please consult a healthcare professional."""
+    
+    content.append(Paragraph(disclaimer_text, normal_style))
+      # Create footer with page numbers
+    def add_page_number(canvas, doc):
+        page_num = canvas.getPageNumber()
+        text = f"LifeSync Wellness Report - Page {page_num}"
+        canvas.setFont("Helvetica", 8)
+        canvas.setFillColor(colors.grey)
+        canvas.drawRightString(7.5*inch, 0.5*inch, text)
+        canvas.drawString(0.5*inch, 0.5*inch, f"Generated on {datetime.now().strftime('%Y-%m-%d at %H:%M')}")
+    
+    # Build PDF with page numbers
+    progress(0.8, "Assembling PDF")
+    doc.build(content, onFirstPage=add_page_number, onLaterPages=add_page_number)
+    
+    # Get PDF content
+    pdf_data = buffer.getvalue()
+    buffer.close()
+    progress(1.0, "Report ready")
+    
+    return pdf_data
+
+# Helper function for PDF report - get interpretation of scores
+def get_interpretation(score, metric_type):
+    if metric_type == "happiness":
+        if score >= 8:
+            return "Excellent - Very high happiness levels"
+        elif score >= 6:
+            return "Good - Above average happiness"
+        elif score >= 4:
+            return "Moderate - Average happiness levels"
+        elif score >= 2:
+            return "Low - May need attention"
+        else:
+            return "Very Low - Requires immediate attention"
+    elif metric_type == "stress":
+        if score <= 3:
+            return "Low - Well-managed stress levels"
+        elif score <= 6:
+            return "Moderate - Average stress levels"
+        else:
+            return "High - Elevated stress requires attention"
+    elif metric_type == "burnout":
+        if score <= 30:
+            return "Low Risk - Good work-life balance"
+        elif score <= 60:
+            return "Moderate Risk - Monitor and make adjustments"
+        else:
+            return "High Risk - Immediate attention recommended"
+
+# Helper function for PDF report - colour band for a gauge value
+def gauge_color(value, max_value):
+    if max_value == 10:  # Happiness or Stress
+        if value >= 7:
+            color = '#28a745'  # Green for good happiness
+        elif value >= 4:
+            color = '#ffc107'  # Yellow for moderate
+        else:
+            color = '#dc3545'  # Red for low happiness
+        
+        # Adjust color if this is likely stress (inverse scale)
+        if value > 5:
+            color = '#dc3545'  # Red for high stress
+        
+    else:  # Burnout (0-100 scale)
+        if value <= 30:
+            color = '#28a745'  # Green for low burnout risk
+        elif value <= 60:
+            color = '#ffc107'  # Yellow for moderate risk
+        else:
+            color = '#dc3545'  # Red for high risk
+    return color
+
+# Helper function for PDF report - create visual progress gauge
+def create_progress_gauge(value, max_value, width, height):
+    """
+    Create a visual progress gauge for PDF report metrics
+    
+    Parameters:
+    -----------
+    value : float
+        The current value to display (e.g., happiness score)
+    max_value : float
+        The maximum possible value (e.g., 10 for happiness, 100 for burnout)
+    width : int
+        Width of the gauge in points
+    height : int
+        Height of the gauge in points
+    
+    Returns:
+    --------
+    reportlab Drawing with the gauge, drawn as vector shapes
+    """
+    drawing = Drawing(width, height)
+    color = colors.HexColor(gauge_color(value, max_value))
+    
+    # Bar occupies the middle half of the height, like the old matplotlib gauge
+    bar_y = height / 4
+    bar_height = height / 2
+    progress_pct = max(min(value / max_value, 1.0), 0.0)
+    
+    # Background for unfilled portion, then the progress bar
+    drawing.add(Rect(0, bar_y, width, bar_height, fillColor=colors.HexColor('#e9ecef'),
+                     fillOpacity=0.5, strokeColor=None))
+    drawing.add(Rect(0, bar_y, width * progress_pct, bar_height, fillColor=color, strokeColor=None))
+    
+    # Add value text
+    if max_value == 100:
+        value_text = f"{value:.0f}%"
+    else:
+        value_text = f"{value:.1f}/{max_value}"
+    
+    drawing.add(String(width * progress_pct / 2, height / 2 - 2.5, value_text, textAnchor='middle',
+                       fontName='Helvetica-Bold', fontSize=7, fillColor=colors.white))
+    
+    return drawing
+
+# Helper function for PDF report - forecast trend chart
+def create_forecast_chart(periods, happiness_forecast, stress_forecast, burnout_forecast, width, height):
+    """
+    Line chart of the forecast medians as a reportlab Drawing (vector, no raster image)
+    
+    Burnout is divided by 10 so all three series share the 0-10 axis.
+    """
+    drawing = Drawing(width, height)
+    drawing.add(String(width / 2, height - 14, 'Wellness Trends Forecast', textAnchor='middle',
+                       fontName='Helvetica-Bold', fontSize=11))
+    
+    chart = HorizontalLineChart()
+    chart.x = 40
+    chart.y = 45
+    chart.width = width - 60
+    chart.height = height - 95
+    chart.data = [
+        [happiness_forecast[p] for p in periods],
+        [stress_forecast[p] for p in periods],
+        [burnout_forecast[p] / 10 for p in periods],
+    ]
+    chart.joinedLines = 1
+    
+    series_styles = [
+        ('#2ca02c', 'Circle', 'Happiness'),
+        ('#d62728', 'Square', 'Stress'),
+        ('#bcbd22', 'Triangle', 'Burnout Risk (÷10)'),
+    ]
+    for i, (hex_color, marker, _) in enumerate(series_styles):
+        chart.lines[i].strokeColor = colors.HexColor(hex_color)
+        chart.lines[i].strokeWidth = 1.5
+        chart.lines[i].symbol = makeMarker(marker, size=5, fillColor=colors.HexColor(hex_color))
+    
+    chart.categoryAxis.categoryNames = list(periods)
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontSize = 8
+    chart.categoryAxis.labels.angle = 30
+    chart.categoryAxis.labels.boxAnchor = 'ne'
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = 10
+    chart.valueAxis.valueStep = 2
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.visibleGrid = 1
+    chart.valueAxis.gridStrokeColor = colors.HexColor('#dddddd')
+    drawing.add(chart)
+    
+    # Rotated y-axis label
+    axis_label = Group(String(0, 0, 'Score', fontName='Helvetica', fontSize=8, textAnchor='middle'))
+    axis_label.translate(12, chart.y + chart.height / 2)
+    axis_label.rotate(90)
+    drawing.add(axis_label)
+    
+    legend = Legend()
+    legend.x = chart.x + chart.width - 120
+    legend.y = height - 24
+    legend.fontName = 'Helvetica'
+    legend.fontSize = 8
+    legend.alignment = 'right'
+    legend.columnMaximum = 3
+    legend.colorNamePairs = [(colors.HexColor(c), label) for c, _, label in series_styles]
+    drawing.add(legend)
+    
+    return drawing
@@ -0,0 +1,249 @@
+"""
+LifeSync Dashboard - Population Policy Simulation
+Applies a declarative lifestyle intervention (e.g. "everyone works 5 fewer hours") to
+every row of the dataset, re-scores the whole population with both models and reports
+before/after wellness deltas overall and by demographic dimension.
+
+Usage:
+    python -m dashboard.policy_simulation --intervention "Work Hours per Week -= 5"
+    python -m dashboard.policy_simulation -i "Exercise Level = High" -i "Sleep Hours += 1" --by Country Gender
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from dashboard.recommendations import recommendation_counts
+from dashboard.wellness_engine import (
+    NUMERIC_INPUT_RANGES,
+    categorical_labels,
+    compute_burnout_risk,
+    load_models,
+    predict_wellness_batch,
+)
+
+# Path configuration
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Mental_Health_Lifestyle_Dataset.csv")
+
+# Dimensions reported when --by is not given
+DEFAULT_GROUP_BY = ['Country', 'Gender', 'Exercise Level', 'Diet Type', 'Mental Health Condition']
+
+OUTCOME_COLUMNS = ['Happiness Score', 'Stress Level', 'Burnout Risk']
+
+# Rows scored per worker task
+DEFAULT_CHUNK_SIZE = 100_000
+
+# "Column op value", e.g. "Work Hours per Week -= 5" or "Exercise Level = High"
+INTERVENTION_PATTERN = re.compile(r'^\s*(?P<column>.+?)\s*(?P<op>\+=|-=|\*=|=)\s*(?P<value>.+?)\s*$')
+
+
+def parse_intervention(expression):
+    """
+    Parse one intervention expression into ``{'column', 'op', 'value'}``.
+
+    Supported operators are ``=`` (set), ``+=`` / ``-=`` (add) and ``*=`` (scale).
+    Numeric values are converted to float; ``=`` also accepts category labels.
+    """
+    match = INTERVENTION_PATTERN.match(expression)
+    if match is None:
+        raise ValueError(f"Invalid intervention: {expression!r} (expected e.g. 'Work Hours per Week -= 5')")
+
+    column, op, value = match.group('column'), match.group('op'), match.group('value')
+    if op == '=':
+        try:
+            value = float(value)
+        except ValueError:
+            pass
+        return {'column': column, 'op': 'set', 'value': value}
+
+    try:
+        value = float(value)
+    except ValueError:
+        raise ValueError(f"Operator {op} needs a numeric value: {expression!r}")
+    if op == '-=':
+        return {'column': column, 'op': 'add', 'value': -value}
+    if op == '+=':
+        return {'column': column, 'op': 'add', 'value': value}
+    return {'column': column, 'op': 'scale', 'value': value}
+
+
+def apply_intervention(df, intervention, categories=None):
+    """
+    Apply a list of intervention steps to every row, vectorised.
+
+    Categorical columns can only be set, to one of the labels the models encode
+    (``categories``, column -> labels; read from the loaded models when omitted).
+    Other columns must be numeric and take numeric values; results are clipped to
+    the simulator input ranges. Returns a new DataFrame.
+    """
+    if categories is None:
+        categories = categorical_labels(load_models()[0].feature_names_in_)
+
+    changed = df.copy()
+    for step in intervention:
+        column, op, value = step['column'], step['op'], step['value']
+        if column not in changed.columns:
+            raise ValueError(f"Unknown column in intervention: {column}")
+        if op not in ('set', 'add', 'scale'):
+            raise ValueError(f"Unknown intervention operation: {op}")
+
+        if column in categories:
+            if op != 'set' or value not in categories[column]:
+                raise ValueError(f"{column} can only be set to one of {categories[column]}")
+            changed[column] = value
+            continue
+
+        if not pd.api.types.is_numeric_dtype(changed[column]):
+            raise ValueError(f"{column} is not numeric and not a model input category, so it cannot be changed")
+        if isinstance(value, str):
+            raise ValueError(f"{column} needs a numeric value, not {value!r}")
+
+        if op == 'set':
+            changed[column] = value
+        elif op == 'add':
+            changed[column] = changed[column] + value
+        else:
+            changed[column] = changed[column] * value
+
+        if column in NUMERIC_INPUT_RANGES:
+            changed[column] = changed[column].clip(*NUMERIC_INPUT_RANGES[column])
+
+    return changed
+
+
+def _score_chunk(chunk):
+    """Score one chunk of rows; runs inside a worker process with its own model copy."""
+    happiness_model, stress_model = load_models()
+    scores = predict_wellness_batch(happiness_model, stress_model, chunk)
+    scores['Burnout Risk'] = compute_burnout_risk(chunk)
+    return scores
+
+
+def score_population(df, chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    Score every row with both models and the burnout formula.
+
+    Rows are split into chunks of ``chunk_size``; with more than one worker the chunks
+    are scored in parallel processes, each loading the models once. Returns a
+    DataFrame of OUTCOME_COLUMNS aligned with ``df``.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size)]
+
+    if workers == 1 or len(chunks) == 1:
+        results = [_score_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            results = list(executor.map(_score_chunk, chunks))
+
+    return pd.concat(results)[OUTCOME_COLUMNS]
+
+
+def summarize_policy(df, before, after, group_by=DEFAULT_GROUP_BY):
+    """
+    Aggregate before/after scores overall and per dimension in one groupby each.
+
+    Returns a dict of DataFrames: ``'Overall'`` plus one per ``group_by`` column, each
+    with row counts and the mean before, after and delta for every outcome.
+    """
+    frame = pd.DataFrame(index=df.index)
+    for column in group_by:
+        frame[column] = df[column].fillna('None')
+    for outcome in OUTCOME_COLUMNS:
+        frame[f'{outcome} Before'] = before[outcome].to_numpy()
+        frame[f'{outcome} After'] = after[outcome].to_numpy()
+        frame[f'{outcome} Delta'] = frame[f'{outcome} After'] - frame[f'{outcome} Before']
+
+    value_columns = [c for c in frame.columns if c not in group_by]
+    summary = {'Overall': frame[value_columns].mean().to_frame('All Rows').T}
+    summary['Overall'].insert(0, 'Rows', len(frame))
+
+    for column in group_by:
+        grouped = frame.groupby(column, sort=True)[value_columns].mean()
+        grouped.insert(0, 'Rows', frame.groupby(column, sort=True).size())
+        summary[column] = grouped
+
+    return {name: table.round(3) for name, table in summary.items()}
+
+
+def summarize_recommendations(df, changed, before, after):
+    """How many rows receive each recommendation before and after the intervention."""
+    counts = {}
+    for label, inputs, scores in (('Before', df, before), ('After', changed, after)):
+        frame = inputs.copy()
+        frame[OUTCOME_COLUMNS] = scores[OUTCOME_COLUMNS].to_numpy()
+        counts[label] = recommendation_counts(frame)
+
+    table = pd.DataFrame(counts)
+    table['Change'] = table['After'] - table['Before']
+    table.index.name = 'Recommendation'
+    return table
+
+
+def simulate_policy(df, intervention, group_by=DEFAULT_GROUP_BY, chunk_size=DEFAULT_CHUNK_SIZE, workers=None,
+                    include_recommendations=False):
+    """Apply ``intervention`` to ``df``, re-score before and after, and summarise."""
+    changed = apply_intervention(df, intervention)
+    scored = score_population(pd.concat([df, changed], ignore_index=True), chunk_size, workers)
+    before, after = scored.iloc[:len(df)], scored.iloc[len(df):]
+
+    summary = summarize_policy(df, before, after, group_by)
+    if include_recommendations:
+        summary['Recommendations'] = summarize_recommendations(df, changed, before, after)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate a lifestyle intervention across the whole population.")
+    parser.add_argument('-i', '--intervention', action='append', required=True,
+                        help="Intervention step, e.g. 'Work Hours per Week -= 5' (repeatable)")
+    parser.add_argument('--data', default=DATA_PATH, help="Population CSV (defaults to the LifeSync dataset)")
+    parser.add_argument('--by', nargs='+', default=DEFAULT_GROUP_BY, help="Dimensions to break results down by")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (defaults to CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per worker task")
+    parser.add_argument('--repeat', type=int, default=1, help="Replicate the population N times (for load testing)")
+    parser.add_argument('--recommendations', action='store_true',
+                        help="Also report how many people receive each recommendation before and after")
+    parser.add_argument('--output', help="Optional CSV path; one file per table with the table name appended")
+    args = parser.parse_args(argv)
+
+    try:
+        intervention = [parse_intervention(expr) for expr in args.intervention]
+    except ValueError as e:
+        parser.error(str(e))
+
+    df = pd.read_csv(args.data)
+    if args.repeat > 1:
+        df = pd.concat([df] * args.repeat, ignore_index=True)
+
+    start = time.perf_counter()
+    try:
+        summary = simulate_policy(df, intervention, args.by, args.chunk_size, args.workers, args.recommendations)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_columns', 20)
+    for name, table in summary.items():
+        print(f"\n=== {name} ===")
+        if name == 'Recommendations':
+            print(table.to_string())
+        else:
+            print(table[['Rows'] + [f'{o} Delta' for o in OUTCOME_COLUMNS]].to_string())
+        if args.output:
+            root, ext = os.path.splitext(args.output)
+            table.to_csv(f"{root}_{name.replace(' ', '_').lower()}{ext or '.csv'}")
+
+    print(f"\nScored {len(df):,} rows before and after in {elapsed:.2f}s "
+          f"({2 * len(df) / max(elapsed, 1e-9):,.0f} rows/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
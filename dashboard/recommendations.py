@@ -0,0 +1,297 @@
+"""
+LifeSync Dashboard - Recommendation Engine
+Personalized recommendations defined as a declarative rule table. Each rule's
+condition is a vectorised mask over a DataFrame of inputs and predictions, so the
+same rules serve the interactive simulator (one row) and batch scoring (thousands).
+"""
+
+import numpy as np
+import pandas as pd
+
+PRIORITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+# Rules are evaluated in order; "when" and "priority" receive the whole frame,
+# "message" receives one matching row.
+RECOMMENDATION_RULES = [
+    {
+        'category': 'Sleep Optimization',
+        'icon': 'fas fa-bed',
+        'color': 'primary',
+        'when': lambda f: f['Sleep Hours'] < 7,
+        'priority': lambda f: np.where(f['Sleep Hours'] < 6, 'high', 'medium'),
+        'title': 'Improve Sleep Quality',
+        'message': lambda r: f"Your sleep duration ({r['Sleep Hours']:.1f}h) is below optimal.",
+        'actions': [
+            "Aim for 7-9 hours of sleep per night",
+            "Create a consistent bedtime routine",
+            "Avoid screens 1 hour before bed",
+            "Keep your bedroom cool and dark"
+        ],
+        'impact': 'High impact on happiness and stress reduction'
+    },
+    {
+        'category': 'Sleep Balance',
+        'icon': 'fas fa-clock',
+        'color': 'info',
+        'when': lambda f: f['Sleep Hours'] > 9,
+        'priority': 'low',
+        'title': 'Optimize Sleep Duration',
+        'message': lambda r: f"You're getting {r['Sleep Hours']:.1f}h of sleep, which may be excessive.",
+        'actions': [
+            "Try gradually reducing sleep to 7-8 hours",
+            "Ensure sleep quality over quantity",
+            "Check for underlying health issues"
+        ],
+        'impact': 'Moderate impact on energy levels'
+    },
+    {
+        'category': 'Work-Life Balance',
+        'icon': 'fas fa-briefcase',
+        'color': 'warning',
+        'when': lambda f: f['Work Hours per Week'] > 50,
+        'priority': lambda f: np.where(f['Work Hours per Week'] > 60, 'high', 'medium'),
+        'title': 'Manage Work Hours',
+        'message': lambda r: f"High work hours ({r['Work Hours per Week']:.0f}h/week) may increase burnout risk.",
+        'actions': [
+            "Set clear work boundaries",
+            "Take regular breaks every 90 minutes",
+            "Practice saying 'no' to non-essential tasks",
+            "Consider delegating responsibilities"
+        ],
+        'impact': 'Critical for preventing burnout'
+    },
+    {
+        'category': 'Digital Wellness',
+        'icon': 'fas fa-mobile-alt',
+        'color': 'info',
+        'when': lambda f: f['Screen Time per Day (Hours)'] > 6,
+        'priority': 'medium',
+        'title': 'Reduce Screen Time',
+        'message': lambda r: f"Screen time ({r['Screen Time per Day (Hours)']:.1f}h/day) is above recommended levels.",
+        'actions': [
+            "Follow the 20-20-20 rule (every 20 min, look 20 feet away for 20 sec)",
+            "Use app timers to limit social media",
+            "Implement screen-free zones in your home",
+            "Try digital detox periods"
+        ],
+        'impact': 'Reduces eye strain and improves focus'
+    },
+    {
+        'category': 'Social Connection',
+        'icon': 'fas fa-users',
+        'color': 'success',
+        'when': lambda f: f['Social Interaction Score'] < 5,
+        'priority': 'medium',
+        'title': 'Enhance Social Connections',
+        'message': lambda r: f"Social interaction score ({r['Social Interaction Score']:.0f}/10) could be improved.",
+        'actions': [
+            "Schedule regular meetups with friends",
+            "Join clubs or groups with similar interests",
+            "Practice active listening in conversations",
+            "Consider volunteering in your community"
+        ],
+        'impact': 'Significant boost to mental health and happiness'
+    },
+    {
+        'category': 'Physical Activity',
+        'icon': 'fas fa-dumbbell',
+        'color': 'danger',
+        'when': lambda f: f['Exercise Level'] == 'Low',
+        'priority': 'high',
+        'title': 'Increase Physical Activity',
+        'message': lambda r: "Regular exercise can significantly improve mood and reduce stress levels.",
+        'actions': [
+            "Start with 15-20 minutes of walking daily",
+            "Try bodyweight exercises at home",
+            "Find an activity you enjoy (dancing, swimming, cycling)",
+            "Gradually increase intensity and duration"
+        ],
+        'impact': 'Powerful mood booster and stress reliever'
+    },
+    {
+        'category': 'Fitness Enhancement',
+        'icon': 'fas fa-running',
+        'color': 'success',
+        'when': lambda f: f['Exercise Level'] == 'Moderate',
+        'priority': 'low',
+        'title': 'Optimize Your Fitness Routine',
+        'message': lambda r: "You're doing well! Consider enhancing your routine.",
+        'actions': [
+            "Add strength training 2-3 times per week",
+            "Try high-intensity interval training (HIIT)",
+            "Include flexibility and balance exercises",
+            "Set new fitness goals to stay motivated"
+        ],
+        'impact': 'Further improvements in energy and mood'
+    },
+    {
+        'category': 'Nutrition',
+        'icon': 'fas fa-apple-alt',
+        'color': 'warning',
+        'when': lambda f: f['Diet Type'] == 'Junk Food',
+        'priority': 'high',
+        'title': 'Improve Nutrition',
+        'message': lambda r: "Diet significantly impacts mood and energy levels.",
+        'actions': [
+            "Gradually replace processed foods with whole foods",
+            "Include more fruits and vegetables",
+            "Stay hydrated with 8 glasses of water daily",
+            "Plan meals in advance to avoid impulsive choices"
+        ],
+        'impact': 'Major improvement in energy and mental clarity'
+    },
+    {
+        'category': 'Mental Health Support',
+        'icon': 'fas fa-heart',
+        'color': 'info',
+        'when': lambda f: f['Mental Health Condition'].fillna('None') != 'None',
+        'priority': 'high',
+        'title': 'Professional Support',
+        'message': lambda r: f"Managing {r['Mental Health Condition'].lower()} requires ongoing care.",
+        'actions': [
+            "Continue regular therapy or counseling sessions",
+            "Practice mindfulness and meditation",
+            "Build a strong support network",
+            "Consider stress-reduction techniques like yoga"
+        ],
+        'impact': 'Essential for long-term mental wellness'
+    },
+    {
+        'category': 'Stress Management',
+        'icon': 'fas fa-leaf',
+        'color': 'success',
+        'when': lambda f: f['Stress Level'] > 6,
+        'priority': 'high',
+        'title': 'Reduce Stress Levels',
+        'message': lambda r: "Your stress levels are elevated and need attention.",
+        'actions': [
+            "Practice deep breathing exercises",
+            "Try progressive muscle relaxation",
+            "Engage in hobbies you enjoy",
+            "Consider meditation or yoga classes"
+        ],
+        'impact': 'Immediate stress relief and better coping'
+    },
+    {
+        'category': 'Happiness Boost',
+        'icon': 'fas fa-smile',
+        'color': 'warning',
+        'when': lambda f: f['Happiness Score'] < 6,
+        'priority': 'medium',
+        'title': 'Enhance Well-being',
+        'message': lambda r: "Let's work on boosting your happiness levels.",
+        'actions': [
+            "Practice gratitude journaling",
+            "Engage in activities that bring you joy",
+            "Spend time in nature",
+            "Connect with positive, supportive people"
+        ],
+        'impact': 'Gradual improvement in overall life satisfaction'
+    },
+]
+
+# Applies to rows where no rule in RECOMMENDATION_RULES matched
+FALLBACK_RULE = {
+    'category': 'Wellness Maintenance',
+    'icon': 'fas fa-star',
+    'color': 'success',
+    'priority': 'low',
+    'title': 'Maintain Your Great Habits',
+    'message': lambda r: "Your lifestyle appears well-balanced! Keep up the excellent work.",
+    'actions': [
+        "Continue your current healthy routines",
+        "Set new wellness goals to stay motivated",
+        "Share your healthy habits with others",
+        "Regular check-ins with your wellness progress"
+    ],
+    'impact': 'Sustained long-term health and happiness'
+}
+
+
+def evaluate_recommendation_rules(frame):
+    """
+    Evaluate every rule as a vectorised mask.
+
+    Parameters:
+    -----------
+    frame : pandas.DataFrame
+        One row per person with the simulator input columns plus ``Happiness Score``,
+        ``Stress Level`` and ``Burnout Risk`` predictions
+
+    Returns:
+    --------
+    (masks, priorities): two DataFrames indexed like ``frame`` with one column per
+    category, holding whether the rule fired and its priority for that row
+    """
+    masks = {}
+    priorities = {}
+    for rule in RECOMMENDATION_RULES:
+        masks[rule['category']] = np.asarray(rule['when'](frame), dtype=bool)
+        priority = rule['priority']
+        priorities[rule['category']] = priority(frame) if callable(priority) else np.full(len(frame), priority)
+
+    masks = pd.DataFrame(masks, index=frame.index)
+    masks[FALLBACK_RULE['category']] = ~masks.any(axis=1)
+    priorities = pd.DataFrame(priorities, index=frame.index)
+    priorities[FALLBACK_RULE['category']] = FALLBACK_RULE['priority']
+
+    return masks, priorities
+
+
+def recommendations_table(frame):
+    """
+    Long-format recommendations for a whole frame: one row per (person, recommendation)
+    with the frame's index as ``row`` and the rule's category, priority, title and message.
+    """
+    masks, priorities = evaluate_recommendation_rules(frame)
+    rules = RECOMMENDATION_RULES + [FALLBACK_RULE]
+
+    parts = []
+    for order, rule in enumerate(rules):
+        category = rule['category']
+        hits = masks[category].to_numpy()
+        if not hits.any():
+            continue
+        matched = frame[hits]
+        parts.append(pd.DataFrame({
+            'row': matched.index,
+            'rule_order': order,
+            'category': category,
+            'priority': priorities.loc[hits, category].to_numpy(),
+            'title': rule['title'],
+            'message': [rule['message'](r) for _, r in matched.iterrows()],
+        }))
+
+    if not parts:
+        return pd.DataFrame(columns=['row', 'rule_order', 'category', 'priority', 'title', 'message'])
+    return pd.concat(parts, ignore_index=True).sort_values(['row', 'rule_order'], kind='stable', ignore_index=True)
+
+
+def recommendation_counts(frame):
+    """Number of rows that receive each recommendation, in rule order."""
+    masks, _ = evaluate_recommendation_rules(frame)
+    return masks.sum()
+
+
+def get_recommendation_insights(inputs, happiness, stress, burnout):
+    """Generate personalized recommendations based on predictions."""
+    row = dict(inputs, **{'Happiness Score': happiness, 'Stress Level': stress, 'Burnout Risk': burnout})
+    frame = pd.DataFrame([row])
+    table = recommendations_table(frame)
+    rules = {rule['category']: rule for rule in RECOMMENDATION_RULES + [FALLBACK_RULE]}
+
+    recommendations = []
+    for _, rec in table.iterrows():
+        rule = rules[rec['category']]
+        recommendations.append({
+            'category': rule['category'],
+            'icon': rule['icon'],
+            'color': rule['color'],
+            'priority': str(rec['priority']),
+            'title': rule['title'],
+            'message': rec['message'],
+            'actions': list(rule['actions']),
+            'impact': rule['impact']
+        })
+
+    return recommendations
@@ -0,0 +1,175 @@
+"""
+LifeSync Dashboard - Background Report Jobs
+Runs PDF report generation on a small worker pool so the Streamlit session stays
+responsive, tracks each job's status and progress by id, and keeps finished PDFs in a
+bounded on-disk cache keyed by a hash of the report's inputs and predictions.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from dashboard.history_log import PROJECT_ROOT
+
+REPORT_CACHE_DIR = os.path.join(PROJECT_ROOT, "outputs", "report_cache")
+
+# Most recently used reports kept on disk
+DEFAULT_CACHE_ENTRIES = 64
+
+DEFAULT_REPORT_WORKERS = 2
+
+# Finished jobs remembered for status lookups before the oldest are dropped
+MAX_TRACKED_JOBS = 200
+
+# Bump when the report layout changes so stale cached PDFs are not served
+REPORT_VERSION = 2
+
+
+def report_cache_key(inputs, happiness_pred, stress_pred, burnout_risk,
+                     happiness_forecast, stress_forecast, burnout_forecast):
+    """
+    Hash of everything that appears in a report.
+
+    The report is dated, so the day is part of the key; the same profile on the
+    same day is served from the cache.
+    """
+    payload = {
+        "version": REPORT_VERSION,
+        "date": date.today().isoformat(),
+        "inputs": inputs,
+        "predictions": [happiness_pred, stress_pred, burnout_risk],
+        "forecasts": [happiness_forecast, stress_forecast, burnout_forecast],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=float).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ReportCache:
+    """Finished PDFs on disk, evicting the least recently used beyond ``max_entries``."""
+
+    def __init__(self, directory=REPORT_CACHE_DIR, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        # Mark as recently used
+        os.utime(path)
+        return data
+
+    def put(self, key, data):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                if name.endswith(".pdf"):
+                    path = os.path.join(self.directory, name)
+                    try:
+                        entries.append((os.path.getmtime(path), path))
+                    except FileNotFoundError:
+                        continue
+            entries.sort()
+            for _, path in entries[:max(len(entries) - self.max_entries, 0)]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+class ReportJobManager:
+    """
+    Submits report renders to a thread pool and tracks them by job id.
+
+    A cached report completes immediately, and a request identical to one that is
+    still rendering joins that job instead of starting another.
+    """
+
+    def __init__(self, cache=None, max_workers=DEFAULT_REPORT_WORKERS):
+        self.cache = cache or ReportCache()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lifesync-report")
+        self._jobs = {}
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def submit(self, inputs, happiness_pred, stress_pred, burnout_risk,
+               happiness_forecast, stress_forecast, burnout_forecast):
+        """Start (or reuse) a report job and return its id."""
+        args = (inputs, happiness_pred, stress_pred, burnout_risk,
+                happiness_forecast, stress_forecast, burnout_forecast)
+        key = report_cache_key(*args)
+
+        with self._lock:
+            if key in self._active:
+                return self._active[key]
+
+            job_id = uuid.uuid4().hex
+            job = {"status": "queued", "progress": 0.0, "message": "Waiting for a worker",
+                   "key": key, "error": None}
+            self._jobs[job_id] = job
+            self._prune()
+
+            cached = self.cache.get(key)
+            if cached is not None:
+                job.update(status="done", progress=1.0, message="Loaded from cache", cached=True)
+                return job_id
+
+            self._active[key] = job_id
+        self._executor.submit(self._run, job_id, args)
+        return job_id
+
+    def _run(self, job_id, args):
+        # reportlab loads on the first report rather than when the simulator starts
+        from dashboard.pdf_report import generate_pdf_report
+
+        job = self._jobs[job_id]
+
+        def report_progress(fraction, message):
+            job.update(status="running", progress=fraction, message=message)
+
+        try:
+            pdf = generate_pdf_report(*args, progress=report_progress)
+            self.cache.put(job["key"], pdf)
+            job.update(status="done", progress=1.0, message="Report ready", cached=False)
+        except Exception as e:
+            job.update(status="failed", message="Report generation failed", error=str(e))
+        finally:
+            with self._lock:
+                self._active.pop(job["key"], None)
+
+    def status(self, job_id):
+        """Snapshot of a job: status, progress (0-1), message and error; None if unknown."""
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    def result(self, job_id):
+        """PDF bytes for a finished job, or None if it is not done or has been evicted."""
+        job = self._jobs.get(job_id)
+        if not job or job["status"] != "done":
+            return None
+        return self.cache.get(job["key"])
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in ("done", "failed")]
+        for job_id in finished[:max(len(self._jobs) - MAX_TRACKED_JOBS, 0)]:
+            del self._jobs[job_id]
@@ -0,0 +1,286 @@
+"""
+LifeSync Dashboard - Session Artifact Store
+Keeps large per-session results (generated PDFs, forecast bands) on disk instead of in
+st.session_state. Session state holds only a short handle; artifacts that have not been
+read for the TTL are evicted, so memory stays flat no matter how many sessions connect.
+
+Usage:
+    python -m dashboard.session_artifacts
+    python -m dashboard.session_artifacts --purge
+"""
+
+import argparse
+import os
+import pickle
+import shutil
+import sys
+import threading
+import time
+import uuid
+
+from dashboard.history_log import PROJECT_ROOT
+
+SESSION_ARTIFACT_DIR = os.path.join(PROJECT_ROOT, "outputs", "session_artifacts")
+
+# Artifacts not read for this long are evicted
+DEFAULT_TTL_SECONDS = 60 * 60
+
+# Expired artifacts are swept at most this often, on the next write
+PURGE_INTERVAL_SECONDS = 60
+
+# A session's state is re-measured at most this often; pickling all of it on every
+# rerun would cost more than the memory it reports
+STATE_SAMPLE_INTERVAL_SECONDS = 60
+
+# Times put recreates a session directory that a concurrent purge removed
+PUT_ATTEMPTS = 3
+
+# Raw bytes are stored as-is; anything else is pickled
+BYTES_SUFFIX = ".bin"
+PICKLE_SUFFIX = ".pkl"
+
+
+def new_session_id():
+    """Opaque id for one browser session's artifacts."""
+    return uuid.uuid4().hex
+
+
+def state_footprint(state):
+    """
+    Approximate size in bytes of each value in a session state mapping.
+
+    Values are measured by their pickled size, which tracks the memory held for
+    containers, DataFrames and bytes far better than ``sys.getsizeof``.
+    """
+    sizes = {}
+    for key, value in dict(state).items():
+        try:
+            sizes[key] = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            sizes[key] = sys.getsizeof(value)
+    return sizes
+
+
+class SessionArtifactStore:
+    """
+    Per-session blobs on disk with last-read TTL eviction.
+
+    ``put`` returns a handle (``"<session>/<name>"``) to keep in session state;
+    writing the same name again replaces the artifact. ``get`` returns None once an
+    artifact has expired, so callers fall back to regenerating it.
+    """
+
+    def __init__(self, directory=SESSION_ARTIFACT_DIR, ttl=DEFAULT_TTL_SECONDS):
+        self.directory = directory
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._state_bytes = {}
+
+    def _paths(self, handle):
+        base = os.path.join(self.directory, *handle.split("/", 1))
+        return [base + BYTES_SUFFIX, base + PICKLE_SUFFIX]
+
+    def put(self, session_id, name, value):
+        """Store ``value`` for a session and return its handle."""
+        handle = f"{session_id}/{name}"
+        is_bytes = isinstance(value, (bytes, bytearray))
+        data = bytes(value) if is_bytes else pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        raw_path, pickle_path = self._paths(handle)
+        path, stale_path = (raw_path, pickle_path) if is_bytes else (pickle_path, raw_path)
+
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        for attempt in range(PUT_ATTEMPTS):
+            # A concurrent purge may remove the (empty) session directory after makedirs
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                with open(tmp_path, "wb") as file:
+                    file.write(data)
+                os.replace(tmp_path, path)
+                break
+            except FileNotFoundError:
+                if attempt == PUT_ATTEMPTS - 1:
+                    raise
+        try:
+            os.remove(stale_path)
+        except FileNotFoundError:
+            pass
+
+        if time.time() - self._last_purge > PURGE_INTERVAL_SECONDS:
+            self.purge_expired()
+        return handle
+
+    def put_file(self, session_id, name, source_path):
+        """
+        Move a finished file into the store as a raw-bytes artifact and return its handle.
+
+        The file is renamed into place (copied only across filesystems), so a large
+        artifact such as a ZIP archive is never read into memory.
+        """
+        handle = f"{session_id}/{name}"
+        path, stale_path = self._paths(handle)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        for attempt in range(PUT_ATTEMPTS):
+            # A concurrent purge may remove the (empty) session directory after makedirs
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                shutil.move(source_path, tmp_path)
+                os.replace(tmp_path, path)
+                break
+            except FileNotFoundError:
+                if attempt == PUT_ATTEMPTS - 1 or not os.path.exists(source_path):
+                    raise
+        try:
+            os.remove(stale_path)
+        except FileNotFoundError:
+            pass
+
+        if time.time() - self._last_purge > PURGE_INTERVAL_SECONDS:
+            self.purge_expired()
+        return handle
+
+    def get(self, handle):
+        """The stored value, or None if the handle is unset, expired or evicted."""
+        if not handle:
+            return None
+        for path in self._paths(handle):
+            try:
+                if time.time() - os.path.getmtime(path) > self.ttl:
+                    return None
+                with open(path, "rb") as file:
+                    data = file.read()
+            except FileNotFoundError:
+                continue
+            # Reading an artifact keeps it alive for another TTL
+            os.utime(path)
+            return data if path.endswith(BYTES_SUFFIX) else pickle.loads(data)
+        return None
+
+    def touch(self, handle):
+        """
+        Whether an artifact is stored and unexpired, without reading it.
+
+        An unexpired artifact is kept alive for another TTL, so a result still offered
+        for download does not expire while it is on screen.
+        """
+        if not handle:
+            return False
+        for path in self._paths(handle):
+            try:
+                if time.time() - os.path.getmtime(path) > self.ttl:
+                    return False
+                os.utime(path)
+                return True
+            except FileNotFoundError:
+                continue
+        return False
+
+    def delete(self, handle):
+        if not handle:
+            return
+        for path in self._paths(handle):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def record_state_size(self, session_id, state):
+        """
+        Remember how much a session keeps in memory, for ``usage``.
+
+        Each session's state is measured at most once per ``STATE_SAMPLE_INTERVAL_SECONDS``;
+        calls in between keep the last measurement.
+        """
+        previous = self._state_bytes.get(session_id)
+        if previous and time.time() - previous[1] < STATE_SAMPLE_INTERVAL_SECONDS:
+            return
+        self._state_bytes[session_id] = (sum(state_footprint(state).values()), time.time())
+
+    def purge_expired(self):
+        """Remove artifacts unread for longer than the TTL; returns how many were removed."""
+        with self._lock:
+            self._last_purge = time.time()
+            if not os.path.isdir(self.directory):
+                return 0
+            removed = 0
+            cutoff = time.time() - self.ttl
+            for session_id, (_, recorded) in list(self._state_bytes.items()):
+                if recorded < cutoff:
+                    del self._state_bytes[session_id]
+            for session_id in os.listdir(self.directory):
+                session_dir = os.path.join(self.directory, session_id)
+                try:
+                    names = os.listdir(session_dir)
+                except FileNotFoundError:
+                    continue
+                for name in names:
+                    path = os.path.join(session_dir, name)
+                    try:
+                        if os.path.getmtime(path) < cutoff:
+                            os.remove(path)
+                            removed += 1
+                    except FileNotFoundError:
+                        continue
+                # rmdir only succeeds on an empty directory, so an artifact written since the
+                # listing above is never removed with it
+                try:
+                    os.rmdir(session_dir)
+                except OSError:
+                    pass
+            return removed
+
+    def _directory_usage(self, session_id):
+        """Artifact count and bytes on disk of one session's directory."""
+        sizes = []
+        try:
+            entries = list(os.scandir(os.path.join(self.directory, session_id)))
+        except (FileNotFoundError, NotADirectoryError):
+            entries = []
+        for entry in entries:
+            try:
+                sizes.append(entry.stat().st_size)
+            except FileNotFoundError:
+                continue
+        return len(sizes), sum(sizes)
+
+    def session_usage(self, session_id):
+        """Artifact count, bytes on disk and last recorded session state bytes for one session."""
+        artifacts, disk_bytes = self._directory_usage(session_id)
+        state = self._state_bytes.get(session_id)
+        return {"artifacts": artifacts, "disk_bytes": disk_bytes, "state_bytes": state[0] if state else 0}
+
+    def usage(self):
+        """Per-session artifact count, bytes spilled to disk and bytes held in session state."""
+        state_bytes = {session_id: size for session_id, (size, _) in list(self._state_bytes.items())}
+        report = {}
+        if os.path.isdir(self.directory):
+            for session_id in os.listdir(self.directory):
+                artifacts, disk_bytes = self._directory_usage(session_id)
+                report[session_id] = {"artifacts": artifacts, "disk_bytes": disk_bytes,
+                                      "state_bytes": state_bytes.get(session_id, 0)}
+        for session_id, size in state_bytes.items():
+            report.setdefault(session_id, {"artifacts": 0, "disk_bytes": 0, "state_bytes": size})
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report or purge spilled session artifacts.")
+    parser.add_argument('--dir', default=SESSION_ARTIFACT_DIR, help="Artifact directory")
+    parser.add_argument('--ttl', type=int, default=DEFAULT_TTL_SECONDS, help="Seconds an unread artifact is kept")
+    parser.add_argument('--purge', action='store_true', help="Remove expired artifacts before reporting")
+    args = parser.parse_args(argv)
+
+    store = SessionArtifactStore(args.dir, args.ttl)
+    if args.purge:
+        print(f"Removed {store.purge_expired():,} expired artifacts")
+
+    usage = store.usage()
+    for session_id, entry in sorted(usage.items(), key=lambda item: -item[1]["disk_bytes"]):
+        print(f"{session_id}  {entry['artifacts']:>3} artifacts  {entry['disk_bytes'] / 1024:>9.1f} KB")
+    total = sum(entry["disk_bytes"] for entry in usage.values())
+    print(f"{len(usage):,} sessions, {total / 1024:,.1f} KB on disk")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
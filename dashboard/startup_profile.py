@@ -0,0 +1,114 @@
+"""
+LifeSync Dashboard - Startup Import Profile
+Imports each app module in a fresh interpreter under ``python -X importtime`` and checks
+it against a time budget and a list of heavy packages that must only load on first use
+(the correlation heatmap, PDF reports, the models). Exits non-zero when a budget is
+exceeded, so it can run in CI to catch startup regressions.
+
+Usage:
+    python -m dashboard.startup_profile
+    python -m dashboard.startup_profile --top 15 --repeat 5
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+from dashboard.history_log import PROJECT_ROOT
+
+# Module imported when each tab is first opened, and its cumulative import budget
+STARTUP_ENTRIES = {
+    "dashboard": "dashboard.app_dashboard",
+    "simulator": "dashboard.app_simulator",
+}
+
+STARTUP_BUDGET_MS = {
+    "dashboard": 3000,
+    "simulator": 3000,
+}
+
+# Packages that must not be imported while a tab module loads
+DEFERRED_PACKAGES = ["shap", "seaborn", "scipy", "reportlab", "xgboost", "sklearn"]
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(output):
+    """
+    Parse ``-X importtime`` output into ``(module, self_us, cumulative_us, depth)`` tuples.
+
+    Lines come in completion order, so a module's dependencies precede it.
+    """
+    entries = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def profile_import(module, repeat=3):
+    """
+    Import ``module`` in ``repeat`` fresh interpreters and keep the fastest run.
+
+    Returns the parsed entries of that run; the first run also warms the bytecode
+    cache, so the minimum is the steady-state cold-start cost.
+    """
+    best = None
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    for _ in range(max(repeat, 1)):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                   cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+        entries = parse_importtime(completed.stderr)
+        total = next(cumulative for name, _, cumulative, _ in entries if name == module)
+        if best is None or total < best[0]:
+            best = (total, entries)
+    return best[1]
+
+
+def check_entry(name, module, repeat=3, top=10):
+    """
+    Profile one tab module.
+
+    Returns a dict with the total import time (ms), the budget, the heaviest direct
+    imports as ``(module, ms)`` pairs and any deferred packages that were imported.
+    """
+    entries = profile_import(module, repeat)
+    by_name = {entry[0]: entry for entry in entries}
+    _, _, total_us, depth = by_name[module]
+    heaviest = sorted(((n, c / 1000) for n, _, c, d in entries if d == depth + 1),
+                      key=lambda item: -item[1])[:top]
+    loaded = sorted({n.split(".")[0] for n in by_name} & set(DEFERRED_PACKAGES))
+    return {"total_ms": total_us / 1000, "budget_ms": STARTUP_BUDGET_MS[name],
+            "heaviest": heaviest, "deferred_loaded": loaded}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check each app tab's import time against its startup budget.")
+    parser.add_argument('--entry', choices=list(STARTUP_ENTRIES), action='append',
+                        help="Tab to profile (repeatable; defaults to all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Fresh interpreters per tab; the fastest counts")
+    parser.add_argument('--top', type=int, default=10, help="Heaviest direct imports to list")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name in args.entry or list(STARTUP_ENTRIES):
+        result = check_entry(name, STARTUP_ENTRIES[name], args.repeat, args.top)
+        over_budget = result["total_ms"] > result["budget_ms"]
+        status = "OVER BUDGET" if over_budget or result["deferred_loaded"] else "ok"
+        print(f"{name}: {result['total_ms']:,.0f} ms (budget {result['budget_ms']:,} ms) {status}")
+        for module, ms in result["heaviest"]:
+            print(f"    {ms:>8,.1f} ms  {module}")
+        if result["deferred_loaded"]:
+            print(f"    loaded at startup but should load on first use: {', '.join(result['deferred_loaded'])}")
+        failed = failed or status != "ok"
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
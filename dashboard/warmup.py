@@ -0,0 +1,318 @@
+"""
+LifeSync Dashboard - Cache Warm-up
+Builds everything the first visitor would otherwise wait for (the parsed dataset and its
+column catalog, feature importance table, SHAP images, forecast volatility and the
+default dashboard view) and persists it under outputs/warm_cache/. The app reads these
+artifacts on a cold start instead of recomputing them, and writes any it had to build.
+
+The default view is the unfiltered dashboard most visitors see: every chart PNG, the
+overview KPIs, the correlation highlights and the insight cards, stored as one payload
+that the dashboard serves as-is until a filter changes.
+
+Artifacts are stored per version: a fingerprint of the dataset, model and image files,
+the code that builds them and the Python and library versions, so a new dataset,
+retrained model, chart change or upgrade never serves stale results. Run the warm-up
+after each deploy, before serving; it also removes the directories of older versions.
+Set LIFESYNC_WARM_CACHE_DIR to keep the cache somewhere other than outputs/warm_cache/.
+
+Usage:
+    python -m dashboard.warmup
+    python -m dashboard.warmup --clear
+"""
+
+import argparse
+import hashlib
+import importlib.metadata
+import os
+import pickle
+import shutil
+import sys
+import threading
+import time
+import uuid
+
+from dashboard.column_catalog import build_column_catalog
+from dashboard.dashboard_charts import (
+    DATASET_CHARTS,
+    DATA_PATH,
+    DISTRIBUTION_CHARTS,
+    FEATURE_IMPORTANCE_CHARTS,
+    MODELS_PATH,
+    SHAP_IMAGE_FILES,
+    default_filters,
+    read_dataset,
+    read_feature_importance,
+    read_shap_images,
+    render_chart,
+    render_feature_importance_chart,
+)
+from dashboard.dashboard_insights import build_insights, correlation_highlights, overview_metrics
+from dashboard.dataset_export import export_bytes
+from dashboard.history_log import PROJECT_ROOT
+from dashboard.wellness_engine import estimate_residual_volatility, load_models
+
+WARM_CACHE_DIR_ENV = "LIFESYNC_WARM_CACHE_DIR"
+WARM_CACHE_DIR = os.path.join(PROJECT_ROOT, "outputs", "warm_cache")
+
+# Inputs whose changes invalidate the cached artifacts
+VERSION_SOURCES = [
+    DATA_PATH,
+    os.path.join(MODELS_PATH, "lifesync_happiness_model.pkl"),
+    os.path.join(MODELS_PATH, "lifesync_stress_model.pkl"),
+    os.path.join(MODELS_PATH, "feature_importance.csv"),
+    *(os.path.join(MODELS_PATH, filename) for filename in SHAP_IMAGE_FILES.values()),
+]
+# Set to 1 to unpickle the models in the background when the server starts, rather than
+# when the simulator first needs them; off by default so dashboard-only servers skip it
+PRELOAD_MODELS_ENV = "LIFESYNC_PRELOAD_MODELS"
+
+VERSION_CODE = ["column_catalog.py", "dashboard_charts.py", "dashboard_insights.py", "dataset_export.py", "wellness_engine.py", "warmup.py"]
+# Pickled frames and rendered charts depend on these, so an upgrade starts a new version
+VERSION_LIBRARIES = ["numpy", "pandas", "matplotlib", "seaborn", "pyarrow", "scikit-learn", "xgboost"]
+
+_MISSING = object()
+
+
+def _library_version(name):
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "missing"
+
+
+def get_warm_cache_dir():
+    """Warm cache directory from LIFESYNC_WARM_CACHE_DIR, or outputs/warm_cache/."""
+    return os.environ.get(WARM_CACHE_DIR_ENV) or WARM_CACHE_DIR
+
+
+def artifact_version():
+    """
+    Fingerprint of the data and model files (size and mtime), the code that builds
+    artifacts and the Python and VERSION_LIBRARIES versions.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"python:{sys.version}\n".encode("utf-8"))
+    for name in VERSION_LIBRARIES:
+        digest.update(f"{name}:{_library_version(name)}\n".encode("utf-8"))
+    for path in VERSION_SOURCES:
+        try:
+            stat = os.stat(path)
+            digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+        except FileNotFoundError:
+            digest.update(f"{os.path.basename(path)}:missing\n".encode("utf-8"))
+    for filename in VERSION_CODE:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), filename), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+class WarmCache:
+    """
+    Pickled artifacts under ``<directory>/<version>/``.
+
+    An artifact that cannot be unpickled counts as a miss and is rebuilt. Older
+    versions are left in place, since another checkout or a server still running
+    the previous deploy may share the directory; the warm-up command removes them.
+    """
+
+    def __init__(self, directory=None, version=None):
+        self.directory = directory or get_warm_cache_dir()
+        self.version = version or artifact_version()
+        self.version_dir = os.path.join(directory, self.version)
+
+    def _path(self, name):
+        return os.path.join(self.version_dir, f"{name}.pkl")
+
+    def get(self, name, default=None):
+        try:
+            file = open(self._path(name), "rb")
+        except FileNotFoundError:
+            return default
+        with file:
+            try:
+                return pickle.load(file)
+            except Exception:
+                # Truncated, or written under library versions that no longer load it
+                return default
+
+    def put(self, name, value):
+        os.makedirs(self.version_dir, exist_ok=True)
+        path = self._path(name)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def get_or_build(self, name, build):
+        """The cached artifact, or ``build()``'s result after persisting it."""
+        value = self.get(name, _MISSING)
+        if value is _MISSING:
+            value = build()
+            self.put(name, value)
+        return value
+
+    def names(self):
+        if not os.path.isdir(self.version_dir):
+            return []
+        return sorted(name[:-len(".pkl")] for name in os.listdir(self.version_dir) if name.endswith(".pkl"))
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def remove_old_versions(self):
+        """Remove the directories of every other version."""
+        for name in os.listdir(self.directory):
+            if name != self.version:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+_warm_cache = None
+
+
+def get_warm_cache():
+    """Process-wide cache for the current artifact version."""
+    global _warm_cache
+    if _warm_cache is None:
+        _warm_cache = WarmCache()
+    return _warm_cache
+
+
+def warm_artifact(name, build):
+    """Load ``name`` from the warm cache, building and persisting it on a miss."""
+    return get_warm_cache().get_or_build(name, build)
+
+
+def load_dataset():
+    """The dataset with derived columns, from the warm cache when built."""
+    return warm_artifact("dataset", read_dataset)
+
+
+def load_column_catalog():
+    """Dtypes, distinct values, ranges and quantiles of the dataset's columns, from the warm cache when built."""
+    return warm_artifact("column_catalog", lambda: build_column_catalog(load_dataset()))
+
+
+def load_dataset_export(fmt):
+    """The full dataset serialised as ``fmt`` (see dataset_export.EXPORT_FORMATS), built on first use."""
+    return warm_artifact(f"export-{fmt}", lambda: export_bytes(load_dataset(), fmt))
+
+
+def build_default_view(df, catalog, feature_importance):
+    """
+    Everything the unfiltered dashboard shows that is derived from the data.
+
+    Returns a dict with the ``filters`` it was built for, the overview ``metrics``,
+    the ``correlation`` highlights, the ``insights`` cards and ``figures`` (chart name
+    to PNG bytes, None for a feature importance chart whose column is missing).
+    """
+    figures = {name: render_chart(name, df, catalog) for name in [*DISTRIBUTION_CHARTS, *DATASET_CHARTS]}
+    for name in FEATURE_IMPORTANCE_CHARTS:
+        figures[name] = render_feature_importance_chart(name, feature_importance)
+    return {
+        "filters": default_filters(catalog),
+        "metrics": overview_metrics(catalog, df),
+        "correlation": correlation_highlights(df),
+        "insights": build_insights(catalog, df),
+        "figures": figures,
+    }
+
+
+def load_default_view():
+    """The default dashboard view payload, from the warm cache when built."""
+    return warm_artifact("default_view",
+                         lambda: build_default_view(load_dataset(), load_column_catalog(),
+                                                    warm_artifact("feature_importance", read_feature_importance)))
+
+
+def load_forecast_volatility(happiness_model, stress_model):
+    """Residual volatility of the models against the dataset, from the warm cache when built."""
+    return warm_artifact("forecast_volatility",
+                         lambda: estimate_residual_volatility(happiness_model, stress_model, load_dataset()))
+
+
+def run_warmup(cache=None, report=print):
+    """
+    Rebuild every artifact into ``cache`` (the process-wide cache by default) and
+    load the models once.
+
+    Returns a dict of stage name to seconds taken.
+    """
+    cache = cache or get_warm_cache()
+    timings = {}
+
+    def stage(name, build):
+        start = time.perf_counter()
+        result = build()
+        timings[name] = time.perf_counter() - start
+        report(f"{name:<20} {timings[name]:>7.2f}s")
+        return result
+
+    def rebuild(name, build):
+        value = build()
+        cache.put(name, value)
+        return value
+
+    df = stage("dataset", lambda: rebuild("dataset", read_dataset))
+    catalog = stage("column_catalog", lambda: rebuild("column_catalog", lambda: build_column_catalog(df)))
+    feature_importance = stage("feature_importance", lambda: rebuild("feature_importance", read_feature_importance))
+    stage("shap_images", lambda: rebuild("shap_images", read_shap_images))
+    happiness_model, stress_model = stage("models", load_models)
+    stage("forecast_volatility", lambda: rebuild(
+        "forecast_volatility", lambda: estimate_residual_volatility(happiness_model, stress_model, df)))
+    stage("default_view", lambda: rebuild("default_view", lambda: build_default_view(df, catalog, feature_importance)))
+    return timings
+
+
+_background_warmup = None
+_background_lock = threading.Lock()
+
+
+def start_background_warmup():
+    """
+    Load the models on a daemon thread, once per server process, when
+    ``LIFESYNC_PRELOAD_MODELS`` is set.
+
+    Unpickled models cannot be shared through the disk cache, so a server that
+    mostly serves predictions can start loading them as soon as the first script
+    run begins rather than when the first prediction needs them. Returns the
+    thread, or None when preloading is off.
+    """
+    global _background_warmup
+    if os.environ.get(PRELOAD_MODELS_ENV, "").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    with _background_lock:
+        if _background_warmup is None:
+            def load():
+                try:
+                    load_models()
+                except Exception:
+                    # The simulator reports missing models when it needs them
+                    pass
+
+            _background_warmup = threading.Thread(target=load, name="lifesync-warmup", daemon=True)
+            _background_warmup.start()
+    return _background_warmup
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-build the dashboard's cached artifacts before serving.")
+    parser.add_argument('--dir', default=get_warm_cache_dir(),
+                        help=f"Warm cache directory; defaults to ${WARM_CACHE_DIR_ENV}, which the server "
+                             f"reads too, or outputs/warm_cache")
+    parser.add_argument('--clear', action='store_true', help="Remove every cached version first")
+    args = parser.parse_args(argv)
+
+    cache = WarmCache(args.dir)
+    if args.clear:
+        cache.clear()
+
+    start = time.perf_counter()
+    run_warmup(cache)
+    cache.remove_old_versions()
+    print(f"Warmed {len(cache.names())} artifacts for version {cache.version} "
+          f"in {time.perf_counter() - start:.1f}s ({cache.version_dir})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
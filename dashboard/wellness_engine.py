@@ -0,0 +1,464 @@
+"""
+LifeSync Dashboard - Wellness Engine
+Vectorised preprocessing and scoring shared by the simulator and the batch tools.
+Everything here works on whole DataFrames so that many profiles can be scored in a
+single model call instead of one row at a time.
+"""
+
+import os
+import zlib
+from functools import lru_cache
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Path configuration
+MODELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs")
+
+EXERCISE_MAPPING = {'Low': 1, 'Moderate': 2, 'High': 3}
+
+# One-hot encoded feature prefixes and the raw input column each one comes from
+CATEGORICAL_PREFIXES = {
+    'Gender_': 'Gender',
+    'Diet_': 'Diet Type',
+    'MH_': 'Mental Health Condition',
+    'Country_': 'Country',
+}
+
+# Reference labels: encoded as all zeros rather than with a one-hot feature of their own
+CATEGORICAL_REFERENCE_LABELS = {
+    'Mental Health Condition': ['None'],
+}
+
+# Country used when the user's country was not seen during training
+DEFAULT_COUNTRY = 'USA'
+
+# Continuous inputs used by preprocess_inputs, with the simulator slider ranges
+NUMERIC_INPUT_RANGES = {
+    'Age': (18, 80),
+    'Sleep Hours': (3.0, 12.0),
+    'Work Hours per Week': (0, 80),
+    'Screen Time per Day (Hours)': (0.0, 16.0),
+    'Social Interaction Score': (1, 10),
+}
+
+# Forecast checkpoints (label -> days ahead) shown in the simulator and PDF report
+FORECAST_HORIZONS = {"Current": 0, "3 Days": 3, "1 Week": 7, "1 Month": 30, "3 Months": 90}
+
+# Expected drift at each checkpoint if current patterns continue
+FORECAST_DRIFT = {
+    'happiness': [0.0, -0.048, -0.12, -0.30, -0.60],
+    'stress': [0.0, 0.10, 0.20, 0.40, 0.70],
+    'burnout': [0.0, 2.0, 3.6, 9.0, 16.0],
+}
+
+# Out-of-sample RMSE from training (outputs/model_summary.txt), stress on the 0-10 scale.
+# Used when residuals can't be measured against the dataset.
+DEFAULT_FORECAST_VOLATILITY = {'happiness': 2.5971, 'stress': 4.063}
+
+# Burnout has no model of its own; it moves with stress shocks at this ratio
+BURNOUT_STRESS_COUPLING = 2.5
+
+FORECAST_PERCENTILES = (10, 25, 50, 75, 90)
+
+STRESS_LEVEL_MAPPING = {'Low': 1, 'Moderate': 2, 'High': 3}
+
+# Burnout risk formula weights: (input column, weight, value the input is subtracted from)
+BURNOUT_WEIGHTS = [
+    ('Work Hours per Week', 0.4, None),
+    ('Screen Time per Day (Hours)', 0.25, None),
+    ('Sleep Hours', 0.2, 10),
+    ('Social Interaction Score', 0.15, 10),
+]
+
+# Burnout bands used by the simulator card: upper bound (exclusive) and label
+BURNOUT_RISK_BANDS = [(40, 'Low Risk'), (60, 'Moderate Risk'), (np.inf, 'High Risk')]
+
+DIET_TYPES = ["Balanced", "Vegetarian", "Vegan", "Keto", "Junk Food"]
+
+# Lifestyle inputs the counterfactual search may change: search step, largest change
+# from the user's value and the cost of moving one unit
+CONTROLLABLE_INPUTS = {
+    'Sleep Hours': {'step': 0.5, 'max_change': 3.0, 'cost': 1.0},
+    'Work Hours per Week': {'step': 5, 'max_change': 25, 'cost': 0.1},
+    'Screen Time per Day (Hours)': {'step': 1.0, 'max_change': 6.0, 'cost': 0.5},
+    'Social Interaction Score': {'step': 1, 'max_change': 4, 'cost': 0.5},
+}
+
+# Cost of moving one exercise level, and of switching diet
+EXERCISE_CHANGE_COST = 1.0
+DIET_CHANGE_COST = 1.5
+
+# Target metrics for the counterfactual search and the direction that counts as success
+TARGET_METRICS = {'Happiness Score': 'min', 'Stress Level': 'max', 'Burnout Risk': 'max'}
+
+
+@lru_cache(maxsize=None)
+def load_models(models_path=MODELS_PATH):
+    """Load the trained happiness and stress models once per process."""
+    happiness_model = joblib.load(os.path.join(models_path, "lifesync_happiness_model.pkl"))
+    stress_model = joblib.load(os.path.join(models_path, "lifesync_stress_model.pkl"))
+    return happiness_model, stress_model
+
+
+def expand_profile(inputs, n_rows):
+    """Repeat one inputs dict into an ``n_rows`` DataFrame."""
+    return pd.DataFrame({key: [value] * n_rows for key, value in inputs.items()})
+
+
+def compute_burnout_risk(inputs):
+    """
+    Burnout risk percentage (0-100, 1 decimal) from work hours, screen time, sleep
+    deficit and social deficit.
+
+    Accepts a DataFrame (returns a Series) or a single inputs dict (returns a scalar).
+    """
+    risk = 0
+    for column, weight, offset in BURNOUT_WEIGHTS:
+        value = inputs[column]
+        risk = risk + weight * (value if offset is None else offset - value)
+    return np.round(np.clip(risk, 0, 100), 1)
+
+
+def classify_burnout_risk(burnout_risk):
+    """Label each burnout percentage with its BURNOUT_RISK_BANDS band."""
+    edges = [-np.inf] + [upper for upper, _ in BURNOUT_RISK_BANDS]
+    labels = [label for _, label in BURNOUT_RISK_BANDS]
+    return pd.cut(burnout_risk, bins=edges, labels=labels, right=False)
+
+
+def preprocess_inputs_batch(inputs_df, feature_names):
+    """
+    Encode a DataFrame of raw simulator inputs into the model feature matrix.
+
+    Parameters:
+    -----------
+    inputs_df : pandas.DataFrame
+        One row per profile, using the same columns as the simulator inputs dict
+    feature_names : sequence of str
+        Feature order expected by the models (``model.feature_names_in_``)
+
+    Returns:
+    --------
+    pandas.DataFrame with exactly ``feature_names`` as columns, in order
+    """
+    feature_names = list(feature_names)
+    encoded = pd.DataFrame(0, index=inputs_df.index, columns=feature_names)
+
+    # Numeric features are copied straight across; Exercise Level is ordinal
+    for feature in feature_names:
+        if any(feature.startswith(prefix) for prefix in CATEGORICAL_PREFIXES):
+            continue
+        if feature == 'Exercise Level':
+            encoded[feature] = inputs_df[feature].map(EXERCISE_MAPPING)
+        elif feature in inputs_df.columns:
+            encoded[feature] = inputs_df[feature]
+
+    # One-hot encode the categorical inputs against the known feature columns
+    for prefix, column in CATEGORICAL_PREFIXES.items():
+        if column not in inputs_df.columns:
+            continue
+        labels = prefix + inputs_df[column].astype(str)
+        for feature in feature_names:
+            if feature.startswith(prefix):
+                encoded[feature] = (labels == feature).astype(int)
+
+    # Default to USA for countries the models were not trained on
+    country_columns = [f for f in feature_names if f.startswith('Country_')]
+    fallback = f'Country_{DEFAULT_COUNTRY}'
+    if country_columns and fallback in feature_names:
+        unknown = encoded[country_columns].sum(axis=1) == 0
+        encoded.loc[unknown, fallback] = 1
+
+    return encoded
+
+
+def categorical_labels(feature_names):
+    """
+    Labels each categorical input is encoded for by preprocess_inputs_batch.
+
+    One-hot columns come from the ``feature_names`` with a CATEGORICAL_PREFIXES prefix,
+    plus any CATEGORICAL_REFERENCE_LABELS; Exercise Level takes the EXERCISE_MAPPING
+    levels. Any other label would silently encode as no category at all.
+    """
+    labels = {column: list(CATEGORICAL_REFERENCE_LABELS.get(column, [])) for column in CATEGORICAL_PREFIXES.values()}
+    for feature in feature_names:
+        for prefix, column in CATEGORICAL_PREFIXES.items():
+            if feature.startswith(prefix):
+                labels[column].append(feature[len(prefix):])
+    labels['Exercise Level'] = list(EXERCISE_MAPPING)
+    return labels
+
+
+def predict_happiness_batch(happiness_model, features):
+    """Happiness on a 0-10 scale, rounded to 1 decimal, for an encoded feature matrix."""
+    return np.clip(happiness_model.predict(features).astype(float), 0, 10).round(1)
+
+
+def predict_stress_batch(stress_model, features):
+    """Stress rescaled from the model's 1-3 output to 0-10, rounded to 2 decimals."""
+    stress_raw = stress_model.predict(features).astype(float)
+    return np.clip(((stress_raw - 1) / 2) * 10, 0, 10).round(2)
+
+
+def predict_wellness_batch(happiness_model, stress_model, inputs_df):
+    """
+    Score many profiles with one vectorised pass per model.
+
+    Returns a DataFrame (same index as ``inputs_df``) with ``Happiness Score`` and
+    ``Stress Level``, scaled and rounded the same way as the simulator cards.
+    """
+    features = preprocess_inputs_batch(inputs_df, happiness_model.feature_names_in_)
+
+    return pd.DataFrame({
+        'Happiness Score': predict_happiness_batch(happiness_model, features),
+        'Stress Level': predict_stress_batch(stress_model, features),
+    }, index=inputs_df.index)
+
+
+def build_sensitivity_grid(inputs, x_factor, y_factor, resolution=50):
+    """
+    Expand one profile into a ``resolution x resolution`` grid over two numeric inputs.
+
+    Returns (x_values, y_values, grid_df) where grid_df has one row per grid cell in
+    row-major order (y varies slowest), all other inputs held at the user's values.
+    """
+    for factor in (x_factor, y_factor):
+        if factor not in NUMERIC_INPUT_RANGES:
+            raise ValueError(f"Unsupported sensitivity factor: {factor}")
+    if x_factor == y_factor:
+        raise ValueError("Sensitivity factors must be two different inputs")
+
+    x_values = np.linspace(*NUMERIC_INPUT_RANGES[x_factor], resolution)
+    y_values = np.linspace(*NUMERIC_INPUT_RANGES[y_factor], resolution)
+    grid_x, grid_y = np.meshgrid(x_values, y_values)
+
+    grid_df = expand_profile(inputs, grid_x.size)
+    grid_df[x_factor] = grid_x.ravel()
+    grid_df[y_factor] = grid_y.ravel()
+
+    return x_values, y_values, grid_df
+
+
+def score_sensitivity_grid(happiness_model, stress_model, inputs, x_factor, y_factor, resolution=50):
+    """
+    Predict happiness and stress over a 2-D grid of two numeric inputs.
+
+    The whole grid is scored in a single ``predict`` call per model. Returns a dict
+    with the axis values and two ``(resolution, resolution)`` arrays indexed
+    ``[y, x]``.
+    """
+    x_values, y_values, grid_df = build_sensitivity_grid(inputs, x_factor, y_factor, resolution)
+    scores = predict_wellness_batch(happiness_model, stress_model, grid_df)
+
+    shape = (len(y_values), len(x_values))
+    return {
+        'x_factor': x_factor,
+        'y_factor': y_factor,
+        'x_values': x_values,
+        'y_values': y_values,
+        'happiness': scores['Happiness Score'].to_numpy().reshape(shape),
+        'stress': scores['Stress Level'].to_numpy().reshape(shape),
+    }
+
+
+def estimate_residual_volatility(happiness_model, stress_model, df):
+    """
+    Measure how far the models' predictions sit from the observed dataset scores.
+
+    Returns the residual standard deviation for happiness and stress (both on the
+    0-10 scale used by the simulator), which sets the spread of the forecast paths.
+    """
+    scores = predict_wellness_batch(happiness_model, stress_model, df)
+
+    stress_observed = df['Stress Level']
+    if stress_observed.dtype == 'object' or pd.api.types.is_string_dtype(stress_observed):
+        stress_observed = stress_observed.map(STRESS_LEVEL_MAPPING)
+    stress_observed = ((stress_observed - 1) / 2) * 10
+
+    return {
+        'happiness': float((df['Happiness Score'] - scores['Happiness Score']).std()),
+        'stress': float((stress_observed - scores['Stress Level']).std()),
+    }
+
+
+def simulate_forecast_bands(happiness, stress, burnout, volatility=None, n_paths=5000, seed=None):
+    """
+    Monte Carlo wellness forecast built from daily random walks.
+
+    Every path follows the expected drift in FORECAST_DRIFT plus Gaussian daily shocks
+    scaled so that the spread after the longest horizon equals the model residual
+    standard deviation. Burnout shares the stress shocks. All paths are simulated at
+    once as one NumPy array.
+
+    Parameters:
+    -----------
+    happiness, stress, burnout : float
+        Current predicted values (0-10, 0-10 and 0-100)
+    volatility : dict, optional
+        Residual std per metric, see estimate_residual_volatility()
+    n_paths : int
+        Number of simulated trajectories
+    seed : int, optional
+        Random seed; defaults to one derived from the inputs so reruns are stable
+
+    Returns:
+    --------
+    Three dicts (happiness, stress, burnout) mapping each FORECAST_HORIZONS label to
+    ``{'p10': ..., 'p25': ..., 'p50': ..., 'p75': ..., 'p90': ...}``
+    """
+    volatility = volatility or DEFAULT_FORECAST_VOLATILITY
+    if seed is None:
+        seed = zlib.crc32(repr((round(happiness, 2), round(stress, 2), round(burnout, 2))).encode())
+    rng = np.random.default_rng(seed)
+
+    labels = list(FORECAST_HORIZONS.keys())
+    checkpoints = np.array(list(FORECAST_HORIZONS.values()))
+    horizon = int(checkpoints.max())
+
+    # The sum of daily shocks between two checkpoints is itself Gaussian, so the walk
+    # is only sampled at the checkpoints: shape (2, n_paths, checkpoints) for
+    # happiness and stress
+    daily_sigma = np.array([volatility['happiness'], volatility['stress']]) / np.sqrt(horizon)
+    step_sigma = daily_sigma[:, None] * np.sqrt(np.diff(checkpoints))[None, :]
+    shocks = rng.standard_normal((2, n_paths, len(checkpoints) - 1)) * step_sigma[:, None, :]
+    walks = np.concatenate([np.zeros((2, n_paths, 1)), np.cumsum(shocks, axis=2)], axis=2)
+
+    def bands(current, drift_key, walk, lower, upper):
+        drift = np.asarray(FORECAST_DRIFT[drift_key])
+        paths = np.clip(current + drift + walk, lower, upper)
+        values = np.percentile(paths, FORECAST_PERCENTILES, axis=0).round(1)
+        return {
+            label: {f'p{q}': float(values[i, j]) for i, q in enumerate(FORECAST_PERCENTILES)}
+            for j, label in enumerate(labels)
+        }
+
+    happiness_bands = bands(happiness, 'happiness', walks[0], 0, 10)
+    stress_bands = bands(stress, 'stress', walks[1], 0, 10)
+    burnout_bands = bands(burnout, 'burnout', walks[1] * BURNOUT_STRESS_COUPLING, 0, 100)
+
+    return happiness_bands, stress_bands, burnout_bands
+
+
+def forecast_percentile(bands, percentile='p50'):
+    """Collapse a band dict from simulate_forecast_bands() to one value per period."""
+    return {label: values[percentile] for label, values in bands.items()}
+
+
+def _search_space(inputs):
+    """Candidate values for every controllable input, with the cost of each value."""
+    space = {}
+    for column, spec in CONTROLLABLE_INPUTS.items():
+        current = inputs[column]
+        low, high = NUMERIC_INPUT_RANGES[column]
+        offsets = np.arange(-spec['max_change'], spec['max_change'] + spec['step'] / 2, spec['step'])
+        values = np.unique(np.clip(current + offsets, low, high))
+        space[column] = (values, np.abs(values - current) * spec['cost'])
+
+    levels = list(EXERCISE_MAPPING)
+    current_level = EXERCISE_MAPPING[inputs['Exercise Level']]
+    space['Exercise Level'] = (
+        np.array(levels),
+        np.array([abs(EXERCISE_MAPPING[level] - current_level) * EXERCISE_CHANGE_COST for level in levels]),
+    )
+
+    # Never suggest switching to junk food
+    diets = [d for d in DIET_TYPES if d != 'Junk Food' or d == inputs['Diet Type']]
+    space['Diet Type'] = (
+        np.array(diets),
+        np.array([0.0 if d == inputs['Diet Type'] else DIET_CHANGE_COST for d in diets]),
+    )
+    return space
+
+
+def find_counterfactuals(happiness_model, stress_model, inputs, metric, target, batch_size=20000, max_results=5):
+    """
+    Search the controllable lifestyle inputs for the cheapest changes that reach a target.
+
+    Every combination of candidate values is costed up front with NumPy broadcasting and
+    sorted from cheapest to most expensive. Candidates are then scored in growing
+    batches in that order and the search stops at the first batch containing a
+    feasible candidate, so only a small slice of the space usually reaches the models. Burnout
+    targets need no model call at all.
+
+    Parameters:
+    -----------
+    inputs : dict
+        The user's simulator inputs
+    metric : str
+        One of TARGET_METRICS
+    target : float
+        Happiness to reach or exceed, or stress / burnout to stay at or below
+
+    Returns:
+    --------
+    List of up to ``max_results`` dicts, cheapest first, each with ``cost``,
+    ``changes`` ({input: (current, suggested)}) and the predicted ``Happiness Score``,
+    ``Stress Level`` and ``Burnout Risk``. Empty if the target can't be reached.
+    """
+    if metric not in TARGET_METRICS:
+        raise ValueError(f"Unsupported target metric: {metric}")
+
+    space = _search_space(inputs)
+    columns = list(space)
+    shape = tuple(len(space[c][0]) for c in columns)
+
+    # Total cost of every combination, then the flat candidate order by cost
+    total_cost = np.zeros(shape)
+    for axis, column in enumerate(columns):
+        view = [1] * len(columns)
+        view[axis] = -1
+        total_cost = total_cost + space[column][1].reshape(view)
+    total_cost = total_cost.ravel()
+    order = np.argsort(total_cost, kind='stable')
+
+    def candidate_frame(flat_indices):
+        frame = expand_profile(inputs, len(flat_indices))
+        for column, idx in zip(columns, np.unravel_index(flat_indices, shape)):
+            frame[column] = space[column][0][idx]
+        return frame
+
+    # Start with a small batch so easy targets return quickly, then grow it
+    start, size = 0, min(1024, batch_size)
+    while start < len(order):
+        end = min(start + size, len(order))
+        # Keep every candidate tied with the batch's most expensive one in this batch
+        while end < len(order) and total_cost[order[end]] == total_cost[order[end - 1]]:
+            end += 1
+        batch = order[start:end]
+        frame = candidate_frame(batch)
+        frame['Burnout Risk'] = compute_burnout_risk(frame)
+
+        # Only the model behind the target metric scores the whole batch
+        if metric == 'Burnout Risk':
+            feasible = frame['Burnout Risk'] <= target
+        else:
+            features = preprocess_inputs_batch(frame, happiness_model.feature_names_in_)
+            if metric == 'Happiness Score':
+                frame[metric] = predict_happiness_batch(happiness_model, features)
+                feasible = frame[metric] >= target
+            else:
+                frame[metric] = predict_stress_batch(stress_model, features)
+                feasible = frame[metric] <= target
+
+        if feasible.any():
+            cost = total_cost[batch][feasible.to_numpy()]
+            frame = frame[feasible].drop(columns=['Happiness Score', 'Stress Level'], errors='ignore')
+            frame = frame.join(predict_wellness_batch(happiness_model, stress_model, frame))
+            frame['cost'] = cost
+            ascending = TARGET_METRICS[metric] == 'max'
+            frame = frame.sort_values(['cost', metric], ascending=[True, ascending]).head(max_results)
+            return [
+                {
+                    'cost': round(float(row['cost']), 2),
+                    'changes': {c: (inputs[c], row[c]) for c in columns if row[c] != inputs[c]},
+                    'Happiness Score': float(row['Happiness Score']),
+                    'Stress Level': float(row['Stress Level']),
+                    'Burnout Risk': float(row['Burnout Risk']),
+                }
+                for _, row in frame.iterrows()
+            ]
+        start, size = end, min(size * 4, batch_size)
+
+    return []
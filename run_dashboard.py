@@ -18,11 +18,6 @@ st.set_page_config(
 # Add current directory to path so we can import modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Import functions from modules instead of whole modules
-# This avoids the set_page_config conflict
-from dashboard.app_dashboard import main as dashboard_main
-from dashboard.app_simulator import main as simulator_main
-
 # Initialize session state for tab management
 if 'active_tab' not in st.session_state:
     st.session_state.active_tab = 0
@@ -32,8 +27,6 @@ if 'predictions_made' not in st.session_state:
     st.session_state.predictions_made = False
 if 'inputs' not in st.session_state:
     st.session_state.inputs = None
-if 'processed_inputs' not in st.session_state:
-    st.session_state.processed_inputs = None
 
 # Bootstrap CSS integration
 st.markdown("""
@@ -303,6 +296,9 @@ st.markdown('<div class="content-area">', unsafe_allow_html=True)
 if st.session_state.active_tab == 0:
     # Dashboard Content
     st.markdown('<div id="dashboard-content">', unsafe_allow_html=True)
+    # Each tab's module (and its heavy dependencies) is imported the first time it is
+    # opened; importing here rather than at the top also avoids the set_page_config conflict
+    from dashboard.app_dashboard import main as dashboard_main
     dashboard_main()
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -314,6 +310,7 @@ else:
     
     # Simulator Content
     st.markdown('<div id="simulator-content">', unsafe_allow_html=True)
+    from dashboard.app_simulator import main as simulator_main
     simulator_main()
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -322,3 +319,8 @@ st.markdown('</div>', unsafe_allow_html=True)
 # Footer
 st.markdown("---")
 st.markdown("LifeSync | A Predictive Dashboard and Simulator for Personalized Wellness Forecasting")
+
+# Once the first page has been sent, optionally load the models in the background (once per
+# process, when LIFESYNC_PRELOAD_MODELS is set) so the first prediction does not wait for them
+from dashboard.warmup import start_background_warmup
+start_background_warmup()
@@ -0,0 +1,87 @@
+"""compare_cohorts against a plain per-cohort pandas computation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.cohort_comparison import (
+    COMPARISON_DISTRIBUTIONS,
+    COMPARISON_MEASURES,
+    compare_cohorts,
+    correlation_columns,
+    split_cohorts,
+)
+from dashboard.column_catalog import build_column_catalog, column_range, column_values, is_numeric
+from dashboard.dashboard_charts import default_filters, filter_mask, read_dataset
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    df = read_dataset().head(600).copy()
+    # Scattered missing values, so correlations have to use pairwise-complete rows
+    rng = np.random.default_rng(0)
+    for column in ["Sleep Hours", "Screen Time per Day (Hours)", "Happiness Score", "Work Hours per Week"]:
+        df[column] = df[column].astype(float)
+        df.loc[rng.random(len(df)) < 0.1, column] = np.nan
+    return df, build_column_catalog(df)
+
+
+@pytest.fixture(scope="module")
+def cohorts(dataset):
+    df, catalog = dataset
+    genders = split_cohorts(catalog, "genders", column_values(catalog, "Gender")[:2])
+    everyone = ("Everyone", default_filters(catalog))
+    # Matches no row: a country filter combined with an age range outside the data
+    nobody = ("Nobody", {**default_filters(catalog), "countries": (column_values(catalog, "Country")[0],),
+                         "age_range": (-2, -1)})
+    return genders + (everyone, nobody)
+
+
+def expected_mean(rows, spec):
+    column, scores = spec if isinstance(spec, tuple) else (spec, None)
+    values = rows[column]
+    if scores is not None and not pd.api.types.is_numeric_dtype(values):
+        values = values.map(scores)
+    return values.astype(float).mean()
+
+
+def expected_counts(rows, catalog, column, bins):
+    if is_numeric(catalog, column):
+        edges = np.linspace(*column_range(catalog, column), bins + 1)
+        return np.histogram(rows[column].dropna(), bins=edges)[0]
+    counts = rows[column].dropna().astype(str).value_counts()
+    return counts.reindex(column_values(catalog, column), fill_value=0).to_numpy()
+
+
+@pytest.mark.parametrize("chunk_rows", [10_000, 97])
+def test_matches_per_cohort_pandas(dataset, cohorts, chunk_rows):
+    df, catalog = dataset
+    result = compare_cohorts(df, catalog, cohorts, chunk_rows=chunk_rows)
+    columns = correlation_columns(catalog)
+
+    assert result["cohorts"] == [name for name, _ in cohorts]
+    assert result["correlation"]["columns"] == columns
+    for i, (name, filters) in enumerate(cohorts):
+        rows = df[filter_mask(df, filters)]
+        assert result["rows"][i] == len(rows), name
+
+        for label, spec in COMPARISON_MEASURES.items():
+            np.testing.assert_allclose(result["measures"][label][i], expected_mean(rows, spec),
+                                       rtol=1e-9, equal_nan=True, err_msg=f"{name}: {label}")
+
+        for key, (column, bins) in COMPARISON_DISTRIBUTIONS.items():
+            np.testing.assert_array_equal(result["distributions"][key]["counts"][i],
+                                          expected_counts(rows, catalog, column, bins),
+                                          err_msg=f"{name}: {key}")
+
+        np.testing.assert_allclose(result["correlation"]["matrices"][i], rows[columns].corr().to_numpy(),
+                                   atol=1e-9, equal_nan=True, err_msg=name)
+
+
+def test_overlapping_cohorts_count_shared_rows_in_each(dataset, cohorts):
+    df, catalog = dataset
+    result = compare_cohorts(df, catalog, cohorts)
+    names = result["cohorts"]
+    # Every gender row is also an "Everyone" row and is counted in both cohorts
+    assert result["rows"][names.index("Everyone")] >= sum(result["rows"][:2]) > 0
+    assert result["rows"][names.index("Nobody")] == 0
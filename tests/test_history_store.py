@@ -0,0 +1,118 @@
+"""Resuming HistoryStore.import_csv from the saved position."""
+
+import csv
+import os
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+from dashboard.history_log import HISTORY_COLUMNS
+from dashboard.history_store import TABLE_NAME, HistoryStore
+
+
+def history_row(second, name="Jane Doe"):
+    row = dict.fromkeys(HISTORY_COLUMNS, "")
+    row.update({"Timestamp": f"2025-06-01 12:00:{second:02d}", "Name": name, "Age": "30",
+                "Sleep Hours": "7.0", "Happiness Score": "6.5", "Stress Level": "1.0"})
+    return [row[column] for column in HISTORY_COLUMNS]
+
+
+def write_csv(path, rows, header=HISTORY_COLUMNS, mode="w"):
+    with open(path, mode, newline="") as file:
+        writer = csv.writer(file)
+        if mode == "w":
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+def clear_rows(store):
+    """Empty the history table but keep the import positions, to see what the next import re-reads."""
+    with closing(sqlite3.connect(store.path)) as connection, connection:
+        connection.execute(f"DELETE FROM {TABLE_NAME}")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / "history.db"))
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / "history.csv")
+    write_csv(path, [history_row(s) for s in range(3)])
+    return path
+
+
+def test_import_then_resume_reads_only_appended_rows(store, csv_path):
+    assert store.import_csv(csv_path) == 3
+    assert store.import_csv(csv_path) == 0
+
+    clear_rows(store)
+    write_csv(csv_path, [history_row(3), history_row(4)], mode="a")
+    assert store.import_csv(csv_path) == 2
+    assert list(store.user_history("Jane Doe")["Timestamp"].str[-2:]) == ["04", "03"]
+
+
+def test_partial_last_line_is_left_for_the_next_run(store, csv_path):
+    store.import_csv(csv_path)
+    partial = ",".join(history_row(3))
+    with open(csv_path, "a", newline="") as file:
+        file.write(partial)
+    assert store.import_csv(csv_path) == 0
+
+    with open(csv_path, "a", newline="") as file:
+        file.write("\r\n")
+    assert store.import_csv(csv_path) == 1
+    assert store.count() == 4
+
+
+def test_replaced_file_is_read_again(store, csv_path):
+    store.import_csv(csv_path)
+    clear_rows(store)
+
+    # Same content but a new inode, as after an atomic rewrite
+    replacement = csv_path + ".tmp"
+    write_csv(replacement, [history_row(s) for s in range(3)])
+    os.replace(replacement, csv_path)
+    assert store.import_csv(csv_path) == 3
+
+
+def test_shorter_file_is_read_again(store, csv_path):
+    store.import_csv(csv_path)
+    clear_rows(store)
+
+    with open(csv_path, "r+b") as file:
+        file.truncate(os.path.getsize(csv_path) - 10)
+    assert store.import_csv(csv_path) == 2
+
+
+def test_changed_last_row_is_read_again(store, csv_path):
+    store.import_csv(csv_path)
+    clear_rows(store)
+
+    # Rewritten in place, with the old last row replaced by one of the same length
+    with open(csv_path, "r+", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(HISTORY_COLUMNS)
+        writer.writerows([history_row(s) for s in (0, 1, 9)])
+    assert store.import_csv(csv_path) == 3
+
+
+def test_duplicate_rows_are_skipped_on_a_full_read(store, csv_path):
+    store.import_csv(csv_path)
+    write_csv(csv_path, [history_row(s) for s in range(5)])
+    assert store.import_csv(csv_path) == 2
+    assert store.count() == 5
+
+
+def test_legacy_header_is_mapped(store, tmp_path):
+    legacy = [{"Happiness Score": "Happiness Prediction", "Stress Level": "Stress Prediction"}.get(c, c)
+              for c in HISTORY_COLUMNS if c != "Name"]
+    path = str(tmp_path / "legacy.csv")
+    write_csv(path, [[v for c, v in zip(HISTORY_COLUMNS, history_row(0)) if c != "Name"]], header=legacy)
+
+    assert store.import_csv(path) == 1
+    row = store.user_history("").iloc[0]
+    assert row["Happiness Score"] == 6.5
+    assert row["Stress Level"] == 1.0